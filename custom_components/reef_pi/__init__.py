@@ -2,32 +2,76 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta
+from typing import Any
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.core_config import Config
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .async_api import CannotConnect, InvalidAuth, ReefApi
+from .command_queue import ReefPiCommandQueue
+from .deadband import ReefPiDeadband
+from .hub import ReefPiHub
+from .light_batcher import ReefPiLightBatcher
 from .mqtt_handler import ReefPiMQTTHandler
 from .mqtt_name_mapper import ReefPiMQTTNameMapper
 from .mqtt_tracker import ReefPiMQTTTracker
+from .services import async_setup_services
+from .perf_stats import ReefPiTimingStats
+from .polling import STEP_ATTRIBUTES, ReefPiAdaptivePolling, fingerprint
+from .timeseries import ReefPiTimeSeries
+from .usage import ReefPiUsageCounter
 from .const import (
     _LOGGER,
+    ADAPTIVE_POLLING,
+    ADAPTIVE_POLLING_MAX,
+    COMMAND_QUEUE,
+    COMMAND_QUEUE_EXPIRY,
+    COMMAND_QUEUE_SAVE_DELAY,
+    COMMAND_VERIFY_DELAY,
     CONFIG_OPTIONS,
+    CONTROL_BASE_MAX_AGE,
+    DATA_HUB,
+    DEFAULT_ADAPTIVE_POLLING_MAX,
+    DEFAULT_COMMAND_QUEUE_EXPIRY,
+    DEFAULT_PH_DEADBAND,
+    DEFAULT_PH_PRECISION,
+    DEFAULT_STATE_HEARTBEAT,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TEMPERATURE_PRECISION,
     DISABLE_PH,
     DOMAIN,
+    EPOCH,
     HOST,
+    LIVE_DATA,
+    LIVE_OPTIONS,
     MANUFACTURER,
     MQTT_ENABLED,
     PASSWORD,
+    PH_DEADBAND,
+    PH_PRECISION,
+    OVERRUN_SHEDDING,
+    REFRESH_STEPS,
+    SHEDDABLE_STEPS,
+    SNAPSHOT_SAVE_DELAY,
+    STATE_HEARTBEAT,
+    STORAGE_VERSION,
+    TEMPERATURE_DEADBAND,
+    TEMPERATURE_PRECISION,
+    TREND_SAMPLES,
+    TREND_WINDOW,
     UPDATE_INTERVAL_CFG,
     UPDATE_INTERVAL_MIN,
     USER,
@@ -40,6 +84,22 @@ PLATFORMS = ["sensor", "switch", "light", "binary_sensor", "button"]
 
 REEFPI_DATETIME_FORMAT = "%b-%d-%H:%M, %Y"
 
+# Coordinator data persisted between restarts
+SNAPSHOT_ATTRIBUTES = (
+    "info",
+    "capabilities",
+    "tcs",
+    "equipment",
+    "ph",
+    "pumps",
+    "ato",
+    "ato_states",
+    "inlets",
+    "lights",
+    "timers",
+    "macros",
+    "display",
+)
 
 CONFIG_SCHEMA = vol.Schema({DOMAIN: CONFIG_OPTIONS}, extra=vol.ALLOW_EXTRA)
 
@@ -47,6 +107,7 @@ CONFIG_SCHEMA = vol.Schema({DOMAIN: CONFIG_OPTIONS}, extra=vol.ALLOW_EXTRA)
 async def async_setup(hass: HomeAssistant, config: Config) -> bool:
     """Set up configured."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     return True
 
 
@@ -54,12 +115,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ha_reef_pi from a config entry."""
 
     websession = async_get_clientsession(hass)
-    coordinator = ReefPiDataUpdateCoordinator(hass, websession, entry)
-
-    await coordinator.async_config_entry_first_refresh()
-
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    hub = hass.data[DOMAIN].setdefault(DATA_HUB, ReefPiHub())
+    coordinator = ReefPiDataUpdateCoordinator(hass, websession, entry, hub)
+
+    await coordinator.async_load_commands()
+    if await coordinator.async_restore_snapshot():
+        # Create entities from the last known data right away and revalidate in the
+        # background, so startup does not depend on how fast the controller answers.
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {entry.title} refresh"
+        )
+    else:
+        # The coordinator is shut down by the unload callbacks of the entry when
+        # setup fails, and a retried setup creates a new one
+        await coordinator.async_config_entry_first_refresh()
+        if not coordinator.last_update_success:
+            raise ConfigEntryNotReady
 
     await coordinator.async_setup_mqtt()
 
@@ -76,24 +147,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    for component in PLATFORMS:
-        await hass.config_entries.async_forward_entry_unload(entry, component)
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
 
-    hass.data[DOMAIN][entry.entry_id]["undo_update_listener"]()
-    hass.data[DOMAIN].pop(entry.entry_id)
+    # The coordinator shuts down in the unload callbacks of the entry
+    data = hass.data[DOMAIN].pop(entry.entry_id)
+    data["undo_update_listener"]()
 
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted data of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    for suffix in ("saved_states", "commands"):
+        await Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.{suffix}"
+        ).async_remove()
+
+
 async def update_listener(hass, config_entry):
-    """Update listener."""
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    """Apply changed options, reloading only when they can't be applied live."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    if not await coordinator.async_apply_options(config_entry):
+        await hass.config_entries.async_reload(config_entry.entry_id)
 
 
 class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Reef-Pi data API."""
 
-    def __init__(self, hass, session, config_entry):
+    def __init__(self, hass, session, config_entry, hub: ReefPiHub | None = None):
         """Initialize."""
 
         _LOGGER.debug(
@@ -103,21 +186,43 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
         self.default_name = config_entry.title
         self.username = config_entry.data[USER]
         self.password = config_entry.data[PASSWORD]
+        # Shared by all controllers to stagger refreshes and limit requests
+        self.hub = hub
         self.api = ReefApi(
-            config_entry.data[HOST], verify=config_entry.data[VERIFY_TLS]
+            config_entry.data[HOST],
+            verify=config_entry.data[VERIFY_TLS],
+            scheduler=(
+                hub.register(config_entry.entry_id) if hub is not None else None
+            ),
         )
         self.configuration_url = config_entry.data[HOST]
         self.unique_id = config_entry.data[HOST]
         self.hass = hass
 
-        self.update_interval = UPDATE_INTERVAL_MIN
-        update_interval = config_entry.options.get(
-            UPDATE_INTERVAL_CFG
-        ) or config_entry.data.get(UPDATE_INTERVAL_CFG)
-        if update_interval is not None:
-            self.update_interval = timedelta(seconds=update_interval)
-
-        self.disable_ph = config_entry.options.get(DISABLE_PH) or False
+        options = config_entry.options
+        self.deadbands = {
+            "temperature": (
+                options.get(TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+                options.get(TEMPERATURE_PRECISION, DEFAULT_TEMPERATURE_PRECISION),
+            ),
+            "ph": (
+                options.get(PH_DEADBAND, DEFAULT_PH_DEADBAND),
+                options.get(PH_PRECISION, DEFAULT_PH_PRECISION),
+            ),
+        }
+        heartbeat = options.get(STATE_HEARTBEAT, DEFAULT_STATE_HEARTBEAT)
+        self.state_heartbeat = timedelta(seconds=heartbeat) if heartbeat else None
+
+        # A refresh longer than the update interval stretches the next interval so
+        # reef-pi idles at least as long as it was busy, see _handle_overrun
+        self.overruns = 0
+        self._overrun = False
+        # Successful refreshes since setup
+        self.refreshes = 0
+        self._shed_next = False
+
+        # Options that can change without a reload, see async_apply_options
+        self._apply_live_options(config_entry)
 
         self.has_temperature = False
         self.has_equipment = False
@@ -131,6 +236,8 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
         self.has_display = False
 
         self.info = {}
+        self._device_info = None
+        self._device_info_key = None
         self.capabilities = {}
         self.tcs = {}
         self.equipment = {}
@@ -139,13 +246,13 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
         self.ato = {}
         self.ato_states = {}
         self.lights = {}
+        self.light_objects = {}
         self.inlets = {}
         self.macros = {}
         self.timers = {}
         self.display = {}
 
         self.mqtt_prefix = config_entry.data.get("mqtt_prefix", "reef-pi")
-        self.mqtt_enabled = config_entry.options.get(MQTT_ENABLED) or False
 
         # MQTT topic-to-device mapper with collision detection
         self.mqtt_name_mapper = ReefPiMQTTNameMapper(
@@ -155,9 +262,142 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
         self.mqtt_handler = None
         self.mqtt_tracker = ReefPiMQTTTracker() if self.mqtt_enabled else None
 
+        # Duration of each refresh step and of the whole refresh ("refresh")
+        self.refresh_stats = ReefPiTimingStats()
+
+        # Run time counted from usage histories, by "pump"/"ato" and reef-pi id
+        self.usage: dict[str, dict[str, ReefPiUsageCounter]] = {"pump": {}, "ato": {}}
+
+        # Objects to read back to confirm commands, see schedule_verify
+        self._verify_pending: set[tuple[str, str]] = set()
+        self._verify_unsub: CALLBACK_TYPE | None = None
+
+        # Time timers, ATOs and lights were last polled, see control_base
+        self._polled_at: dict[str, datetime] = {}
+
+        self.light_batcher = ReefPiLightBatcher(
+            hass, self.api, base=lambda light_id: self.control_base("lights", light_id)
+        )
+
+        # Recent temperature and pH readings keyed by (sensor type, device id)
+        self.series: dict[tuple[str, str], ReefPiTimeSeries] = {}
+
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
+        self._snapshot_pending = False
+
+        # States saved by the snapshot service, by name
+        self.saved_states: dict[str, dict[str, dict[str, Any]]] = {}
+        self._saved_states_store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.saved_states"
+        )
+
+        # Commands kept while reef-pi is unreachable, None if disabled
+        self.command_queue = None
+        if options.get(COMMAND_QUEUE):
+            self.command_queue = ReefPiCommandQueue(
+                timedelta(
+                    seconds=options.get(
+                        COMMAND_QUEUE_EXPIRY, DEFAULT_COMMAND_QUEUE_EXPIRY
+                    )
+                )
+            )
+        self._commands_store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}.commands"
+        )
+        self._replaying = False
+
+        # Registers async_shutdown as unload callback of the config entry
         super().__init__(
-            hass, _LOGGER, name=DOMAIN, update_interval=self.update_interval
+            hass,
+            _LOGGER,
+            config_entry=config_entry,
+            name=DOMAIN,
+            update_interval=self.update_interval,
+        )
+
+    def _apply_live_options(self, config_entry: ConfigEntry) -> None:
+        """Set the values of the options listed in LIVE_OPTIONS."""
+        options = config_entry.options
+        self._entry_options = dict(options)
+        self._entry_data = dict(config_entry.data)
+
+        update_interval = options.get(UPDATE_INTERVAL_CFG) or config_entry.data.get(
+            UPDATE_INTERVAL_CFG
         )
+        self.base_update_interval = (
+            timedelta(seconds=update_interval)
+            if update_interval is not None
+            else UPDATE_INTERVAL_MIN
+        )
+        self.update_interval = self.base_update_interval
+
+        self.disable_ph = options.get(DISABLE_PH) or False
+        self.mqtt_enabled = options.get(MQTT_ENABLED) or False
+        self.overrun_shedding = options.get(OVERRUN_SHEDDING) or False
+
+        # Per subsystem intervals, None to poll everything every update interval
+        self.polling = None
+        if options.get(ADAPTIVE_POLLING):
+            self.polling = ReefPiAdaptivePolling(
+                self.base_update_interval,
+                timedelta(
+                    seconds=options.get(
+                        ADAPTIVE_POLLING_MAX, DEFAULT_ADAPTIVE_POLLING_MAX
+                    )
+                ),
+            )
+
+    async def async_apply_options(self, config_entry: ConfigEntry) -> bool:
+        """Apply changed options without reloading the config entry.
+
+        Entities follow the coordinator data, so pH entities are added by the next
+        refresh when pH is enabled and retired like deleted devices when it is
+        disabled.
+
+        Args:
+            config_entry: Config entry with the new data and options
+
+        Returns:
+            False if a changed setting needs a reload, e.g. the host or deadbands
+        """
+        changed = {
+            key
+            for key in config_entry.options.keys() | self._entry_options.keys()
+            if config_entry.options.get(key) != self._entry_options.get(key)
+        }
+        data = {
+            key: value
+            for key, value in config_entry.data.items()
+            if key not in LIVE_DATA
+        }
+        previous_data = {
+            key: value
+            for key, value in self._entry_data.items()
+            if key not in LIVE_DATA
+        }
+        if data != previous_data or not changed <= set(LIVE_OPTIONS):
+            return False
+
+        disable_ph = self.disable_ph
+        mqtt_enabled = self.mqtt_enabled
+        self._apply_live_options(config_entry)
+        _LOGGER.debug("Applied changed options %s", sorted(changed))
+
+        if self.disable_ph != disable_ph:
+            self._apply_capabilities()
+            if self.disable_ph:
+                self.ph = {}
+        if self.mqtt_enabled != mqtt_enabled:
+            if self.mqtt_enabled:
+                self.mqtt_tracker = ReefPiMQTTTracker()
+                await self.async_setup_mqtt()
+            else:
+                self.async_stop_mqtt()
+                self.mqtt_tracker = None
+
+        # Refresh right away, also restarting the refresh timer on the new interval
+        await self.async_request_refresh()
+        return True
 
     async def async_setup_mqtt(self):
         """Setup MQTT subscriptions."""
@@ -168,24 +408,199 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
         self.mqtt_handler = ReefPiMQTTHandler(self.hass, self)
         await self.mqtt_handler.async_subscribe()
 
+    async def async_shutdown(self) -> None:
+        """Stop refreshing, MQTT and pending commands, and close the API.
+
+        Runs once per config entry, when it is unloaded or its setup fails.
+        Requests still running are cancelled, so unloading doesn't wait for a slow
+        or unreachable controller.
+        """
+        await super().async_shutdown()
+        if self.hub is not None:
+            self.hub.unregister(self.entry.entry_id)
+        self.async_stop_mqtt()
+        self.light_batcher.cancel()
+        self.cancel_verify()
+        await self.api.close()
+        if self.refreshes:
+            # Replaces the pending delayed save
+            await self._store.async_save(self._snapshot())
+
+    @callback
+    def async_stop_mqtt(self) -> None:
+        """Remove MQTT subscriptions."""
+        if self.mqtt_handler:
+            self.mqtt_handler.async_unsubscribe()
+            self.mqtt_handler = None
+
     @property
     def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            configuration_url=self.configuration_url,
-            identifiers={(DOMAIN, self.unique_id)},
-            manufacturer=MANUFACTURER,
-            model=self.info["model"] if self.info["model"] else "Reef PI",
-            name=self.info["name"] if self.info["name"] else self.default_name,
-            sw_version=self.info["name"] if self.info["name"] else None,
-        )
-
-    async def update_capabilities(self):
-        _LOGGER.debug("Fetching capabilities")
-
+        """Return the device info shared by all entities of this controller.
+
+        The same object is returned until the model or name reported by the
+        controller changes.
+        """
+        key = (self.info["model"], self.info["name"])
+        if self._device_info is None or key != self._device_info_key:
+            self._device_info_key = key
+            self._device_info = DeviceInfo(
+                configuration_url=self.configuration_url,
+                identifiers={(DOMAIN, self.unique_id)},
+                manufacturer=MANUFACTURER,
+                model=self.info["model"] if self.info["model"] else "Reef PI",
+                name=self.info["name"] if self.info["name"] else self.default_name,
+                sw_version=self.info["name"] if self.info["name"] else None,
+            )
+        return self._device_info
+
+    @staticmethod
+    def _keep_fresher(current, polled, started, fields):
+        """Keep values that changed after a poll started instead of the polled ones.
+
+        Every stored value carries an ``updated_at`` source timestamp. A poll stamps its
+        values with the time it started, while MQTT messages and control commands stamp
+        theirs with the time they were applied. If an MQTT update (or command) landed
+        while the slower REST poll was in flight, the polled value is older than the one
+        already stored and must not overwrite it.
+
+        Args:
+            current: Currently stored values keyed by device id
+            polled: Freshly polled values keyed by device id (modified in place)
+            started: Time the poll started
+            fields: Keys holding the state that MQTT/commands can update
+        """
+        for device_id, entry in polled.items():
+            previous = current.get(device_id)
+            if not previous:
+                continue
+            updated_at = previous.get("updated_at")
+            if updated_at is None or updated_at <= started:
+                continue
+            for field in fields:
+                if field in previous:
+                    entry[field] = previous[field]
+            entry["updated_at"] = updated_at
+            _LOGGER.debug(
+                "Kept %s for %s: updated after poll started", fields, device_id
+            )
+
+    def control_base(self, kind: str, id: str) -> dict | None:
+        """Return the polled reef-pi object to base a control command on.
+
+        Args:
+            kind: "timers", "atos" or "lights"
+            id: reef-pi ID of the object
+
+        Returns:
+            The object as last polled, or None if it is unknown or the poll is older
+            than CONTROL_BASE_MAX_AGE
+        """
+        polled_at = self._polled_at.get(kind)
+        if polled_at is None or dt_util.utcnow() - polled_at > CONTROL_BASE_MAX_AGE:
+            return None
+        if kind == "timers":
+            return self.timers.get(id, {}).get("attributes")
+        if kind == "atos":
+            return self.ato.get(id)
+        return self.light_objects.get(id)
+
+    def create_deadband(self, sensor_type: str) -> ReefPiDeadband:
+        """Create the state filter of one sensor.
+
+        Args:
+            sensor_type: "temperature" or "ph"
+        """
+        deadband, precision = self.deadbands[sensor_type]
+        return ReefPiDeadband(deadband, precision, self.state_heartbeat)
+
+    def record_sample(
+        self, sensor_type: str, device_id: str, value, timestamp: datetime
+    ) -> None:
+        """Add a polled or MQTT reading to the sensor history.
+
+        Args:
+            sensor_type: "temperature" or "ph"
+            device_id: Device ID
+            value: Reading, ignored if not numeric
+            timestamp: Time of the reading
+        """
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return
+        key = (sensor_type, device_id)
+        if key not in self.series:
+            self.series[key] = ReefPiTimeSeries(TREND_SAMPLES)
+        self.series[key].add(timestamp.timestamp(), value)
+
+    def trend(self, sensor_type: str, device_id: str) -> dict | None:
+        """Return min, max, mean and rate per hour over the trend window."""
+        series = self.series.get((sensor_type, device_id))
+        if series is None:
+            return None
+        return series.summary((dt_util.utcnow() - TREND_WINDOW).timestamp())
+
+    def _snapshot(self) -> dict:
+        """Build the data persisted for the next startup."""
+        snapshot = {name: getattr(self, name) for name in SNAPSHOT_ATTRIBUTES}
+        snapshot["topics"] = [
+            [topic, device_type, device_id]
+            for topic, (device_type, device_id) in (
+                self.mqtt_name_mapper.topic_to_device.items()
+            )
+        ]
+        snapshot["usage"] = {
+            kind: {id: counter.as_dict() for id, counter in counters.items()}
+            for kind, counters in self.usage.items()
+        }
+        return snapshot
+
+    def _pending_snapshot(self) -> dict:
+        """Build the snapshot when a delayed save is written."""
+        self._snapshot_pending = False
+        return self._snapshot()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last successfully refreshed data.
+
+        Returns:
+            True if a snapshot was restored and entities can be created from it
+        """
+        snapshot = await self._store.async_load()
+        if not snapshot or not snapshot.get("info") or not snapshot.get("capabilities"):
+            return False
+
+        for name in SNAPSHOT_ATTRIBUTES:
+            setattr(self, name, snapshot.get(name) or {})
+
+        # Timestamps come back as ISO strings
+        for name in ("tcs", "equipment", "ph", "inlets", "lights", "timers"):
+            self._parse_timestamps(getattr(self, name), "updated_at")
+        self._parse_timestamps(self.pumps, "time")
+        self._parse_timestamps(self.ato_states, "ts")
+
+        self._apply_capabilities()
+        for kind, counters in snapshot.get("usage", {}).items():
+            self.usage[kind] = {
+                id: ReefPiUsageCounter.from_dict(counter)
+                for id, counter in counters.items()
+            }
+        for topic, device_type, device_id in snapshot.get("topics", []):
+            self.mqtt_name_mapper.topic_to_device[topic] = (device_type, device_id)
+
+        _LOGGER.debug("Restored snapshot for %s", self.default_name)
+        return True
+
+    @staticmethod
+    def _parse_timestamps(entries, key):
+        for entry in entries.values():
+            if isinstance(entry.get(key), str):
+                entry[key] = dt_util.parse_datetime(entry[key])
+
+    def _apply_capabilities(self):
         def get_capability(name):
             return name in self.capabilities.keys() and self.capabilities[name]
 
-        self.capabilities = await self.api.capabilities()
         if self.capabilities:
             self.has_temperature = get_capability("temperature")
             self.has_equipment = get_capability("equipment")
@@ -197,6 +612,12 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
             self.has_camera = get_capability("camera")
             self.has_macro = get_capability("macro")
             self.has_display = get_capability("display")
+
+    async def update_capabilities(self):
+        _LOGGER.debug("Fetching capabilities")
+        self.capabilities = await self.api.capabilities()
+        if self.capabilities:
+            self._apply_capabilities()
             _LOGGER.debug("Capabilities: ok")
 
     async def update_info(self):
@@ -213,6 +634,7 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
     async def update_temperature(self):
         if self.has_temperature:
             _LOGGER.debug("Fetching temperature")
+            started = dt_util.utcnow()
             sensors = await self.api.temperature_sensors()
             if sensors:
                 _LOGGER.debug("temperature updated: %d", len(sensors))
@@ -235,19 +657,28 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                             "temperature"
                         ],
                         "attributes": sensor,
+                        "updated_at": started,
                     }
                     self.mqtt_name_mapper.add_temperature(sensor["name"], sensor_id)
+                    self.record_sample(
+                        "temperature",
+                        sensor_id,
+                        all_tcs[sensor_id]["temperature"],
+                        started,
+                    )
 
                     if self.mqtt_tracker:
                         self.mqtt_tracker.record_polling_update(
                             "temperature", sensor_id
                         )
 
+                self._keep_fresher(self.tcs, all_tcs, started, ("temperature",))
                 self.tcs = all_tcs
 
     async def update_equipment(self):
         if self.has_equipment:
             _LOGGER.debug("Fetching equipment")
+            started = dt_util.utcnow()
             equipment = await self.api.equipment()
             if equipment:
                 _LOGGER.debug("equipment updated: %s", json.dumps(equipment))
@@ -262,17 +693,20 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                         "name": device["name"],
                         "state": device["on"],
                         "attributes": device,
+                        "updated_at": started,
                     }
                     self.mqtt_name_mapper.add_equipment(device["name"], device_id)
 
                     if self.mqtt_tracker:
                         self.mqtt_tracker.record_polling_update("equipment", device_id)
 
+                self._keep_fresher(self.equipment, all_equipment, started, ("state",))
                 self.equipment = all_equipment
 
     async def update_timers(self):
         if self.has_timers:
             _LOGGER.debug("Fetching timers")
+            started = dt_util.utcnow()
             timers = await self.api.timers()
             if timers:
                 _LOGGER.debug("timers updated: %s", json.dumps(timers))
@@ -282,8 +716,11 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                         "name": timer["name"],
                         "state": timer["enable"],
                         "attributes": timer,
+                        "updated_at": started,
                     }
+                self._keep_fresher(self.timers, all_timers, started, ("state",))
                 self.timers = all_timers
+                self._polled_at["timers"] = started
 
     async def update_macros(self):
         if self.has_macro:
@@ -302,6 +739,7 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
     async def update_ph(self):
         if self.has_ph:
             _LOGGER.debug("Fetching phprobes")
+            started = dt_util.utcnow()
             probes = await self.api.phprobes()
             if probes:
                 _LOGGER.debug("pH probes updated: %s", json.dumps(probes))
@@ -325,18 +763,22 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                         "name": probe["name"],
                         "value": value,
                         "attributes": attributes,
+                        "updated_at": started,
                     }
                     self.mqtt_name_mapper.add_ph(probe["name"], probe_id)
+                    self.record_sample("ph", probe_id, value, started)
 
                     if self.mqtt_tracker:
                         self.mqtt_tracker.record_polling_update("ph", probe_id)
 
+                self._keep_fresher(self.ph, all_ph, started, ("value",))
                 self.ph = all_ph
                 _LOGGER.debug(f"Got {len(all_ph)} pH probes: {all_ph}")
 
     async def update_lights(self):
         if self.has_lights:
             _LOGGER.debug("Fetching lights")
+            started = dt_util.utcnow()
             lights = await self.api.lights()
             if lights:
                 all_light = {}
@@ -357,10 +799,14 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                                 "value": light["channels"][channel]["value"],
                                 "state": state,
                                 "attributes": light["channels"][channel],
+                                "updated_at": started,
                             }
                             self.mqtt_name_mapper.add_light(combined_name, id)
 
+                self._keep_fresher(self.lights, all_light, started, ("value", "state"))
                 self.lights = all_light
+                self.light_objects = {light["id"]: light for light in lights}
+                self._polled_at["lights"] = started
 
     async def update_display(self):
         if self.has_display:
@@ -371,6 +817,7 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def update_inlets(self):
         _LOGGER.debug("Fetching inlets")
+        started = dt_util.utcnow()
         inlets = await self.api.inlets()
         if inlets:
             _LOGGER.debug("inlets updated: %s", json.dumps(inlets))
@@ -387,7 +834,9 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                     "name": inlet["name"],
                     "state": inlet_value,
                     "attributes": inlet,
+                    "updated_at": started,
                 }
+            self._keep_fresher(self.inlets, all_inlet, started, ("state",))
             self.inlets = all_inlet
 
     async def update_pumps(self):
@@ -396,19 +845,26 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
             result = {}
             try:
                 pumps = await self.api.pumps()
+                if not pumps:
+                    return
                 for pump in pumps:
                     key = f"{pump['jack']}_{pump['pin']}"
                     _LOGGER.debug("Pump %s: %s", key, json.dumps(pump))
                     if key not in result.keys():
                         result[key] = {
                             "name": pump["name"],
-                            "time": datetime.fromtimestamp(0, tz=dt_util.UTC),
+                            "time": EPOCH,
+                            "total": 0.0,
                             "attributes": {pump["id"]: pump},
                         }
                     else:
                         result[key]["attributes"][pump["id"]] = pump
 
-                    current = await self.api.pump(pump["id"])
+                    readings = await self.api.pump_usage(pump["id"])
+                    result[key]["total"] += self._count_usage(
+                        "pump", pump["id"], readings
+                    )
+                    current = readings[-1] if readings else {}
                     if (
                         current
                         and "time" in current.keys()
@@ -420,13 +876,20 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                         if time > result[key]["time"]:
                             result[key]["time"] = time
                             result[key]["attributes"]["duration"] = current["pump"]
+            except (CannotConnect, InvalidAuth):
+                raise
             except Exception as ex:
+                # Keep the last known pumps, so a bad answer doesn't retire them
                 _LOGGER.exception(ex)
+                return
             self.pumps = result
 
     async def update_atos(self):
         if self.has_ato:
+            started = dt_util.utcnow()
             atos = await self.api.atos()
+            if not atos:
+                return
             atos = {a["id"]: a for a in atos}
             ato_states = {}
             for id in atos.keys():
@@ -434,10 +897,11 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                 if inlet_id:
                     self.mqtt_name_mapper.add_ato_state(atos[id]["name"], inlet_id)
                 ato_states[id] = {
-                    "ts": datetime.fromtimestamp(0, tz=dt_util.UTC),
+                    "ts": EPOCH,
                     "pump": 0,
                 }
                 states = await self.api.ato(id)
+                total = self._count_usage("ato", id, states)
                 ato_state = [s for s in states if s["pump"] != 0]
                 if len(ato_state) > 0:
                     ato_states[id] = ato_state[-1]
@@ -450,9 +914,19 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
                         ato_states[id]["ts"] = datetime.strptime(
                             ato_states[id]["time"], REEFPI_DATETIME_FORMAT
                         ).replace(tzinfo=dt_util.UTC)
+                ato_states[id]["total"] = total
 
             self.ato = atos
             self.ato_states = ato_states
+            self._polled_at["atos"] = started
+
+    def _count_usage(self, kind: str, id: str, readings: list[dict]) -> float:
+        """Count new usage entries of a pump or ATO and return its total run time."""
+        if id not in self.usage[kind]:
+            self.usage[kind][id] = ReefPiUsageCounter()
+        counter = self.usage[kind][id]
+        counter.update(readings)
+        return counter.total
 
     async def _async_update_data(self):
         """Update data via REST API."""
@@ -469,46 +943,152 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
             # failure mid-cycle keeps the last known-good mappings.
             self.mqtt_name_mapper.begin_refresh()
 
-            await self.update_capabilities()
-            await self.update_info()
-            await self.update_temperature()
-            await self.update_equipment()
-            await self.update_ph()
-            await self.update_pumps()
-            await self.update_atos()
-            await self.update_inlets()
-            await self.update_lights()
-            await self.update_display()
-            await self.update_macros()
-            await self.update_timers()
+            refresh_started = time.monotonic()
+            now = dt_util.utcnow()
+            # Capabilities are needed to know what to poll at all
+            shed = self._shed_next and bool(self.capabilities)
+            self._shed_next = False
+            for step in REFRESH_STEPS:
+                if self.polling and not self.polling.due(step, now):
+                    continue
+                if shed and step in SHEDDABLE_STEPS:
+                    _LOGGER.debug("Skipping %s after an overrun", step)
+                    continue
+                started = time.monotonic()
+                try:
+                    await getattr(self, f"update_{step}")()
+                except Exception:
+                    self.refresh_stats.record(
+                        step, time.monotonic() - started, error=True
+                    )
+                    raise
+                duration = time.monotonic() - started
+                self.refresh_stats.record(step, duration)
+                if self.polling:
+                    self.polling.record(
+                        step,
+                        fingerprint(*(getattr(self, a) for a in STEP_ATTRIBUTES[step])),
+                        duration,
+                        now,
+                        self.info.get("cpu_temperature"),
+                    )
+            refresh_duration = time.monotonic() - refresh_started
+            self.refresh_stats.record("refresh", refresh_duration)
+            self.refreshes += 1
+            overrun = self._handle_overrun(refresh_duration)
+            if self.hub is not None:
+                entry_id = self.entry.entry_id
+                self.hub.record(entry_id, now.timestamp(), refresh_duration)
+                if not overrun:
+                    # Keep the refreshes of several controllers apart
+                    self.update_interval = self.hub.next_interval(
+                        entry_id, self.base_update_interval
+                    )
 
             # All updates succeeded - commit the staged mappings atomically, then
             # check for MQTT name collisions and notify if any.
             self.mqtt_name_mapper.commit_refresh()
             self.mqtt_name_mapper.notify_collisions()
+
+            # async_delay_save restarts its timer on every call, so it is only
+            # called when no save is pending
+            if not self._snapshot_pending:
+                self._snapshot_pending = True
+                self._store.async_delay_save(
+                    self._pending_snapshot, SNAPSHOT_SAVE_DELAY
+                )
+
+            if self.command_queue:
+                self.entry.async_create_background_task(
+                    self.hass,
+                    self.async_replay_commands(),
+                    f"{DOMAIN} {self.default_name} replay commands",
+                )
         except InvalidAuth as error:
             raise ConfigEntryAuthFailed from error
         except CannotConnect as error:
             raise UpdateFailed(error) from error
         return {}
 
-    async def equipment_control(self, id, state):
-        await self.api.equipment_control(id, state)
+    def _handle_overrun(self, duration: float) -> bool:
+        """Give reef-pi time to idle after a refresh that took too long.
+
+        A refresh that took longer than the configured update interval counts as an
+        overrun. The next refresh then waits as long as this one took instead of the
+        update interval, and skips SHEDDABLE_STEPS if shedding is enabled. The
+        interval returns to the configured one after the first normal refresh.
+
+        Args:
+            duration: Duration of the refresh in seconds
+
+        Returns:
+            True if the refresh overran
+        """
+        base = self.base_update_interval
+        if duration <= base.total_seconds():
+            if self._overrun:
+                _LOGGER.debug("Refresh back to normal, polling every %s", base)
+                self._overrun = False
+            self.update_interval = base
+            return False
+
+        self._overrun = True
+        self.overruns += 1
+        self.update_interval = max(base, timedelta(seconds=duration))
+        self._shed_next = self.overrun_shedding
+        _LOGGER.debug(
+            "Refresh took %.1fs, longer than %s; next refresh in %s",
+            duration,
+            base,
+            self.update_interval,
+        )
+        return True
+
+    async def equipment_control(self, id, state, queue=True):
+        result = await self._async_send(
+            "equipment",
+            id,
+            state,
+            lambda: self.api.equipment_control(id, state),
+            queue,
+        )
         self.equipment[id]["state"] = state
-
-    async def light_control(self, id, value):
-        await self.api.light_update(
-            self.lights[id]["light_id"], self.lights[id]["channel_id"], value
+        self.equipment[id]["updated_at"] = dt_util.utcnow()
+        self.schedule_verify("equipment", id)
+        return result
+
+    async def light_control(self, id, value, queue=True):
+        result = await self._async_send(
+            "lights",
+            id,
+            value,
+            lambda: self.light_batcher.async_set(
+                self.lights[id]["light_id"], self.lights[id]["channel_id"], value
+            ),
+            queue,
         )
         self.lights[id]["value"] = value
+        light = self.light_objects.get(self.lights[id]["light_id"])
+        if light:
+            light["channels"][self.lights[id]["channel_id"]]["value"] = value
         if value > 0:
             self.lights[id]["state"] = True
         else:
             self.lights[id]["state"] = False
-
-    async def ato_update(self, id, enable):
-        await self.api.ato_update(id, enable)
+        self.lights[id]["updated_at"] = dt_util.utcnow()
+        return result
+
+    async def ato_update(self, id, enable, queue=True):
+        result = await self._async_send(
+            "atos",
+            id,
+            enable,
+            lambda: self.api.ato_update(id, enable, self.control_base("atos", id)),
+            queue,
+        )
         self.ato[id]["enable"] = enable
+        self.schedule_verify("atos", id)
+        return result
 
     async def run_script(self, id):
         await self.api.run_macro(id)
@@ -527,6 +1107,311 @@ class ReefPiDataUpdateCoordinator(DataUpdateCoordinator):
         await self.api.display_brightness(value)
         self.display["brightness"] = value
 
-    async def timer_control(self, id, state):
-        await self.api.timer_control(id, state)
+    async def timer_control(self, id, state, queue=True):
+        result = await self._async_send(
+            "timers",
+            id,
+            state,
+            lambda: self.api.timer_control(id, state, self.control_base("timers", id)),
+            queue,
+        )
         self.timers[id]["state"] = state
+        self.timers[id]["attributes"]["enable"] = state
+        self.timers[id]["updated_at"] = dt_util.utcnow()
+        self.schedule_verify("timers", id)
+        return result
+
+    async def _async_send(
+        self, kind: str, id: str, state: Any, send, queue: bool = True
+    ) -> bool:
+        """Send a command, or queue it if reef-pi is unreachable and queuing is on.
+
+        Args:
+            kind: "equipment", "timers", "atos" or "lights"
+            id: reef-pi ID of the device
+            state: State or value sent
+            send: Function returning the awaitable that sends the command
+            queue: False to raise CannotConnect instead of queuing, e.g. when
+                replaying queued commands
+
+        Returns:
+            The result of the command, True if it was queued
+        """
+        if self.command_queue is None or not queue:
+            return await send()
+        try:
+            result = await send()
+        except CannotConnect:
+            self.command_queue.add(kind, id, state)
+            self._save_commands()
+            _LOGGER.warning(
+                "%s is unreachable, queued %s %s: %s",
+                self.default_name,
+                kind,
+                id,
+                state,
+            )
+            return True
+
+        if (kind, id) in self.command_queue:
+            # Superseded by the command just sent
+            self.command_queue.discard(kind, id)
+            self._save_commands()
+        return result
+
+    def _save_commands(self) -> None:
+        """Persist the command queue shortly, coalescing changes."""
+        if self.command_queue is None:
+            return
+        self._commands_store.async_delay_save(
+            self.command_queue.as_list, COMMAND_QUEUE_SAVE_DELAY
+        )
+
+    async def async_load_commands(self) -> None:
+        """Load commands queued before a restart."""
+        if self.command_queue is None:
+            return
+        self.command_queue.load(await self._commands_store.async_load() or [])
+
+    async def async_replay_commands(self) -> None:
+        """Send queued commands in order, stopping when reef-pi is unreachable."""
+        if self.command_queue is None or self._replaying:
+            return
+        queued = len(self.command_queue)
+        pending = self.command_queue.pending()
+        if not pending:
+            if queued:
+                # All commands expired
+                self._save_commands()
+            return
+
+        controls = {
+            "equipment": self.equipment_control,
+            "timers": self.timer_control,
+            "atos": self.ato_update,
+            "lights": self.light_control,
+        }
+        sent = 0
+        self._replaying = True
+        try:
+            for kind, id, state in pending:
+                if id not in self.devices(kind):
+                    _LOGGER.warning("Dropped command for removed %s %s", kind, id)
+                    self.command_queue.discard(kind, id)
+                    continue
+                try:
+                    await controls[kind](id, state, queue=False)
+                except (CannotConnect, InvalidAuth) as ex:
+                    _LOGGER.debug("Replay of queued commands stopped: %s", ex)
+                    break
+                _LOGGER.info("Sent queued command %s %s: %s", kind, id, state)
+                self.command_queue.discard(kind, id)
+                sent += 1
+        finally:
+            self._replaying = False
+            if len(self.command_queue) != queued:
+                self._save_commands()
+        if sent:
+            self.async_update_listeners()
+
+    def devices(self, kind: str) -> dict[str, dict]:
+        """Return the controllable devices of a kind by reef-pi ID.
+
+        Args:
+            kind: "equipment", "timers", "atos" or "lights"
+        """
+        return getattr(self, "ato" if kind == "atos" else kind)
+
+    async def async_set_state(
+        self, items: list[tuple[str, str, Any]]
+    ) -> dict[tuple[str, str], str | None]:
+        """Switch several devices concurrently and notify listeners once.
+
+        All commands are sent at the same time; the request scheduler of the API
+        bounds how many of them reach the controller in parallel, and channels of
+        the same light are combined into one update by the light batcher.
+
+        Args:
+            items: (kind, reef-pi id, state) tuples, kind being "equipment",
+                "timers" or "atos" with a boolean state, or "lights" with the
+                channel value in percent
+
+        Returns:
+            Error message by (kind, id), None for items that were switched
+        """
+        controls = {
+            "equipment": self.equipment_control,
+            "timers": self.timer_control,
+            "atos": self.ato_update,
+            "lights": self.light_control,
+        }
+
+        async def set_state(kind: str, id: str, state: Any) -> str | None:
+            if id not in self.devices(kind):
+                # Deleted in reef-pi, its entities are not retired yet
+                return "no longer exists in reef-pi"
+            try:
+                if not await controls[kind](id, state):
+                    return "rejected by reef-pi"
+            except (CannotConnect, InvalidAuth) as ex:
+                return str(ex) or type(ex).__name__
+            if self.command_queue is not None and (kind, id) in self.command_queue:
+                return "queued until reef-pi is reachable"
+            return None
+
+        errors = await asyncio.gather(
+            *(set_state(kind, id, state) for kind, id, state in items)
+        )
+        self.async_update_listeners()
+        return {(kind, id): error for (kind, id, _), error in zip(items, errors)}
+
+    def capture_state(self) -> dict[str, dict[str, Any]]:
+        """Return the state of everything that can be controlled.
+
+        Returns:
+            Equipment, timer and ATO states as booleans and manual light channel
+            values in percent, by kind and reef-pi id
+        """
+        return {
+            "equipment": {id: d["state"] for id, d in self.equipment.items()},
+            "timers": {id: d["state"] for id, d in self.timers.items()},
+            "atos": {id: bool(d.get("enable")) for id, d in self.ato.items()},
+            "lights": {id: d["value"] for id, d in self.lights.items()},
+        }
+
+    async def async_save_state(self, name: str, persist: bool = False) -> dict:
+        """Remember the current state of everything that can be controlled.
+
+        Args:
+            name: Name to restore the state by
+            persist: Also store the state so it survives a restart
+
+        Returns:
+            The saved state, see capture_state
+        """
+        state = self.capture_state()
+        self.saved_states[name] = state
+        if persist:
+            stored = await self._saved_states_store.async_load() or {}
+            stored[name] = state
+            await self._saved_states_store.async_save(stored)
+        return state
+
+    async def async_load_state(self, name: str) -> dict[str, dict[str, Any]] | None:
+        """Return the state saved by a name, None if there is none."""
+        state = self.saved_states.get(name)
+        if state is None:
+            stored = await self._saved_states_store.async_load() or {}
+            state = stored.get(name)
+        return state
+
+    async def async_restore_state(
+        self, name: str, state: dict[str, dict[str, Any]] | None = None
+    ) -> dict[tuple[str, str], str | None] | None:
+        """Bring everything that changed since a saved state back to it.
+
+        Only devices whose state differs are sent a command, all of them
+        concurrently. Devices that no longer exist are skipped.
+
+        Args:
+            name: Name the state was saved by
+            state: The saved state if already loaded by ``async_load_state``
+
+        Returns:
+            Error message by (kind, id) of the changed devices, None for the ones
+            restored, or None if there is no state with that name
+        """
+        if state is None:
+            state = await self.async_load_state(name)
+        if state is None:
+            return None
+
+        current = self.capture_state()
+        items = [
+            (kind, id, value)
+            for kind, values in state.items()
+            for id, value in values.items()
+            if id in current.get(kind, {}) and current[kind][id] != value
+        ]
+        _LOGGER.debug("Restoring %s: %s", name, items)
+        return await self.async_set_state(items)
+
+    def schedule_verify(self, kind: str, id: str) -> None:
+        """Read back an object changed by a command after COMMAND_VERIFY_DELAY.
+
+        Only the changed objects are read and patched into the coordinator data,
+        which confirms the new state long before the next full refresh. Commands
+        within the delay of each other, e.g. the devices switched by one service
+        call, are confirmed together: one read per kind and one listener update.
+
+        Args:
+            kind: "equipment", "timers" or "atos"
+            id: reef-pi ID of the object
+        """
+        self._verify_pending.add((kind, id))
+        if self._verify_unsub:
+            self._verify_unsub()
+        self._verify_unsub = async_call_later(
+            self.hass, COMMAND_VERIFY_DELAY, self._async_verify
+        )
+
+    def cancel_verify(self) -> None:
+        """Cancel pending reads, e.g. when the config entry is unloaded."""
+        if self._verify_unsub:
+            self._verify_unsub()
+            self._verify_unsub = None
+        self._verify_pending.clear()
+
+    async def _async_verify(self, _now=None) -> None:
+        self._verify_unsub = None
+        pending, self._verify_pending = self._verify_pending, set()
+        started = dt_util.utcnow()
+
+        ids_by_kind: dict[str, set[str]] = {}
+        for kind, id in pending:
+            ids_by_kind.setdefault(kind, set()).add(id)
+
+        confirmed = False
+        for kind, ids in ids_by_kind.items():
+            read = getattr(self.api, kind)
+            try:
+                if len(ids) == 1:
+                    id = next(iter(ids))
+                    devices = {id: await read(id)}
+                else:
+                    # One read of the list instead of one per object
+                    devices = {device["id"]: device for device in await read() or []}
+            except (CannotConnect, InvalidAuth) as ex:
+                _LOGGER.debug("Failed to confirm %s %s: %s", kind, sorted(ids), ex)
+                continue
+            for id in ids:
+                if device := devices.get(id):
+                    confirmed |= self._apply_verified(kind, id, device, started)
+        if confirmed:
+            self.async_update_listeners()
+
+    def _apply_verified(
+        self, kind: str, id: str, device: dict, started: datetime
+    ) -> bool:
+        """Patch an object read back after a command into the coordinator data."""
+        _LOGGER.debug("Confirmed %s %s: %s", kind, id, device)
+        if kind == "atos":
+            if id not in self.ato:
+                return False
+            self.ato[id] = device
+            return True
+
+        current = getattr(self, kind)
+        if id not in current:
+            return False
+        polled = {
+            id: {
+                "name": device["name"],
+                "state": device["on" if kind == "equipment" else "enable"],
+                "attributes": device,
+                "updated_at": started,
+            }
+        }
+        self._keep_fresher(current, polled, started, ("state",))
+        current[id] = polled[id]
+        return True
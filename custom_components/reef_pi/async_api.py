@@ -1,21 +1,36 @@
 """Reef Pi api wrapper"""
 
+import asyncio
+import copy
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any
 
 import httpx
 
+from .perf_stats import ReefPiTimingStats, endpoint_key
+from .scheduler import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, ReefPiRequestScheduler
+
 REEFPI_DATETIME_FORMAT = "%b-%d-%H:%M, %Y"
 logger = logging.getLogger(__name__)
 
 
 class ReefApi:
-    def __init__(self, host, verify=False, timeout_sec=15):
+    def __init__(self, host, verify=False, timeout_sec=15, scheduler=None):
         self.host = host
         self.verify = verify
         self.cookies = {}
         self.timeout = timeout_sec
+        self.stats = ReefPiTimingStats()
+        # Commands (POST) are served before polling (GET) and requests to the
+        # controller are capped, see ReefPiRequestScheduler
+        self.scheduler = scheduler or ReefPiRequestScheduler()
+        # One client (and connection pool) for all requests, see close
+        self._client: httpx.AsyncClient | None = None
+        self._requests: set[asyncio.Future] = set()
+        self._closed = False
 
         if not verify:
             import urllib3
@@ -25,53 +40,125 @@ class ReefApi:
     def is_authenticated(self):
         return self.cookies != {}
 
-    async def authenticate(self, user, password):
+    async def close(self) -> None:
+        """Cancel requests in flight and close the connections to reef-pi.
+
+        Cancelled requests raise CannotConnect. The API can't be used afterwards.
+        """
+        self._closed = True
+        for request in self._requests:
+            request.cancel()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    async def _call(self, method, url, payload) -> httpx.Response:
+        """Send a request, raising CannotConnect on errors and when closed."""
+        if self._closed:
+            raise CannotConnect("API closed")
+        if self._client is None:
+            self._client = httpx.AsyncClient(verify=self.verify)
+        self._client.cookies = self.cookies
+
+        request = asyncio.ensure_future(
+            self._client.request(method, url, json=payload, timeout=self.timeout)
+        )
+        self._requests.add(request)
         try:
-            async with httpx.AsyncClient(verify=self.verify) as client:
-                auth = {"user": user, "password": password}
-                url = f"{self.host}/auth/signin"
-                response = await client.post(url, json=auth, timeout=self.timeout)
-
-                if response.status_code == 200:
-                    self.cookies = {"auth": response.cookies["auth"]}
+            return await request
         except httpx.HTTPError as exc:
             raise CannotConnect from exc
+        except asyncio.CancelledError:
+            if self._closed and request.cancelled():
+                raise CannotConnect("API closed") from None
+            raise
+        finally:
+            self._requests.discard(request)
+
+    async def authenticate(self, user, password):
+        async with self.scheduler.slot(PRIORITY_INTERACTIVE):
+            auth = {"user": user, "password": password}
+            url = f"{self.host}/auth/signin"
+            response = await self._call("POST", url, auth)
+
+            if response.status_code == 200:
+                self.cookies = {"auth": response.cookies["auth"]}
 
         if response.status_code != 200:
             raise InvalidAuth
 
-    async def _get(self, api) -> Any:
-        if not self.is_authenticated():
-            raise InvalidAuth
+    async def _request(
+        self, method, api, payload=None, priority=PRIORITY_BACKGROUND
+    ) -> httpx.Response:
+        key = endpoint_key(method, api)
+        async with self.scheduler.slot(priority):
+            return await self._send(key, method, api, payload)
 
+    async def _send(self, key, method, api, payload) -> httpx.Response:
+        started = time.monotonic()
         try:
-            async with httpx.AsyncClient(verify=self.verify) as client:
-                url = f"{self.host}/api/{api}"
-                client.cookies = self.cookies
-                response = await client.get(url, timeout=self.timeout)
-        except httpx.HTTPError as exc:
-            raise CannotConnect from exc
+            response = await self._call(method, f"{self.host}/api/{api}", payload)
+        except CannotConnect:
+            self.stats.record(key, time.monotonic() - started, error=True)
+            raise
+
+        self.stats.record(
+            key,
+            time.monotonic() - started,
+            len(response.content),
+            error=not response.is_success,
+        )
+        return response
+
+    async def _get(self, api, priority=PRIORITY_BACKGROUND) -> Any:
+        if not self.is_authenticated():
+            raise InvalidAuth
 
+        response = await self._request("GET", api, priority=priority)
         if response.status_code != 200:
             return {}
         return response.json()
 
-    async def _post(self, api, payload) -> bool:
+    async def _post(self, api, payload, priority=PRIORITY_INTERACTIVE) -> bool:
         if not self.is_authenticated():
             raise InvalidAuth
 
-        try:
-            async with httpx.AsyncClient(verify=self.verify) as client:
-                url = f"{self.host}/api/{api}"
-                client.cookies = self.cookies
-                response = await client.post(url, json=payload, timeout=self.timeout)
-                return response.is_success
-        except httpx.HTTPError as exc:
-            raise CannotConnect from exc
+        response = await self._request("POST", api, payload, priority)
+        return response.is_success
+
+    async def _post_modified(
+        self, api, modify: Callable[[dict], None], base: dict | None = None
+    ) -> bool:
+        """Post back an object after modifying it.
+
+        reef-pi replaces the whole object on update. A known copy of it (e.g. from the
+        last poll) saves reading it first; the object is only read again if there is
+        no copy or reef-pi rejects the update based on it.
+
+        Args:
+            api: API path of the object
+            modify: Function applying the change to the payload in place
+            base: Known copy of the object, left unchanged
+
+        Returns:
+            True if reef-pi accepted the update
+        """
+        if base is not None:
+            payload = copy.deepcopy(base)
+            modify(payload)
+            if await self._post(api, payload):
+                return True
+            logger.debug("Update of %s from known copy rejected, reading it", api)
+
+        payload = await self._get(api, PRIORITY_INTERACTIVE)
+        modify(payload)
+        return await self._post(api, payload)
+
+    # Single objects are read to confirm a command, ahead of polling
 
     async def equipment(self, id=None):
         if id:
-            return await self._get(f"equipment/{id}")
+            return await self._get(f"equipment/{id}", PRIORITY_INTERACTIVE)
         return await self._get("equipment")
 
     async def equipment_control(self, id, state):
@@ -131,41 +218,39 @@ class ReefApi:
     async def lights(self):
         return await self._get("lights")
 
-    async def timers(self):
+    async def timers(self, id=None):
+        if id:
+            return await self._get(f"timers/{id}", PRIORITY_INTERACTIVE)
         return await self._get("timers")
 
-    async def timer_control(self, id, state):
-        payload = await self._get(f"timers/{id}")
-        payload["enable"] = state
-        return await self._post(f"timers/{id}", payload)
+    async def timer_control(self, id, state, base: dict | None = None):
+        return await self._post_modified(
+            f"timers/{id}", lambda payload: payload.update(enable=state), base
+        )
 
     async def inlets(self):
         return await self._get("inlets")
 
     async def inlet(self, id):
-        try:
-            async with httpx.AsyncClient(verify=self.verify) as client:
-                url = f"{self.host}/api/inlets/{id}/read"
-                client.cookies = self.cookies
-                response = await client.post(url, json={}, timeout=self.timeout)
-                if response.status_code != 200:
-                    return {}
-                return response.json()
-        except httpx.HTTPError as exc:
-            raise CannotConnect from exc
+        response = await self._request("POST", f"inlets/{id}/read", {})
+        if response.status_code != 200:
+            return {}
+        return response.json()
 
     async def light(self, id):
         return await self._get(f"lights/{id}")
 
-    async def pump(self, id) -> Dict[str, str]:
+    async def pump_usage(self, id) -> list[dict[str, Any]]:
         readings = await self._get(f"doser/pumps/{id}/usage")
         if readings and "current" in readings.keys() and len(readings["current"]):
-            return readings["current"][-1]
+            return readings["current"]
         if readings and "historical" in readings.keys() and len(readings["historical"]):
-            return readings["historical"][-1]
-        return {}
+            return readings["historical"]
+        return []
 
-    async def atos(self):
+    async def atos(self, id=None):
+        if id:
+            return await self._get(f"atos/{id}", PRIORITY_INTERACTIVE)
         return await self._get("atos")
 
     async def ato(self, id):
@@ -176,15 +261,21 @@ class ReefApi:
             return readings["historical"]
         return []
 
-    async def ato_update(self, id, enable):
-        payload = await self._get(f"atos/{id}")
-        payload["enable"] = enable
-        return await self._post(f"atos/{id}", payload)
+    async def ato_update(self, id, enable, base: dict | None = None):
+        return await self._post_modified(
+            f"atos/{id}", lambda payload: payload.update(enable=enable), base
+        )
+
+    async def light_update_channels(
+        self, id, values: dict[str, Any], base: dict | None = None
+    ) -> bool:
+        """Set the value of several channels of a light in one update."""
+
+        def modify(payload):
+            for channel_id, value in values.items():
+                payload["channels"][channel_id]["value"] = value
 
-    async def light_update(self, id, channel_id, value):
-        payload = await self._get(f"lights/{id}")
-        payload["channels"][channel_id]["value"] = value
-        return await self._post(f"lights/{id}", payload)
+        return await self._post_modified(f"lights/{id}", modify, base)
 
     async def macros(self):
         return await self._get("macros")
@@ -198,7 +289,7 @@ class ReefApi:
     async def power_off(self) -> bool:
         return await self._post("admin/poweroff", {})
 
-    async def display_state(self) -> Dict[str, Any]:
+    async def display_state(self) -> dict[str, Any]:
         return await self._get("display")
 
     async def display_switch(self, on: bool) -> bool:
@@ -1,59 +1,42 @@
 """Platform for reef-pi sensor integration."""
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
+from homeassistant.const import MATCH_ALL, Platform
 
 from .const import DOMAIN
+from .entity import ReefPiEntity, async_add_device_entities, config_attributes
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add multiple entity from a config_entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    inlets = [
-        ReefPiInlet(id, inlet["name"], coordinator)
-        for id, inlet in coordinator.inlets.items()
-    ]
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        Platform.BINARY_SENSOR,
+        lambda: coordinator.inlets,
+        lambda id, inlet: [ReefPiInlet(id, inlet["name"], coordinator)],
+    )
 
-    async_add_entities(inlets)
 
-
-class ReefPiInlet(CoordinatorEntity, BinarySensorEntity):
+class ReefPiInlet(ReefPiEntity, BinarySensorEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the binary sensors."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"inlets_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:water-circle"
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_inlets_{self._id}"
-
-    @property
-    def name(self):
-        """Return the name of the sensor"""
-        return self._name
-
-    @property
-    def is_on(self):
-        """Return the state of the sensor."""
-        return self.api.inlets[self._id]["state"]
-
-    @property
-    def available(self):
-        """Return if available"""
-        return self._id in self.api.inlets.keys()
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def extra_state_attributes(self):
-        return self.api.inlets[self._id]["attributes"]
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def _update_attrs(self):
+        inlet = self.api.inlets.get(self._id)
+        self._attr_available = inlet is not None
+        if inlet:
+            self._attr_is_on = inlet["state"]
+            self._attr_extra_state_attributes = config_attributes(
+                inlet["attributes"], ("name",)
+            )
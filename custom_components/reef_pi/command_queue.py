@@ -0,0 +1,85 @@
+"""Queue of reef-pi commands sent while the controller is unreachable."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import _LOGGER
+
+
+class ReefPiCommandQueue:
+    """Hold the last command per device until the controller is reachable again.
+
+    A device that is commanded again while its command is queued only keeps the
+    new command, which moves to the end of the queue, so a replay sends every
+    device at most once and in the order of the last commands. Commands older than
+    ``expiry`` are dropped instead of being sent long after they were meant.
+    """
+
+    def __init__(self, expiry: timedelta):
+        """Initialize the queue.
+
+        Args:
+            expiry: Time after which a queued command is dropped
+        """
+        self.expiry = expiry
+        self._commands: OrderedDict[tuple[str, str], tuple[Any, datetime]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of queued commands."""
+        return len(self._commands)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        """Return whether a command for (kind, id) is queued."""
+        return key in self._commands
+
+    def add(self, kind: str, id: str, state: Any, now: datetime | None = None) -> None:
+        """Queue a command, replacing an older one for the same device.
+
+        Args:
+            kind: "equipment", "timers", "atos" or "lights"
+            id: reef-pi ID of the device
+            state: State or value to send
+            now: Time of the command, defaults to the current time
+        """
+        key = (kind, id)
+        self._commands.pop(key, None)
+        self._commands[key] = (state, now or dt_util.utcnow())
+
+    def discard(self, kind: str, id: str) -> None:
+        """Forget the queued command of a device, e.g. after a newer one was sent."""
+        self._commands.pop((kind, id), None)
+
+    def pending(self, now: datetime | None = None) -> list[tuple[str, str, Any]]:
+        """Drop expired commands and return the rest in replay order.
+
+        Args:
+            now: Current time, defaults to the current time
+
+        Returns:
+            (kind, id, state) tuples
+        """
+        now = now or dt_util.utcnow()
+        for key, (state, queued_at) in list(self._commands.items()):
+            if now - queued_at > self.expiry:
+                _LOGGER.warning("Dropped expired command %s %s: %s", *key, state)
+                del self._commands[key]
+        return [(kind, id, state) for (kind, id), (state, _) in self._commands.items()]
+
+    def as_list(self) -> list[list]:
+        """Return the queued commands for storage."""
+        return [
+            [kind, id, state, queued_at.isoformat()]
+            for (kind, id), (state, queued_at) in self._commands.items()
+        ]
+
+    def load(self, commands: list[list]) -> None:
+        """Queue commands from ``as_list`` output."""
+        for kind, id, state, queued_at in commands:
+            self.add(kind, id, state, dt_util.parse_datetime(queued_at))
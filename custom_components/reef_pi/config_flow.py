@@ -11,10 +11,27 @@ from homeassistant.core import HomeAssistant, callback
 
 from .async_api import CannotConnect, InvalidAuth, ReefApi
 from .const import (
+    ADAPTIVE_POLLING,
+    ADAPTIVE_POLLING_MAX,
+    COMMAND_QUEUE,
+    COMMAND_QUEUE_EXPIRY,
     CONFIG_OPTIONS,
+    DEFAULT_ADAPTIVE_POLLING_MAX,
+    DEFAULT_COMMAND_QUEUE_EXPIRY,
+    DEFAULT_PH_DEADBAND,
+    DEFAULT_PH_PRECISION,
+    DEFAULT_STATE_HEARTBEAT,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TEMPERATURE_PRECISION,
     DISABLE_PH,
     DOMAIN,
     MQTT_ENABLED,
+    OVERRUN_SHEDDING,
+    PH_DEADBAND,
+    PH_PRECISION,
+    STATE_HEARTBEAT,
+    TEMPERATURE_DEADBAND,
+    TEMPERATURE_PRECISION,
     UPDATE_INTERVAL_CFG,
 )
 
@@ -29,11 +46,13 @@ async def validate_input(_hass: HomeAssistant, data: dict[str, Any]) -> dict[str
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
     hub = ReefApi(data["host"], verify=data["verify"])
+    try:
+        await hub.authenticate(data["username"], data["password"])
+        info = await hub.info()
+        telemetry = await hub.telemetry_config()
+    finally:
+        await hub.close()
 
-    await hub.authenticate(data["username"], data["password"])
-    info = await hub.info()
-
-    telemetry = await hub.telemetry_config()
     mqtt_config = telemetry.get("mqtt", {})
     mqtt_prefix = mqtt_config.get("prefix", "reef-pi")
     mqtt_available = mqtt_config.get("enable", False)
@@ -99,10 +118,10 @@ class ReefPiConfigFlowHandler(config_entries.OptionsFlow):
 
     async def _refresh_mqtt_config(self):
         """Refresh MQTT configuration from reef-pi."""
+        hub = ReefApi(
+            self.config_entry.data["host"], verify=self.config_entry.data["verify"]
+        )
         try:
-            hub = ReefApi(
-                self.config_entry.data["host"], verify=self.config_entry.data["verify"]
-            )
             await hub.authenticate(
                 self.config_entry.data["username"], self.config_entry.data["password"]
             )
@@ -128,6 +147,8 @@ class ReefPiConfigFlowHandler(config_entries.OptionsFlow):
                 )
         except Exception as ex:
             _LOGGER.warning("Failed to refresh MQTT config: %s", ex)
+        finally:
+            await hub.close()
 
     async def async_step_user(self, user_input=None) -> config_entries.ConfigFlowResult:
         """Handle a flow initialized by the user."""
@@ -154,6 +175,62 @@ class ReefPiConfigFlowHandler(config_entries.OptionsFlow):
             ): bool,
         }
 
+        options = self.config_entry.options
+        deadband = vol.All(vol.Coerce(float), vol.Range(min=0))
+        precision = vol.All(vol.Coerce(int), vol.Range(min=0, max=4))
+        schema_dict.update(
+            {
+                vol.Optional(
+                    TEMPERATURE_DEADBAND,
+                    default=options.get(
+                        TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                    ),  # type: ignore
+                ): deadband,
+                vol.Optional(
+                    TEMPERATURE_PRECISION,
+                    default=options.get(
+                        TEMPERATURE_PRECISION, DEFAULT_TEMPERATURE_PRECISION
+                    ),  # type: ignore
+                ): precision,
+                vol.Optional(
+                    PH_DEADBAND,
+                    default=options.get(PH_DEADBAND, DEFAULT_PH_DEADBAND),  # type: ignore
+                ): deadband,
+                vol.Optional(
+                    PH_PRECISION,
+                    default=options.get(PH_PRECISION, DEFAULT_PH_PRECISION),  # type: ignore
+                ): precision,
+                vol.Optional(
+                    STATE_HEARTBEAT,
+                    default=options.get(STATE_HEARTBEAT, DEFAULT_STATE_HEARTBEAT),  # type: ignore
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    COMMAND_QUEUE,
+                    default=options.get(COMMAND_QUEUE, False),  # type: ignore
+                ): bool,
+                vol.Optional(
+                    COMMAND_QUEUE_EXPIRY,
+                    default=options.get(
+                        COMMAND_QUEUE_EXPIRY, DEFAULT_COMMAND_QUEUE_EXPIRY
+                    ),  # type: ignore
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    ADAPTIVE_POLLING,
+                    default=options.get(ADAPTIVE_POLLING, False),  # type: ignore
+                ): bool,
+                vol.Optional(
+                    ADAPTIVE_POLLING_MAX,
+                    default=options.get(
+                        ADAPTIVE_POLLING_MAX, DEFAULT_ADAPTIVE_POLLING_MAX
+                    ),  # type: ignore
+                ): vol.All(vol.Coerce(int), vol.Range(min=60)),
+                vol.Optional(
+                    OVERRUN_SHEDDING,
+                    default=options.get(OVERRUN_SHEDDING, False),  # type: ignore
+                ): bool,
+            }
+        )
+
         if mqtt_available:
             schema_dict[
                 vol.Optional(
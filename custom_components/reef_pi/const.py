@@ -1,11 +1,13 @@
 """Constants for the ha_reef_pi integration."""
 
 import logging
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 
 import voluptuous as vol
 
 DOMAIN = "reef_pi"
+# Key of the ReefPiHub shared by all config entries in hass.data[DOMAIN]
+DATA_HUB = "hub"
 MANUFACTURER = "reef-pi.github.io"
 
 HOST = "host"
@@ -16,9 +18,92 @@ UPDATE_INTERVAL_CFG = "update_interval"
 DISABLE_PH = "disable_ph"
 MQTT_ENABLED = "mqtt_enabled"
 MQTT_PREFIX = "mqtt_prefix"
+TEMPERATURE_DEADBAND = "temperature_deadband"
+TEMPERATURE_PRECISION = "temperature_precision"
+PH_DEADBAND = "ph_deadband"
+PH_PRECISION = "ph_precision"
+STATE_HEARTBEAT = "state_heartbeat"
+COMMAND_QUEUE = "command_queue"
+COMMAND_QUEUE_EXPIRY = "command_queue_expiry"
+ADAPTIVE_POLLING = "adaptive_polling"
+ADAPTIVE_POLLING_MAX = "adaptive_polling_max"
+OVERRUN_SHEDDING = "overrun_shedding"
 UPDATE_INTERVAL_MIN = timedelta(minutes=1)
 TIMEOUT_API_SEC = 1
 
+# Significant-change filter of temperature and pH states
+DEFAULT_TEMPERATURE_DEADBAND = 0.1
+DEFAULT_TEMPERATURE_PRECISION = 1
+DEFAULT_PH_DEADBAND = 0.02
+DEFAULT_PH_PRECISION = 2
+DEFAULT_STATE_HEARTBEAT = 900
+
+# Commands queued while reef-pi is unreachable are dropped after this many seconds
+DEFAULT_COMMAND_QUEUE_EXPIRY = 600
+COMMAND_QUEUE_SAVE_DELAY = 1
+
+# Longest interval in seconds of a subsystem that does not change with adaptive
+# polling; the shortest is the update interval
+DEFAULT_ADAPTIVE_POLLING_MAX = 600
+
+# Readings kept per temperature/pH sensor and the window of the trend sensors
+TREND_SAMPLES = 720
+TREND_WINDOW = timedelta(hours=1)
+
+# Seconds light channel changes are collected before they are sent together
+LIGHT_BATCH_DELAY = 0.3
+
+# Polled timers, ATOs and lights younger than this are updated without reading
+# them from reef-pi first
+CONTROL_BASE_MAX_AGE = timedelta(minutes=5)
+
+# Successful refreshes a device has to be missing in before its entities are removed
+ENTITY_RETIRE_AFTER = 3
+
+# Seconds after a command until the changed object is read back from reef-pi
+COMMAND_VERIFY_DELAY = 1.0
+
+# Placeholder time of pumps and ATOs that have not run yet
+EPOCH = datetime.fromtimestamp(0, tz=UTC)
+
+# Persisted last-known snapshot used to start without waiting for the controller.
+# Written at most every SNAPSHOT_SAVE_DELAY seconds to spare SD cards, and when the
+# config entry is unloaded or Home Assistant stops.
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 900
+
+# Steps of a refresh cycle, in the order they run. Each step is timed separately.
+REFRESH_STEPS = (
+    "capabilities",
+    "info",
+    "temperature",
+    "equipment",
+    "ph",
+    "pumps",
+    "atos",
+    "inlets",
+    "lights",
+    "display",
+    "macros",
+    "timers",
+)
+
+# Steps skipped in the refresh after an overrun when shedding is enabled: slowly
+# changing subsystems, or ones MQTT keeps up to date in between
+SHEDDABLE_STEPS = ("capabilities", "macros", "display", "inlets", "pumps")
+
+# Options applied to a running config entry, changing others reloads it
+LIVE_OPTIONS = (
+    UPDATE_INTERVAL_CFG,
+    DISABLE_PH,
+    MQTT_ENABLED,
+    ADAPTIVE_POLLING,
+    ADAPTIVE_POLLING_MAX,
+    OVERRUN_SHEDDING,
+)
+# Config entry data that does not affect a running config entry
+LIVE_DATA = (UPDATE_INTERVAL_CFG, "mqtt_available")
+
 
 CONFIG_OPTIONS = {
     vol.Required(HOST, default="https://127.0.0.1"): str,  # type: ignore
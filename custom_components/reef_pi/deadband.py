@@ -0,0 +1,82 @@
+"""Significant-change filter for reef-pi sensor readings."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+
+class ReefPiDeadband:
+    """Hold back readings that differ only insignificantly from the published one.
+
+    Probes jitter in the last decimals, so without filtering every poll and every
+    MQTT message creates a new state. A reading is rounded to ``precision`` and only
+    replaces the published value if it moved by at least ``deadband``, or if the
+    published value is older than ``heartbeat``.
+    """
+
+    def __init__(
+        self,
+        deadband: float = 0.0,
+        precision: int | None = None,
+        heartbeat: timedelta | None = None,
+    ):
+        """Initialize the filter.
+
+        Args:
+            deadband: Minimum change of the rounded reading to publish it
+            precision: Number of decimals kept, None to keep the reading as is
+            heartbeat: Publish the current reading at least this often, None to
+                publish only significant changes
+        """
+        self.deadband = deadband
+        self.precision = precision
+        self.heartbeat = heartbeat
+        self._value: float | None = None
+        self._published_at: datetime | None = None
+
+    @property
+    def value(self) -> float | None:
+        """Return the published value."""
+        return self._value
+
+    def apply(self, reading, now: datetime | None = None) -> float | None:
+        """Filter a new reading.
+
+        Args:
+            reading: Reading from polling or MQTT, numeric or numeric string
+            now: Time of the reading, defaults to the current time
+
+        Returns:
+            The value to publish, either the new reading or the previous value
+        """
+        if reading is None:
+            self._value = None
+            self._published_at = None
+            return None
+
+        try:
+            value = float(reading)
+        except (TypeError, ValueError):
+            return reading
+        if self.precision is not None:
+            value = round(value, self.precision)
+
+        if now is None:
+            now = dt_util.utcnow()
+
+        if (
+            # Nothing published yet
+            self._value is None
+            or self._published_at is None
+            # Rounded, so that 8.22 - 8.20 counts as a 0.02 change
+            or round(abs(value - self._value), 9) >= self.deadband
+            or (
+                self.heartbeat is not None
+                and now - self._published_at >= self.heartbeat
+            )
+        ):
+            self._value = value
+            self._published_at = now
+        return self._value
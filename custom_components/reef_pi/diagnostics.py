@@ -0,0 +1,90 @@
+"""Diagnostics support for reef-pi integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, HOST, PASSWORD, USER
+
+# Credentials and the controller's address, in the entry and in reef-pi info
+TO_REDACT = {HOST, PASSWORD, USER, "ip"}
+
+# Coordinator dicts whose sizes are reported
+DATA_ATTRIBUTES = (
+    "tcs",
+    "equipment",
+    "ph",
+    "pumps",
+    "ato",
+    "ato_states",
+    "inlets",
+    "lights",
+    "timers",
+    "macros",
+)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    mapper = coordinator.mqtt_name_mapper
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "coordinator": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "capabilities": coordinator.capabilities,
+            "info": async_redact_data(coordinator.info, TO_REDACT),
+            "data_sizes": {
+                name: len(getattr(coordinator, name)) for name in DATA_ATTRIBUTES
+            },
+        },
+        "mqtt": {
+            "enabled": coordinator.mqtt_enabled,
+            "prefix": coordinator.mqtt_prefix,
+            "subscribed": coordinator.mqtt_handler is not None,
+            "tracker": (
+                coordinator.mqtt_tracker.get_stats()
+                if coordinator.mqtt_tracker
+                else None
+            ),
+            "topics": len(mapper.topic_to_device),
+            "collisions": {
+                topic: [list(device) for device in devices]
+                for topic, devices in mapper.get_collisions().items()
+            },
+        },
+        "refresh": {
+            "recent_durations": coordinator.refresh_stats.recent("refresh"),
+            "steps": coordinator.refresh_stats.get_stats(),
+            "intervals": (
+                coordinator.polling.get_stats() if coordinator.polling else None
+            ),
+        },
+        "api": {
+            "requests": coordinator.api.stats.total_count,
+            "errors": coordinator.api.stats.total_errors,
+            "bytes": coordinator.api.stats.total_bytes,
+            "endpoints": coordinator.api.stats.get_stats(),
+            "queue_wait": coordinator.api.scheduler.stats.get_stats(),
+        },
+        "hub": (
+            {
+                "controllers": coordinator.hub.get_stats(),
+                "queue_wait": coordinator.hub.requests.stats.get_stats(),
+            }
+            if coordinator.hub is not None
+            else None
+        ),
+    }
@@ -0,0 +1,172 @@
+"""Base entity for reef-pi integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import _LOGGER, DOMAIN, ENTITY_RETIRE_AFTER
+
+if TYPE_CHECKING:
+    from . import ReefPiDataUpdateCoordinator
+
+
+def config_attributes(data: dict, exclude: Iterable[str]) -> dict:
+    """Return reef-pi configuration as state attributes.
+
+    Args:
+        data: Object as returned by the reef-pi API
+        exclude: Keys that are already part of the entity state or name
+
+    Returns:
+        Shallow copy of ``data`` without the excluded keys
+    """
+    return {key: value for key, value in data.items() if key not in exclude}
+
+
+def async_add_device_entities(
+    coordinator: ReefPiDataUpdateCoordinator,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    domain: str,
+    devices: Callable[[], dict[str, Any]],
+    create: Callable[[str, Any], Sequence[Entity]],
+) -> None:
+    """Add entities for reef-pi devices and keep them in line with the controller.
+
+    Entities are created for the devices known now and, on later refreshes, for
+    devices added in reef-pi, without reloading the config entry. Entities of a
+    device that is missing from ENTITY_RETIRE_AFTER successful refreshes in a row
+    are removed, so a single incomplete answer from reef-pi does not remove them.
+
+    Args:
+        coordinator: Coordinator of the controller
+        config_entry: Config entry being set up
+        async_add_entities: Callback of the platform to add entities
+        domain: Entity domain of the platform, e.g. ``Platform.SWITCH``
+        devices: Returns the current devices by reef-pi ID, e.g. ``coordinator.tcs``
+        create: Creates the entities of one device from its ID and data
+    """
+    known: dict[str, list[str]] = {}
+    missing: dict[str, int] = {}  # reef-pi ID -> refresh number
+
+    @callback
+    def async_update() -> None:
+        current = devices()
+
+        new_entities = []
+        for id, device in current.items():
+            missing.pop(id, None)
+            if id not in known:
+                entities = create(id, device)
+                known[id] = [
+                    entity.unique_id
+                    for entity in entities
+                    if entity.unique_id is not None
+                ]
+                new_entities.extend(entities)
+        if new_entities:
+            async_add_entities(new_entities)
+
+        if not coordinator.last_update_success:
+            return
+        registry = er.async_get(coordinator.hass)
+        for id in [id for id in known if id not in current]:
+            # Refresh in which the device was first missing; listeners also run on
+            # MQTT updates and commands, which must not count
+            first_missing = missing.setdefault(id, coordinator.refreshes)
+            if coordinator.refreshes - first_missing + 1 < ENTITY_RETIRE_AFTER:
+                continue
+            _LOGGER.info(
+                "Removing %s entities of deleted reef-pi device %s", domain, id
+            )
+            for unique_id in known.pop(id):
+                if entity_id := registry.async_get_entity_id(domain, DOMAIN, unique_id):
+                    registry.async_remove(entity_id)
+            del missing[id]
+
+    async_update()
+    config_entry.async_on_unload(coordinator.async_add_listener(async_update))
+
+
+class ReefPiEntity(CoordinatorEntity):
+    """Entity of a reef-pi controller.
+
+    Static values (unique id, name, device info) are set once when the entity is
+    created. Values taken from coordinator data are stored in ``_attr_*`` by
+    ``_update_attrs``, which runs when the entity is added and on every coordinator
+    update, so state writes don't look them up again. The state is only written
+    when it differs from the last written one; most updates change nothing.
+    """
+
+    _last_written: tuple | None = None
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: ReefPiDataUpdateCoordinator, unique_id: str):
+        """Initialize the entity.
+
+        Args:
+            coordinator: Coordinator of the controller
+            unique_id: Suffix appended to the controller unique id
+        """
+        super().__init__(coordinator)
+        self.api = coordinator
+        self._attr_unique_id = f"{coordinator.unique_id}_{unique_id}"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return if the device has data.
+
+        ``CoordinatorEntity.available`` only looks at the last refresh and never
+        reads the ``_attr_available`` set by ``_update_attrs``. A failed refresh
+        keeps the last known data, including data restored from the snapshot at
+        startup, so entities only become unavailable when their device is missing
+        from it. Commands sent meanwhile fail or are queued, see ``_async_send``.
+        """
+        return self._attr_available
+
+    def _update_attrs(self) -> None:
+        """Update ``_attr_*`` values from coordinator data."""
+
+    def _state_signature(self) -> tuple[Any, ...]:
+        """Return everything a state write would store."""
+        attributes = self.extra_state_attributes
+        return (
+            self.available,
+            self.state,
+            self.icon,
+            self.unit_of_measurement,
+            self.state_attributes,
+            # Copied, as attributes often reference coordinator data changed in place
+            dict(attributes) if attributes else None,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Compute the initial values before the first state write."""
+        await super().async_added_to_hass()
+        self._update_attrs()
+        self._last_written = self._state_signature()
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        """Update values from coordinator data and write the state if it changed."""
+        self._update_attrs()
+        signature = self._state_signature()
+        if signature == self._last_written:
+            return
+        self._last_written = signature
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_write_if_changed()
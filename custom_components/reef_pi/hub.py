@@ -0,0 +1,119 @@
+"""Coordination of the refreshes and requests of several reef-pi controllers."""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import timedelta
+
+from .scheduler import ReefPiRequestScheduler
+
+# Requests running at the same time across all controllers
+GLOBAL_MAX_CONCURRENT = 4
+
+# Random shift of a controller within its share of the interval, as a fraction
+STAGGER_JITTER = 0.2
+
+
+class ReefPiHub:
+    """Spread the refreshes of all controllers over the update interval.
+
+    Without coordination every config entry refreshes on the same schedule, so all
+    controllers are polled at once. The hub gives every controller its own share of
+    the interval (plus a random jitter within it) and stretches or shortens the next
+    interval of a controller until its refreshes start at that offset. Requests of
+    all controllers also share one ReefPiRequestScheduler, so their number is
+    limited across controllers as well as per controller.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = GLOBAL_MAX_CONCURRENT,
+        jitter: float = STAGGER_JITTER,
+        seed: int | None = None,
+    ):
+        """Initialize the hub.
+
+        Args:
+            max_concurrent: Maximum number of requests running at the same time
+                across all controllers
+            jitter: Random shift of a controller within its share of the interval,
+                as a fraction of the share
+            seed: Seed of the jitter, for reproducible tests
+        """
+        self.requests = ReefPiRequestScheduler(max_concurrent)
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._controllers: dict[str, dict] = {}
+
+    def register(self, entry_id: str) -> ReefPiRequestScheduler:
+        """Add a controller.
+
+        Args:
+            entry_id: Config entry ID of the controller
+
+        Returns:
+            Request scheduler for the controller's API, limited by the shared one
+        """
+        self._controllers[entry_id] = {
+            "jitter": self._random.random() * self.jitter,
+            "refreshes": 0,
+            "last_started": None,
+            "last_duration": None,
+        }
+        return ReefPiRequestScheduler(parent=self.requests)
+
+    def unregister(self, entry_id: str) -> None:
+        """Remove a controller, e.g. when its config entry is unloaded."""
+        self._controllers.pop(entry_id, None)
+
+    def offset(self, entry_id: str, period: float) -> float:
+        """Return the offset in seconds of a controller's refreshes in the period."""
+        order = sorted(self._controllers)
+        share = period / len(order)
+        return share * (order.index(entry_id) + self._controllers[entry_id]["jitter"])
+
+    def next_interval(
+        self, entry_id: str, interval: timedelta, now: float | None = None
+    ) -> timedelta:
+        """Return the interval until the next refresh of a controller.
+
+        Args:
+            entry_id: Config entry ID of the controller
+            interval: Configured update interval
+            now: Current POSIX time, defaults to the current time
+
+        Returns:
+            Interval that makes the next refresh start at the controller's offset,
+            between half and one and a half of ``interval``. The interval as is with
+            a single controller.
+        """
+        if len(self._controllers) < 2 or entry_id not in self._controllers:
+            return interval
+
+        period = interval.total_seconds()
+        now = time.time() if now is None else now
+        next_start = now - now % period + self.offset(entry_id, period)
+        while next_start < now + period / 2:
+            next_start += period
+        return timedelta(seconds=next_start - now)
+
+    def record(self, entry_id: str, started: float, duration: float) -> None:
+        """Record a finished refresh of a controller.
+
+        Args:
+            entry_id: Config entry ID of the controller
+            started: POSIX time the refresh started
+            duration: Duration of the refresh in seconds
+        """
+        if controller := self._controllers.get(entry_id):
+            controller["refreshes"] += 1
+            controller["last_started"] = started
+            controller["last_duration"] = duration
+
+    def get_stats(self) -> dict[str, dict]:
+        """Return the refresh timing of every controller."""
+        return {
+            entry_id: dict(controller)
+            for entry_id, controller in self._controllers.items()
+        }
@@ -1,82 +1,53 @@
 from math import ceil
+from typing import ClassVar
 
 from homeassistant.components.light import ATTR_BRIGHTNESS, LightEntity
 from homeassistant.components.light.const import ColorMode
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.const import MATCH_ALL, Platform
 
 from .const import _LOGGER, DOMAIN
+from .entity import ReefPiEntity, async_add_device_entities, config_attributes
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add multiple entity from a config_entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    manual_lights = [
-        ReefPiLight(id, lights["name"], coordinator)
-        for id, lights in coordinator.lights.items()
-    ]
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        Platform.LIGHT,
+        lambda: coordinator.lights,
+        lambda id, light: [ReefPiLight(id, light["name"], coordinator)],
+    )
 
-    async_add_entities(manual_lights)
 
-
-class ReefPiLight(CoordinatorEntity, LightEntity):
+class ReefPiLight(ReefPiEntity, LightEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the lights."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"lights_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:lightbulb-fluorescent-tube"
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_lights_{self._id}"
-
-    @property
-    def name(self):
-        """Return the name of the light"""
-        return self._name
-
-    @property
-    def available(self) -> bool:
-        """Return if available"""
-        return self._id in self.api.lights.keys()
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def extra_state_attributes(self):
-        return self.api.lights[self._id]["attributes"]
-
-    @property
-    def is_on(self) -> bool:
-        """Return true if light is on."""
-        return self.api.lights[self._id]["state"]
-
-    @property
-    def brightness(self) -> int | None:
-        """Return the brightness of this light between 0..255."""
-        real_value = int(round(self.api.lights[self._id]["value"] * 2.55))
-        return real_value
-
-    @property
-    def supported_color_modes(self) -> set[str] | None:
-        """Flag supported color modes."""
-        return {ColorMode.BRIGHTNESS}
-
-    @property
-    def color_mode(self) -> str | None:
-        """Return the color mode of the light."""
-        return ColorMode.BRIGHTNESS
+    _attr_supported_color_modes: ClassVar[set[ColorMode]] = {ColorMode.BRIGHTNESS}
+    _attr_color_mode = ColorMode.BRIGHTNESS
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def _update_attrs(self):
+        light = self.api.lights.get(self._id)
+        self._attr_available = light is not None
+        if light:
+            self._attr_is_on = light["state"]
+            self._attr_brightness = int(round(light["value"] * 2.55))
+            self._attr_extra_state_attributes = config_attributes(
+                light["attributes"], ("name", "value")
+            )
 
     async def async_turn_off(self, **kwargs):
         """Turn the light off."""
         await self.api.light_control(self._id, 0)
-        self.schedule_update_ha_state()
+        self._async_write_if_changed()
 
     async def async_turn_on(self, **kwargs):
         """Turn the light on."""
@@ -89,4 +60,4 @@ class ReefPiLight(CoordinatorEntity, LightEntity):
         _LOGGER.debug("Setting brightness: %s %s%%", brightness, percent_brightness)
 
         await self.api.light_control(self._id, percent_brightness)
-        self.schedule_update_ha_state()
+        self._async_write_if_changed()
@@ -0,0 +1,111 @@
+"""Coalescing of reef-pi light channel commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .const import _LOGGER, LIGHT_BATCH_DELAY
+
+if TYPE_CHECKING:
+    from .async_api import ReefApi
+
+
+class ReefPiLightBatcher:
+    """Collect channel values per light and send them in a single update.
+
+    reef-pi updates a light by posting the whole light object, so every channel
+    change is a read-modify-write of all channels. Dragging a brightness slider or
+    changing several channels at once would fire many of those concurrently, and the
+    last write could carry stale values of the other channels. Changes to the same
+    light within ``delay`` seconds are merged into one update instead, and updates
+    of one light never overlap.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: ReefApi,
+        delay: float = LIGHT_BATCH_DELAY,
+        base: Callable[[str], dict | None] | None = None,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            hass: Home Assistant instance
+            api: API client used to send the updates
+            delay: Seconds to wait for more changes after the first one
+            base: Returns a known copy of a light by ID to update from, or None to
+                read the light first
+        """
+        self.hass = hass
+        self.api = api
+        self.delay = delay
+        self._base = base
+        self._pending: dict[str, dict[str, int]] = {}
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def async_set(self, light_id: str, channel_id: str, value: int) -> bool:
+        """Queue a channel value and wait until the light was updated.
+
+        Args:
+            light_id: reef-pi light ID
+            channel_id: Channel key within the light
+            value: Channel value in percent
+
+        Returns:
+            True if reef-pi accepted the update carrying this value
+        """
+        self._pending.setdefault(light_id, {})[channel_id] = value
+        future = self.hass.loop.create_future()
+        self._waiters.setdefault(light_id, []).append(future)
+        if light_id not in self._timers:
+            self._timers[light_id] = async_call_later(
+                self.hass, self.delay, partial(self._async_flush, light_id)
+            )
+        return await future
+
+    async def _async_flush(self, light_id: str, _now: datetime | None = None) -> None:
+        self._timers.pop(light_id, None)
+        if light_id not in self._locks:
+            self._locks[light_id] = asyncio.Lock()
+
+        async with self._locks[light_id]:
+            values = self._pending.pop(light_id, {})
+            waiters = self._waiters.pop(light_id, [])
+            if not values:
+                return
+
+            _LOGGER.debug("Updating light %s channels %s", light_id, values)
+            try:
+                result = await self.api.light_update_channels(
+                    light_id, values, self._base(light_id) if self._base else None
+                )
+            except Exception as ex:  # noqa: BLE001 - handed to every waiting caller
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(ex)
+                return
+
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+
+    def cancel(self) -> None:
+        """Drop queued changes, e.g. when the config entry is unloaded."""
+        for unsub in self._timers.values():
+            unsub()
+        self._timers.clear()
+        self._pending.clear()
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                waiter.cancel()
+        self._waiters.clear()
@@ -6,7 +6,8 @@ from typing import TYPE_CHECKING
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt.models import ReceiveMessage
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
 
 from .const import _LOGGER
 
@@ -21,6 +22,7 @@ class ReefPiMQTTHandler:
         self.hass = hass
         self.coordinator = coordinator
         self.mqtt_prefix = coordinator.mqtt_prefix
+        self._unsubscribe: CALLBACK_TYPE | None = None
 
     async def async_subscribe(self) -> None:
         """Subscribe to reef-pi MQTT topics for real-time updates."""
@@ -28,12 +30,20 @@ class ReefPiMQTTHandler:
             await mqtt.async_wait_for_mqtt_client(self.hass)
             topic = f"{self.mqtt_prefix}/#"
             _LOGGER.info("Subscribing to MQTT topic: %s", topic)
-            await mqtt.async_subscribe(
+            self._unsubscribe = await mqtt.async_subscribe(
                 self.hass, topic, self._mqtt_message_received, qos=1
             )
         except Exception as ex:
             _LOGGER.exception("Failed to setup MQTT subscriptions: %s", ex)
 
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Unsubscribe from reef-pi MQTT topics."""
+        if self._unsubscribe:
+            _LOGGER.info("Unsubscribing from MQTT topic: %s/#", self.mqtt_prefix)
+            self._unsubscribe()
+            self._unsubscribe = None
+
     @callback
     def _mqtt_message_received(self, msg: ReceiveMessage) -> None:
         """Handle received MQTT message from reef-pi."""
@@ -72,16 +82,23 @@ class ReefPiMQTTHandler:
             value: Numeric value from MQTT message
         """
         updated = False
+        timestamp = dt_util.utcnow()
 
         if device_type == "temperature":
             if device_id in self.coordinator.tcs:
                 self.coordinator.tcs[device_id]["temperature"] = value
+                self.coordinator.tcs[device_id]["updated_at"] = timestamp
+                self.coordinator.record_sample(
+                    "temperature", device_id, value, timestamp
+                )
                 _LOGGER.debug("Updated temperature %s to %s", device_id, value)
                 updated = True
 
         elif device_type == "ph":
             if device_id in self.coordinator.ph:
                 self.coordinator.ph[device_id]["value"] = round(value, 4)
+                self.coordinator.ph[device_id]["updated_at"] = timestamp
+                self.coordinator.record_sample("ph", device_id, value, timestamp)
                 _LOGGER.debug("Updated pH %s to %s", device_id, value)
                 updated = True
 
@@ -89,6 +106,7 @@ class ReefPiMQTTHandler:
             if device_id in self.coordinator.equipment:
                 state = bool(int(value))
                 self.coordinator.equipment[device_id]["state"] = state
+                self.coordinator.equipment[device_id]["updated_at"] = timestamp
                 _LOGGER.debug("Updated equipment %s to %s", device_id, state)
                 updated = True
 
@@ -96,10 +114,13 @@ class ReefPiMQTTHandler:
             if device_id in self.coordinator.inlets:
                 state = bool(int(value))
                 self.coordinator.inlets[device_id]["state"] = state
+                self.coordinator.inlets[device_id]["updated_at"] = timestamp
                 _LOGGER.debug("Updated inlet %s to %s", device_id, state)
                 updated = True
 
         if updated:
             if self.coordinator.mqtt_tracker:
-                self.coordinator.mqtt_tracker.record_mqtt_update(device_type, device_id)
+                self.coordinator.mqtt_tracker.record_mqtt_update(
+                    device_type, device_id, timestamp
+                )
             self.coordinator.async_set_updated_data(self.coordinator.data)
@@ -262,6 +262,10 @@ class ReefPiMQTTNameMapper:
         """Check if any collisions were detected."""
         return len(self._collisions) > 0
 
+    def get_collisions(self) -> dict[str, list[tuple[str, str]]]:
+        """Get a copy of the current collisions (topic -> colliding devices)."""
+        return {topic: list(devices) for topic, devices in self._collisions.items()}
+
     def notify_collisions(self) -> None:
         """Create or dismiss persistent notification for MQTT topic collisions."""
         notification_id = f"reef_pi_mqtt_collisions_{self.entry.entry_id}"
@@ -0,0 +1,125 @@
+"""Latency and payload statistics for reef-pi integration."""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_key(method: str, api: str) -> str:
+    """Build a stats key for an API call, folding device ids into ``{id}``.
+
+    Examples:
+        ("GET", "tcs/1/current_reading") -> "GET tcs/{id}/current_reading"
+        ("POST", "equipment/17/control") -> "POST equipment/{id}/control"
+
+    Args:
+        method: HTTP method
+        api: API path below ``/api/``
+
+    Returns:
+        Key shared by all devices of the same endpoint
+    """
+    return f"{method} {_ID_SEGMENT.sub('/{id}', api)}"
+
+
+class ReefPiTimingStats:
+    """Track call count, latency percentiles, bytes and errors per key."""
+
+    def __init__(self, max_samples: int = 100):
+        """Initialize the statistics.
+
+        Args:
+            max_samples: Number of most recent durations kept per key for percentiles
+        """
+        self._max_samples = max_samples
+        self._samples: dict[str, deque[float]] = {}
+        self._count: dict[str, int] = {}
+        self._total: dict[str, float] = {}
+        self._max: dict[str, float] = {}
+        self._bytes: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    def record(
+        self, key: str, duration: float, size: int = 0, error: bool = False
+    ) -> None:
+        """Record one timed call.
+
+        Args:
+            key: Subsystem or endpoint name
+            duration: Duration in seconds
+            size: Bytes received
+            error: Whether the call failed
+        """
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self._max_samples)
+            self._count[key] = 0
+            self._total[key] = 0.0
+            self._max[key] = 0.0
+            self._bytes[key] = 0
+            self._errors[key] = 0
+
+        self._samples[key].append(duration)
+        self._count[key] += 1
+        self._total[key] += duration
+        self._max[key] = max(self._max[key], duration)
+        self._bytes[key] += size
+        if error:
+            self._errors[key] += 1
+
+    def keys(self) -> list[str]:
+        """Return all keys with recorded calls."""
+        return list(self._samples.keys())
+
+    def last(self, key: str) -> float | None:
+        """Return the most recent duration for a key in seconds."""
+        samples = self._samples.get(key)
+        return samples[-1] if samples else None
+
+    def recent(self, key: str) -> list[float]:
+        """Return the most recent durations for a key in seconds, oldest first."""
+        return list(self._samples.get(key, ()))
+
+    def get(self, key: str) -> dict | None:
+        """Get a summary for one key.
+
+        Returns:
+            Dictionary with count, total, p50, p95 and max in seconds, plus bytes and
+            errors, or None if nothing was recorded
+        """
+        samples = self._samples.get(key)
+        if not samples:
+            return None
+
+        ordered = sorted(samples)
+        return {
+            "count": self._count[key],
+            "total": self._total[key],
+            "last": samples[-1],
+            "p50": ordered[len(ordered) // 2],
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max": self._max[key],
+            "bytes": self._bytes[key],
+            "errors": self._errors[key],
+        }
+
+    def get_stats(self) -> dict[str, dict]:
+        """Get summaries for all keys."""
+        return {key: summary for key in self._samples if (summary := self.get(key))}
+
+    @property
+    def total_count(self) -> int:
+        """Return the number of calls recorded across all keys."""
+        return sum(self._count.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the bytes received across all keys."""
+        return sum(self._bytes.values())
+
+    @property
+    def total_errors(self) -> int:
+        """Return the number of failed calls across all keys."""
+        return sum(self._errors.values())
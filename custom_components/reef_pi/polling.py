@@ -0,0 +1,142 @@
+"""Adaptive polling intervals of reef-pi subsystems."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+# Coordinator data each refresh step updates
+STEP_ATTRIBUTES = {
+    "capabilities": ("capabilities",),
+    "info": ("info",),
+    "temperature": ("tcs",),
+    "equipment": ("equipment",),
+    "ph": ("ph",),
+    "pumps": ("pumps",),
+    "atos": ("ato", "ato_states"),
+    "inlets": ("inlets",),
+    "lights": ("lights",),
+    "display": ("display",),
+    "macros": ("macros",),
+    "timers": ("timers",),
+}
+
+# Values that change on every poll without the device changing
+_VOLATILE_KEYS = frozenset({"updated_at", "uptime", "current_time"})
+
+
+def fingerprint(*data: Any) -> int:
+    """Return a hash of polled data that only changes when a device changed.
+
+    Args:
+        data: Coordinator data of one refresh step
+
+    Returns:
+        Hash of the data without per-poll timestamps
+    """
+
+    def strip(value):
+        if isinstance(value, dict):
+            return tuple(
+                (key, strip(item))
+                for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))
+                if key not in _VOLATILE_KEYS
+            )
+        if isinstance(value, list | tuple):
+            return tuple(strip(item) for item in value)
+        return repr(value)
+
+    return hash(strip(data))
+
+
+class ReefPiAdaptivePolling:
+    """Poll every subsystem as often as its data actually changes.
+
+    Every refresh step has its own interval between ``min_interval`` and
+    ``max_interval``. The interval halves when a poll found changed data and grows
+    by half when it did not. It grows instead of shrinking while the controller is
+    under strain: when the step took longer than ``slow_step`` or the CPU is hotter
+    than ``hot_cpu``. The coordinator ticks at ``min_interval`` and only runs the
+    steps that are due.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        slow_step: float = 2.0,
+        hot_cpu: float = 70.0,
+    ):
+        """Initialize the intervals.
+
+        Args:
+            min_interval: Shortest interval of a step
+            max_interval: Longest interval of a step
+            slow_step: Step duration in seconds from which the controller counts as
+                slow
+            hot_cpu: CPU temperature in °C from which the controller counts as hot
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.slow_step = slow_step
+        self.hot_cpu = hot_cpu
+        self.intervals: dict[str, timedelta] = {}
+        self._next_due: dict[str, datetime] = {}
+        self._fingerprints: dict[str, int] = {}
+
+    def due(self, step: str, now: datetime) -> bool:
+        """Return whether a step has to run in this refresh."""
+        next_due = self._next_due.get(step)
+        # Ticks are not exact, half the minimum interval of slack avoids skipping a
+        # step that is due a moment after the tick.
+        return next_due is None or next_due - self.min_interval / 2 <= now
+
+    def record(
+        self,
+        step: str,
+        data_fingerprint: int,
+        duration: float,
+        now: datetime,
+        cpu_temperature: float | None = None,
+    ) -> timedelta:
+        """Adapt the interval of a step after it ran.
+
+        Args:
+            step: Refresh step
+            data_fingerprint: ``fingerprint`` of the data after the step
+            duration: Duration of the step in seconds
+            now: Time the step ran
+            cpu_temperature: Controller CPU temperature in °C, if known
+
+        Returns:
+            The new interval of the step
+        """
+        interval = self.intervals.get(step, self.min_interval)
+        previous = self._fingerprints.get(step)
+        self._fingerprints[step] = data_fingerprint
+
+        strained = duration > self.slow_step or (
+            cpu_temperature is not None and cpu_temperature > self.hot_cpu
+        )
+        if strained or previous == data_fingerprint:
+            interval = interval * 1.5
+        elif previous is not None:
+            interval = interval / 2
+        interval = min(self.max_interval, max(self.min_interval, interval))
+
+        self.intervals[step] = interval
+        self._next_due[step] = now + interval
+        return interval
+
+    def reset(self, step: str | None = None) -> None:
+        """Poll a step (or all steps) in the next refresh again."""
+        if step is None:
+            self._next_due.clear()
+            self.intervals.clear()
+        else:
+            self._next_due.pop(step, None)
+            self.intervals.pop(step, None)
+
+    def get_stats(self) -> dict[str, float]:
+        """Return the current interval of every step in seconds."""
+        return {step: iv.total_seconds() for step, iv in self.intervals.items()}
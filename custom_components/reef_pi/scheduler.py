@@ -0,0 +1,124 @@
+"""Prioritized scheduling of reef-pi API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, nullcontext
+
+from .perf_stats import ReefPiTimingStats
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# reef-pi runs on a Raspberry Pi with a small HTTP server
+DEFAULT_MAX_CONCURRENT = 2
+
+
+class ReefPiRequestScheduler:
+    """Limit concurrent requests to a controller and serve commands first.
+
+    At most ``max_concurrent`` requests run at a time. Waiting requests are served
+    by priority, then in order of arrival. Background requests (polling) never take
+    the last ``reserved_interactive`` slots, so a user command does not have to wait
+    for a poll to finish however many requests the poll has queued.
+
+    A scheduler can have a ``parent`` shared by several controllers, whose limit
+    then applies to the requests of all of them together.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        reserved_interactive: int = 1,
+        parent: ReefPiRequestScheduler | None = None,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrent: Maximum number of requests running at the same time
+            reserved_interactive: Slots only interactive requests may use
+            parent: Scheduler to also take a slot from for every request
+        """
+        self.max_concurrent = max_concurrent
+        self.reserved_interactive = reserved_interactive
+        self.parent = parent
+        # Time spent waiting for a slot, by priority name
+        self.stats = ReefPiTimingStats()
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def active(self) -> int:
+        """Return the number of running requests."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def _limit(self, priority: int) -> int:
+        if priority == PRIORITY_INTERACTIVE:
+            return self.max_concurrent
+        return max(1, self.max_concurrent - self.reserved_interactive)
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_BACKGROUND) -> AsyncIterator[None]:
+        """Wait for a free slot and hold it while the request runs.
+
+        Args:
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+        """
+        started = time.monotonic()
+        if (
+            not self._waiters or self._waiters[0][0] > priority
+        ) and self._active < self._limit(priority):
+            self._active += 1
+        else:
+            await self._wait(priority)
+
+        try:
+            async with self.parent.slot(priority) if self.parent else nullcontext():
+                self.stats.record(PRIORITY_NAMES[priority], time.monotonic() - started)
+                yield
+        finally:
+            self._active -= 1
+            self._wake()
+
+    async def _wait(self, priority: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._active -= 1
+                self._wake()
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _wake(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._active >= self._limit(priority):
+                return
+            heapq.heappop(self._waiters)
+            self._active += 1
+            future.set_result(None)
@@ -1,394 +1,469 @@
 """Platform for reef-pi sensor integration."""
 
-from datetime import datetime
-
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.const import DEGREE, EntityCategory, UnitOfTemperature
-from homeassistant.helpers.typing import StateType
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util, slugify
+from homeassistant.const import (
+    DEGREE,
+    MATCH_ALL,
+    EntityCategory,
+    Platform,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.util import slugify
 
-from .const import _LOGGER, DOMAIN
+from .const import _LOGGER, DOMAIN, EPOCH, REFRESH_STEPS, TREND_WINDOW
+from .entity import ReefPiEntity, async_add_device_entities, config_attributes
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add multiple entity from a config_entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    sensors = [
-        ReefPiTemperature(id, tcs["name"], coordinator)
-        for id, tcs in coordinator.tcs.items()
-    ]
-    ph_sensors = [
-        ReefPiPh(id, ph["name"], coordinator) for id, ph in coordinator.ph.items()
-    ]
-    pumps = [
-        ReefPiPump(id, pump["name"], coordinator)
-        for id, pump in coordinator.pumps.items()
-    ]
-    atos = [
-        ReefPiATO(id, ato["name"] + " Last Run", False, coordinator)
-        for id, ato in coordinator.ato.items()
-    ] + [
-        ReefPiATO(id, ato["name"] + " Duration", True, coordinator)
-        for id, ato in coordinator.ato.items()
-    ]
-
-    _LOGGER.debug("sensor temperature: %d, pH: %d", len(sensors), len(ph_sensors))
-    async_add_entities(sensors)
-    async_add_entities(ph_sensors)
-    async_add_entities([ReefPiBasicInfo(coordinator)])
-    async_add_entities(pumps)
-    async_add_entities(atos)
 
-    if coordinator.mqtt_enabled and coordinator.mqtt_tracker:
-        diagnostic_sensors = [
+    def temperature_entities(id, tcs):
+        return [ReefPiTemperature(id, tcs["name"], coordinator)] + [
+            ReefPiTrendSensor(coordinator, "temperature", id, tcs["name"], metric)
+            for metric in TREND_METRICS
+        ]
+
+    def ph_entities(id, ph):
+        return [ReefPiPh(id, ph["name"], coordinator)] + [
+            ReefPiTrendSensor(coordinator, "ph", id, ph["name"], metric)
+            for metric in TREND_METRICS
+        ]
+
+    def pump_entities(id, pump):
+        return [
+            ReefPiPump(id, pump["name"], coordinator),
+            ReefPiUsageTotalSensor(coordinator, "pumps", id, pump["name"]),
+        ]
+
+    def ato_entities(id, ato):
+        return [
+            ReefPiATO(id, ato["name"] + " Last Run", False, coordinator),
+            ReefPiATO(id, ato["name"] + " Duration", True, coordinator),
+            ReefPiUsageTotalSensor(coordinator, "ato_states", id, ato["name"]),
+        ]
+
+    _LOGGER.debug(
+        "sensor temperature: %d, pH: %d", len(coordinator.tcs), len(coordinator.ph)
+    )
+    for devices, create in (
+        (lambda: coordinator.tcs, temperature_entities),
+        (lambda: coordinator.ph, ph_entities),
+        (lambda: coordinator.pumps, pump_entities),
+        (lambda: coordinator.ato, ato_entities),
+    ):
+        async_add_device_entities(
+            coordinator,
+            config_entry,
+            async_add_entities,
+            Platform.SENSOR,
+            devices,
+            create,
+        )
+    async_add_entities([ReefPiBasicInfo(coordinator)])
+    async_add_entities(
+        [
+            ReefPiRefreshDurationSensor(coordinator, step)
+            for step in ("refresh", *REFRESH_STEPS)
+        ]
+        + [
+            ReefPiRefreshOverrunsSensor(coordinator),
+            ReefPiApiRequestsSensor(coordinator),
+            ReefPiApiBytesSensor(coordinator),
+        ]
+    )
+
+    # MQTT can be enabled and disabled without a reload, so its diagnostic sensors
+    # are added and retired like the entities of a device
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        Platform.SENSOR,
+        lambda: (
+            {"mqtt": None}
+            if coordinator.mqtt_enabled and coordinator.mqtt_tracker
+            else {}
+        ),
+        lambda id, _: [
             ReefPiMQTTStatusSensor(coordinator),
             ReefPiMQTTMessageCountSensor(coordinator),
             ReefPiMQTTLastUpdateSensor(coordinator, "temperature"),
             ReefPiMQTTLastUpdateSensor(coordinator, "equipment"),
             ReefPiMQTTLastUpdateSensor(coordinator, "ph"),
             ReefPiMQTTLastUpdateSensor(coordinator, "inlet"),
-        ]
-        async_add_entities(diagnostic_sensors)
+        ],
+    )
+
 
+# Derived metrics of temperature and pH readings over TREND_WINDOW
+TREND_METRICS = ("rate", "min", "max", "mean")
 
-class ReefPiBasicInfo(CoordinatorEntity, SensorEntity):
+
+class ReefPiBasicInfo(ReefPiEntity, SensorEntity):
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
 
     def __init__(self, coordinator):
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.api = coordinator
+        super().__init__(coordinator, "info")
 
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_has_entity_name = True
     _attr_icon = "mdi:fishbowl-outline"
     _attr_name = None
     _attr_should_poll: bool = True
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_info"
-
-    @property
-    def available(self):
-        """Return if teperature"""
-        return self.api.info and "name" in self.api.info
-
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        return self.api.info["cpu_temperature"]
-
-    @property
-    def extra_state_attributes(self):
-        if self.api.info:
-            return self.api.info
-        return {}
+    # Static or constantly changing, not worth a new attributes row per state
+    _unrecorded_attributes = frozenset({"capabilities", "current_time", "uptime"})
+
+    def _update_attrs(self):
+        info = self.api.info
+        self._attr_available = bool(info) and "name" in info
+        if self._attr_available:
+            self._attr_native_value = info["cpu_temperature"]
+        self._attr_extra_state_attributes = (
+            config_attributes(info, ("name", "cpu_temperature")) if info else {}
+        )
 
 
-class ReefPiTemperature(CoordinatorEntity, SensorEntity):
+class ReefPiTemperature(ReefPiEntity, SensorEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"tcs_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
+        self._deadband = coordinator.create_deadband("temperature")
 
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
-    _attr_has_entity_name = True
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def name(self):
-        """Return the name of the sensor"""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_tcs_{self._id}"
-
-    @property
-    def native_unit_of_measurement(self):
-        """Return the unit of measurement."""
-        if self.available and self.api.tcs[self._id]["fahrenheit"]:
-            return UnitOfTemperature.FAHRENHEIT
-        return UnitOfTemperature.CELSIUS
-
-    @property
-    def available(self):
-        """Return if available"""
-        return self._id in self.api.tcs.keys()
-
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        return self.api.tcs[self._id]["temperature"]
-
-    @property
-    def extra_state_attributes(self):
-        return self.api.tcs[self._id]["attributes"]
-
-
-class ReefPiPh(CoordinatorEntity, SensorEntity):
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def _update_attrs(self):
+        tcs = self.api.tcs.get(self._id)
+        self._attr_available = tcs is not None
+        if tcs:
+            self._attr_native_value = self._deadband.apply(tcs["temperature"])
+            self._attr_native_unit_of_measurement = (
+                UnitOfTemperature.FAHRENHEIT
+                if tcs["fahrenheit"]
+                else UnitOfTemperature.CELSIUS
+            )
+            self._attr_extra_state_attributes = config_attributes(
+                tcs["attributes"], ("name",)
+            )
+
+
+class ReefPiPh(ReefPiEntity, SensorEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"ph_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
+        self._deadband = coordinator.create_deadband("ph")
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:ph"
     _attr_native_unit_of_measurement = DEGREE
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({MATCH_ALL})
 
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def name(self):
-        """Return the name of the sensor"""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_ph_{self._id}"
-
-    @property
-    def available(self):
-        """Return if available"""
-        return self._id in self.api.ph.keys() and self.api.ph[self._id]["value"]
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        return self.api.ph[self._id]["value"]
-
-    @property
-    def extra_state_attributes(self):
-        return self.api.ph[self._id]["attributes"]
+    def _update_attrs(self):
+        ph = self.api.ph.get(self._id)
+        self._attr_available = ph is not None and bool(ph["value"])
+        if ph:
+            self._attr_native_value = self._deadband.apply(ph["value"])
+            # Chart settings only matter to the reef-pi UI
+            self._attr_extra_state_attributes = config_attributes(
+                ph["attributes"], ("name", "chart")
+            )
 
 
-class ReefPiPump(CoordinatorEntity, SensorEntity):
+class ReefPiPump(ReefPiEntity, SensorEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"pump_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
         self.entity_id = "sensor." + slugify(
             f"""{coordinator.info["name"]}_pump_{id}""".lower()
         )
 
     _attr_device_class = SensorDeviceClass.TIMESTAMP
-    _attr_has_entity_name = True
+    _attr_icon = "mdi:heat-pump-outline"
+    _unrecorded_attributes = frozenset({"schedules"})
+
+    def _update_attrs(self):
+        pump = self.api.pumps.get(self._id)
+        self._attr_available = pump is not None and pump["time"] != EPOCH
+        if pump:
+            self._attr_native_value = pump["time"]
+            attributes = pump["attributes"]
+            self._attr_extra_state_attributes = {
+                "duration": attributes.get("duration"),
+                "schedules": [
+                    schedule
+                    for key, schedule in attributes.items()
+                    if key != "duration"
+                ],
+            }
+
+
+class ReefPiATO(ReefPiEntity, SensorEntity):
+    def __init__(self, id, name, show_pump, coordinator):
+        """Initialize the sensor."""
+        super().__init__(
+            coordinator, f"ato_{id}_duration" if show_pump else f"ato_{id}_last_run"
+        )
+        self._id = id
+        self._attr_name = name
+        self._show_pump = show_pump
+        if not show_pump:
+            self._attr_device_class = SensorDeviceClass.TIMESTAMP
 
-    @property
-    def icon(self):
-        return "mdi:heat-pump-outline"
+    _attr_icon = "mdi:format-color-fill"
 
-    @property
-    def device_info(self):
-        return self.api.device_info
+    def _update_attrs(self):
+        state = self.api.ato_states.get(self._id)
+        self._attr_available = state is not None and state["ts"] != EPOCH
+        if state:
+            self._attr_native_value = state["pump"] if self._show_pump else state["ts"]
+            self._attr_extra_state_attributes = {
+                "pump": state["pump"],
+                "time": state.get("time"),
+            }
 
-    @property
-    def name(self):
-        """Return the name of the sensor"""
-        return self._name
 
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_pump_{self._id}"
+class ReefPiUsageTotalSensor(ReefPiEntity, SensorEntity):
+    """Sensor showing the total run time of a dosing pump or ATO.
 
-    @property
-    def available(self):
-        """Return if available"""
-        return self._id in self.api.pumps.keys() and self.api.pumps[self._id][
-            "time"
-        ] != datetime.fromtimestamp(0, tz=dt_util.UTC)
+    The total only grows, so daily or weekly amounts come from the statistics or a
+    utility meter instead of history queries.
+    """
 
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        return self.api.pumps[self._id]["time"]
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_icon = "mdi:timer-sand"
+
+    def __init__(self, coordinator, data, id, name):
+        """Initialize the sensor.
+
+        Args:
+            coordinator: Coordinator of the controller
+            data: Coordinator attribute holding the totals, "pumps" or "ato_states"
+            id: Pump or ATO ID
+            name: Pump or ATO name
+        """
+        super().__init__(
+            coordinator,
+            f"pump_{id}_total" if data == "pumps" else f"ato_{id}_total",
+        )
+        self._data = data
+        self._id = id
+        self._attr_name = f"{name} Total Run Time"
 
-    @property
-    def extra_state_attributes(self):
-        return self.api.pumps[self._id]["attributes"]
+    def _update_attrs(self):
+        state = getattr(self.api, self._data).get(self._id)
+        total = state.get("total") if state is not None else None
+        self._attr_available = total is not None
+        if total is not None:
+            self._attr_native_value = total
 
 
-class ReefPiATO(CoordinatorEntity, SensorEntity):
-    def __init__(self, id, name, show_pump, coordinator):
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self._id = id
-        self._name = name
-        self._show_pump = show_pump
-        self.api = coordinator
+class ReefPiTrendSensor(ReefPiEntity, SensorEntity):
+    """Sensor showing the rate of change, min, max or mean of recent readings."""
 
-    _attr_has_entity_name = True
-    _attr_icon = "mdi:format-color-fill"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
 
-    @property
-    def device_class(self):
-        if not self._show_pump:
-            return SensorDeviceClass.TIMESTAMP
-        return None
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def name(self):
-        """Return the name of the sensor"""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        if self._show_pump:
-            return f"{self.coordinator.unique_id}_ato_{self._id}_duration"
-        else:
-            return f"{self.coordinator.unique_id}_ato_{self._id}_last_run"
-
-    @property
-    def available(self):
-        """Return if available"""
-        return self._id in self.api.ato_states.keys() and self.api.ato_states[self._id][
-            "ts"
-        ] != datetime.fromtimestamp(0, tz=dt_util.UTC)
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if self._show_pump:
-            return self.api.ato_states[self._id]["pump"]
+    def __init__(self, coordinator, sensor_type, id, name, metric):
+        super().__init__(coordinator, f"{sensor_type}_{id}_{metric}")
+        self._sensor_type = sensor_type
+        self._id = id
+        self._metric = metric
+        self._attr_name = f"{name} {'Rate' if metric == 'rate' else metric.title()}"
+        self._attr_icon = (
+            "mdi:chart-line" if metric == "rate" else "mdi:chart-bell-curve"
+        )
+        # The rate is what alarms are built on, min/max/mean are opt-in
+        self._attr_entity_registry_enabled_default = metric == "rate"
+        if sensor_type == "temperature" and metric != "rate":
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+
+    def _update_attrs(self):
+        if self._sensor_type == "temperature":
+            tcs = self.api.tcs.get(self._id)
+            unit = (
+                UnitOfTemperature.FAHRENHEIT
+                if tcs and tcs["fahrenheit"]
+                else UnitOfTemperature.CELSIUS
+            )
         else:
-            return self.api.ato_states[self._id]["ts"]
+            unit = DEGREE
+        self._attr_native_unit_of_measurement = (
+            f"{unit}/h" if self._metric == "rate" else unit
+        )
 
-    @property
-    def extra_state_attributes(self):
-        return self.api.ato_states[self._id]
+        trend = self.api.trend(self._sensor_type, self._id)
+        self._attr_native_value = trend[self._metric] if trend else None
+        self._attr_extra_state_attributes = {
+            "samples": trend["count"] if trend else 0,
+            "window_minutes": int(TREND_WINDOW.total_seconds() / 60),
+        }
 
 
-class ReefPiMQTTStatusSensor(CoordinatorEntity, SensorEntity):
+class ReefPiMQTTStatusSensor(ReefPiEntity, SensorEntity):
     """Sensor showing MQTT connection status."""
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
-    _attr_has_entity_name = True
     _attr_icon = "mdi:connection"
 
-    def __init__(self, coordinator):
-        super().__init__(coordinator)
-        self.api = coordinator
-
-    @property
-    def name(self):
-        return "MQTT Status"
+    _attr_name = "MQTT Status"
 
-    @property
-    def unique_id(self):
-        return f"{self.coordinator.unique_id}_mqtt_status"
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "mqtt_status")
 
-    @property
-    def native_value(self):
-        """Return connection status."""
+    def _update_attrs(self):
         if not self.api.mqtt_enabled:
-            return "Disabled"
-        if not self.api.mqtt_handler:
-            return "Not configured"
-        if self.api.mqtt_tracker and self.api.mqtt_tracker.total_messages > 0:
-            return "Connected"
-        return "No messages"
-
-    @property
-    def extra_state_attributes(self):
-        return {
+            self._attr_native_value = "Disabled"
+        elif not self.api.mqtt_handler:
+            self._attr_native_value = "Not configured"
+        elif self.api.mqtt_tracker and self.api.mqtt_tracker.total_messages > 0:
+            self._attr_native_value = "Connected"
+        else:
+            self._attr_native_value = "No messages"
+        self._attr_extra_state_attributes = {
             "mqtt_prefix": self.api.mqtt_prefix,
             "mqtt_enabled": self.api.mqtt_enabled,
         }
 
-    @property
-    def device_info(self):
-        return self.api.device_info
-
 
-class ReefPiMQTTMessageCountSensor(CoordinatorEntity, SensorEntity):
+class ReefPiMQTTMessageCountSensor(ReefPiEntity, SensorEntity):
     """Sensor showing total MQTT messages received."""
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
-    _attr_has_entity_name = True
     _attr_icon = "mdi:counter"
 
-    def __init__(self, coordinator):
-        super().__init__(coordinator)
-        self.api = coordinator
-
-    @property
-    def name(self):
-        return "MQTT Messages Received"
+    _attr_name = "MQTT Messages Received"
 
-    @property
-    def unique_id(self):
-        return f"{self.coordinator.unique_id}_mqtt_message_count"
-
-    @property
-    def native_value(self):
-        return self.api.mqtt_tracker.total_messages if self.api.mqtt_tracker else 0
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "mqtt_message_count")
 
-    @property
-    def device_info(self):
-        return self.api.device_info
+    def _update_attrs(self):
+        tracker = self.api.mqtt_tracker
+        self._attr_native_value = tracker.total_messages if tracker else 0
 
 
-class ReefPiMQTTLastUpdateSensor(CoordinatorEntity, SensorEntity):
+class ReefPiMQTTLastUpdateSensor(ReefPiEntity, SensorEntity):
     """Sensor showing when last MQTT message was received for a device type."""
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_device_class = SensorDeviceClass.TIMESTAMP
-    _attr_has_entity_name = True
 
     def __init__(self, coordinator, device_type):
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"mqtt_last_{device_type}")
         self._device_type = device_type
-        self.api = coordinator
-
-    @property
-    def name(self):
-        return f"MQTT Last {self._device_type.title()} Update"
-
-    @property
-    def unique_id(self):
-        return f"{self.coordinator.unique_id}_mqtt_last_{self._device_type}"
-
-    @property
-    def native_value(self):
-        """Return timestamp of last MQTT message."""
-        if self.api.mqtt_tracker:
-            return self.api.mqtt_tracker.get_last_update_time(self._device_type)
-        return None
-
-    @property
-    def device_info(self):
-        return self.api.device_info
+        self._attr_name = f"MQTT Last {device_type.title()} Update"
+
+    def _update_attrs(self):
+        tracker = self.api.mqtt_tracker
+        self._attr_native_value = (
+            tracker.get_last_update_time(self._device_type) if tracker else None
+        )
+
+
+class ReefPiRefreshDurationSensor(ReefPiEntity, SensorEntity):
+    """Sensor showing how long the last refresh (or one refresh step) took."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(self, coordinator, step):
+        super().__init__(coordinator, f"refresh_{step}_duration")
+        self._step = step
+        if step == "refresh":
+            self._attr_name = "Refresh Duration"
+        else:
+            self._attr_name = f"Refresh {step.title()} Duration"
+        # Only the overall duration is enabled by default, the per-step sensors are
+        # there to narrow down a slow refresh.
+        self._attr_entity_registry_enabled_default = step == "refresh"
+
+    def _update_attrs(self):
+        stats = self.api.refresh_stats.get(self._step)
+        if not stats:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_native_value = round(stats["last"] * 1000, 1)
+        self._attr_extra_state_attributes = {
+            "count": stats["count"],
+            "total_ms": round(stats["total"] * 1000, 1),
+            "p50_ms": round(stats["p50"] * 1000, 1),
+            "p95_ms": round(stats["p95"] * 1000, 1),
+            "max_ms": round(stats["max"] * 1000, 1),
+            "errors": stats["errors"],
+        }
+
+
+class ReefPiRefreshOverrunsSensor(ReefPiEntity, SensorEntity):
+    """Sensor counting refreshes that took longer than the update interval."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:timer-alert-outline"
+    _attr_name = "Refresh Overruns"
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "refresh_overruns")
+
+    def _update_attrs(self):
+        self._attr_native_value = self.api.overruns
+        self._attr_extra_state_attributes = {
+            "update_interval": self.api.base_update_interval.total_seconds()
+        }
+
+
+class ReefPiApiRequestsSensor(ReefPiEntity, SensorEntity):
+    """Sensor showing the number of REST requests sent to reef-pi."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_icon = "mdi:api"
+    _attr_name = "API Requests"
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "api_requests")
+
+    def _update_attrs(self):
+        self._attr_native_value = self.api.api.stats.total_count
+        self._attr_extra_state_attributes = {"errors": self.api.api.stats.total_errors}
+
+
+class ReefPiApiBytesSensor(ReefPiEntity, SensorEntity):
+    """Sensor showing the amount of data received from reef-pi."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:download-network-outline"
+    _attr_name = "API Bytes Received"
+
+    def __init__(self, coordinator):
+        super().__init__(coordinator, "api_bytes")
+
+    def _update_attrs(self):
+        self._attr_native_value = self.api.api.stats.total_bytes
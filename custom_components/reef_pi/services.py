@@ -0,0 +1,214 @@
+"""Services of reef-pi integration."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+
+import voluptuous as vol
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+SERVICE_SET_EQUIPMENT = "set_equipment"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE = "restore"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_NAME = "name"
+ATTR_PERSIST = "persist"
+ATTR_STATE = "state"
+
+DEFAULT_SNAPSHOT_NAME = "default"
+
+SET_EQUIPMENT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Required(ATTR_STATE): cv.boolean,
+    }
+)
+
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+        vol.Optional(ATTR_PERSIST, default=False): cv.boolean,
+    }
+)
+
+RESTORE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_NAME, default=DEFAULT_SNAPSHOT_NAME): cv.string,
+    }
+)
+
+# Unique ID suffixes of the switches and the coordinator data they control
+_SWITCH_KINDS = (
+    (re.compile(r"switch_(.+)"), "equipment"),
+    (re.compile(r"timer_(.+)"), "timers"),
+    (re.compile(r"ato_(.+)_enable"), "atos"),
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the reef-pi services."""
+
+    async def async_set_equipment(call: ServiceCall) -> ServiceResponse:
+        state = call.data[ATTR_STATE]
+        targets = _resolve_switches(hass, call.data[ATTR_ENTITY_ID])
+
+        by_coordinator = {}
+        for entity_id, (coordinator, kind, id) in targets.items():
+            by_coordinator.setdefault(coordinator, []).append((entity_id, kind, id))
+
+        async def set_state(coordinator, items):
+            errors = await coordinator.async_set_state(
+                [(kind, id, state) for _, kind, id in items]
+            )
+            return {entity_id: errors[(kind, id)] for entity_id, kind, id in items}
+
+        results = {}
+        for errors in await asyncio.gather(
+            *(
+                set_state(coordinator, items)
+                for coordinator, items in by_coordinator.items()
+            )
+        ):
+            results.update(errors)
+
+        return {
+            "results": {
+                entity_id: {"success": error is None, "error": error}
+                for entity_id, error in results.items()
+            }
+        }
+
+    async def async_snapshot(call: ServiceCall) -> ServiceResponse:
+        coordinators = _resolve_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        states = await asyncio.gather(
+            *(
+                coordinator.async_save_state(
+                    call.data[ATTR_NAME], call.data[ATTR_PERSIST]
+                )
+                for coordinator in coordinators.values()
+            )
+        )
+        return dict(zip(coordinators, states))
+
+    async def async_restore(call: ServiceCall) -> ServiceResponse:
+        name = call.data[ATTR_NAME]
+        coordinators = _resolve_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        # Look the snapshot up everywhere before switching anything; controllers
+        # without it are left alone
+        states = await asyncio.gather(
+            *(
+                coordinator.async_load_state(name)
+                for coordinator in coordinators.values()
+            )
+        )
+        targets = {
+            entry_id: (coordinator, state)
+            for (entry_id, coordinator), state in zip(coordinators.items(), states)
+            if state is not None
+        }
+        if not targets:
+            raise ServiceValidationError(f"No reef-pi snapshot named {name}")
+
+        results = await asyncio.gather(
+            *(
+                coordinator.async_restore_state(name, state)
+                for coordinator, state in targets.values()
+            )
+        )
+        return {
+            entry_id: {
+                f"{kind}/{id}": {"success": error is None, "error": error}
+                for (kind, id), error in errors.items()
+            }
+            for entry_id, errors in zip(targets, results)
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_EQUIPMENT,
+        async_set_equipment,
+        schema=SET_EQUIPMENT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SNAPSHOT,
+        async_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        async_restore,
+        schema=RESTORE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _resolve_coordinators(hass: HomeAssistant, entry_id: str | None) -> dict:
+    """Return the coordinators of one or all loaded controllers by entry ID.
+
+    Raises:
+        ServiceValidationError: The config entry is not a loaded reef-pi controller
+    """
+    loaded = {
+        id: data["coordinator"]
+        for id, data in hass.data[DOMAIN].items()
+        if isinstance(data, dict) and "coordinator" in data
+    }
+    if entry_id is None:
+        return loaded
+    if entry_id not in loaded:
+        raise ServiceValidationError(f"{entry_id} is not a loaded reef-pi controller")
+    return {entry_id: loaded[entry_id]}
+
+
+def _resolve_switches(hass: HomeAssistant, entity_ids: list[str]) -> dict:
+    """Map switch entity IDs to their coordinator and reef-pi object.
+
+    Raises:
+        ServiceValidationError: An entity is not an equipment, timer or ATO switch
+            of a loaded reef-pi controller, or its device was deleted in reef-pi
+    """
+    registry = er.async_get(hass)
+    targets = {}
+    for entity_id in entity_ids:
+        entry = registry.async_get(entity_id)
+        target = None
+        if (
+            entry is not None
+            and entry.platform == DOMAIN
+            and entry.domain == "switch"
+            and (data := hass.data[DOMAIN].get(entry.config_entry_id))
+        ):
+            coordinator = data["coordinator"]
+            suffix = entry.unique_id.removeprefix(f"{coordinator.unique_id}_")
+            for pattern, kind in _SWITCH_KINDS:
+                match = pattern.fullmatch(suffix)
+                # Skips devices deleted in reef-pi whose entities still exist
+                if match and match.group(1) in coordinator.devices(kind):
+                    target = (coordinator, kind, match.group(1))
+                    break
+        if target is None:
+            raise ServiceValidationError(
+                f"{entity_id} is not a reef-pi equipment, timer or ATO switch of an "
+                "existing device"
+            )
+        targets[entity_id] = target
+    return targets
@@ -1,32 +1,40 @@
 """Platform for reef-pi switch integration."""
 
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.switch import SwitchDeviceClass
+from homeassistant.const import MATCH_ALL, Platform
 
 from .const import DOMAIN
+from .entity import ReefPiEntity, async_add_device_entities, config_attributes
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Add an outlets entity from a config_entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    equipment = [
-        ReefPiSwitch(id, outlet["name"], coordinator)
-        for id, outlet in coordinator.equipment.items()
-    ]
-    async_add_entities(equipment)
-
-    ato = [
-        ReefPiAtoSwitch(id, ato["name"] + " Enabled", coordinator)
-        for id, ato in coordinator.ato.items()
-    ]
-    async_add_entities(ato)
-
-    timers = [
-        ReefPiTimers(id, timer["name"], coordinator)
-        for id, timer in coordinator.timers.items()
-    ]
-    async_add_entities(timers)
+    for devices, create in (
+        (
+            lambda: coordinator.equipment,
+            lambda id, outlet: [ReefPiSwitch(id, outlet["name"], coordinator)],
+        ),
+        (
+            lambda: coordinator.ato,
+            lambda id, ato: [
+                ReefPiAtoSwitch(id, ato["name"] + " Enabled", coordinator)
+            ],
+        ),
+        (
+            lambda: coordinator.timers,
+            lambda id, timer: [ReefPiTimers(id, timer["name"], coordinator)],
+        ),
+    ):
+        async_add_device_entities(
+            coordinator,
+            config_entry,
+            async_add_entities,
+            Platform.SWITCH,
+            devices,
+            create,
+        )
 
     display = []
     if coordinator.has_display:
@@ -34,211 +42,126 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     async_add_entities(display)
 
 
-class ReefPiTimers(CoordinatorEntity, SwitchEntity):
+class ReefPiTimers(ReefPiEntity, SwitchEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the timers."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"timer_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
 
     _attr_device_class = SwitchDeviceClass.SWITCH
-    _attr_has_entity_name = True
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def name(self):
-        """Return the name of the timer"""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_timer_{self._id}"
-
-    @property
-    def available(self):
-        """Return if teperature"""
-        return self._id in self.api.timers.keys()
-
-    @property
-    def icon(self):
-        if self.available:
-            return "mdi:timer" if self.is_on else "mdi:timer-off"
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def _update_attrs(self):
+        timer = self.api.timers.get(self._id)
+        self._attr_available = timer is not None
+        if timer:
+            self._attr_is_on = timer["state"]
+            self._attr_icon = "mdi:timer" if self._attr_is_on else "mdi:timer-off"
+            self._attr_extra_state_attributes = config_attributes(
+                timer["attributes"], ("name", "enable")
+            )
         else:
-            return "mdi:exclamation"
-
-    @property
-    def is_on(self):
-        """Return the state of the timer."""
-        return self.api.timers[self._id]["state"]
+            self._attr_icon = "mdi:exclamation"
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
         await self.api.timer_control(self._id, True)
-        self.schedule_update_ha_state(True)
+        self._async_write_if_changed()
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the entity off."""
         await self.api.timer_control(self._id, False)
-        self.schedule_update_ha_state(True)
-
-    @property
-    def extra_state_attributes(self):
-        return self.api.timers[self._id]["attributes"]
+        self._async_write_if_changed()
 
 
-class ReefPiSwitch(CoordinatorEntity, SwitchEntity):
+class ReefPiSwitch(ReefPiEntity, SwitchEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"switch_{id}")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
 
     _attr_device_class = SwitchDeviceClass.OUTLET
-    _attr_has_entity_name = True
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def name(self):
-        """Return the name of the switch"""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_switch_{self._id}"
-
-    @property
-    def available(self):
-        """Return if teperature"""
-        return self._id in self.api.equipment.keys()
-
-    @property
-    def icon(self):
-        if self.available:
-            return "mdi:power-plug" if self.is_on else "mdi:power-plug-off"
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def _update_attrs(self):
+        outlet = self.api.equipment.get(self._id)
+        self._attr_available = outlet is not None
+        if outlet:
+            self._attr_is_on = outlet["state"]
+            self._attr_icon = (
+                "mdi:power-plug" if self._attr_is_on else "mdi:power-plug-off"
+            )
+            self._attr_extra_state_attributes = config_attributes(
+                outlet["attributes"], ("name", "on")
+            )
         else:
-            return "mdi:exclamation"
-
-    @property
-    def is_on(self):
-        """Return the state of the switch."""
-        return self.api.equipment[self._id]["state"]
+            self._attr_icon = "mdi:exclamation"
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
         await self.api.equipment_control(self._id, True)
-        self.schedule_update_ha_state(True)
+        self._async_write_if_changed()
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the entity off."""
         await self.api.equipment_control(self._id, False)
-        self.schedule_update_ha_state(True)
+        self._async_write_if_changed()
 
-    @property
-    def extra_state_attributes(self):
-        return self.api.equipment[self._id]["attributes"]
 
-
-class ReefPiAtoSwitch(CoordinatorEntity, SwitchEntity):
+class ReefPiAtoSwitch(ReefPiEntity, SwitchEntity):
     def __init__(self, id, name, coordinator):
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, f"ato_{id}_enable")
         self._id = id
-        self._name = name
-        self.api = coordinator
+        self._attr_name = name
 
     _attr_device_class = SwitchDeviceClass.SWITCH
-    _attr_has_entity_name = True
-
-    @property
-    def device_info(self):
-        return self.api.device_info
-
-    @property
-    def name(self):
-        """Return the name of the switch"""
-        return self._name
-
-    @property
-    def unique_id(self):
-        """Return a unique_id for this entity."""
-        return f"{self.coordinator.unique_id}_ato_{self._id}_enable"
-
-    @property
-    def available(self):
-        """Return if teperature"""
-        return self._id in self.api.ato.keys()
-
-    @property
-    def icon(self):
-        if self.available:
-            return "mdi:water-boiler" if self.is_on else "mdi:water-boiler-off"
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def _update_attrs(self):
+        ato = self.api.ato.get(self._id)
+        self._attr_available = ato is not None
+        if ato:
+            self._attr_is_on = ato["enable"]
+            self._attr_icon = (
+                "mdi:water-boiler" if self._attr_is_on else "mdi:water-boiler-off"
+            )
+            self._attr_extra_state_attributes = config_attributes(
+                ato, ("name", "enable")
+            )
         else:
-            return "mdi:water-boiler-alert"
-
-    @property
-    def is_on(self):
-        """Return the state of the switch."""
-        return self.api.ato[self._id]["enable"]
+            self._attr_icon = "mdi:water-boiler-alert"
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the entity on."""
         await self.api.ato_update(self._id, True)
-        self.schedule_update_ha_state()
+        self._async_write_if_changed()
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the entity off."""
         await self.api.ato_update(self._id, False)
-        self.schedule_update_ha_state()
+        self._async_write_if_changed()
 
-    @property
-    def extra_state_attributes(self):
-        return self.api.ato[self._id]
 
-
-class ReefPiDisplaySwitch(CoordinatorEntity, SwitchEntity):
+class ReefPiDisplaySwitch(ReefPiEntity, SwitchEntity):
     def __init__(self, coordinator):
-        super().__init__(coordinator)
-        self.api = coordinator
+        super().__init__(coordinator, "display")
 
     _attr_device_class = SwitchDeviceClass.SWITCH
-    _attr_has_entity_name = True
     _attr_name = "Display"
     _attr_icon = "mdi:television-classic"
 
-    @property
-    def unique_id(self):
-        return f"{self.coordinator.unique_id}_display"
-
-    @property
-    def is_on(self):
-        return self.api.display.get("on", False)
-
-    @property
-    def available(self):
-        return bool(self.api.display)
-
-    @property
-    def device_info(self):
-        return self.api.device_info
+    def _update_attrs(self):
+        self._attr_available = bool(self.api.display)
+        self._attr_is_on = self.api.display.get("on", False)
+        self._attr_extra_state_attributes = self.api.display
 
     async def async_turn_on(self, **kwargs) -> None:
         await self.api.display_switch(True)
-        self.schedule_update_ha_state()
+        self._async_write_if_changed()
 
     async def async_turn_off(self, **kwargs) -> None:
         await self.api.display_switch(False)
-        self.schedule_update_ha_state()
-
-    @property
-    def extra_state_attributes(self):
-        return self.api.display
+        self._async_write_if_changed()
@@ -0,0 +1,115 @@
+"""Short in-memory history of reef-pi sensor readings."""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from bisect import bisect_left
+
+
+class ReefPiTimeSeries:
+    """Fixed-size ring buffer of (timestamp, value) samples.
+
+    Samples are kept in two preallocated ``array`` buffers, so memory is bounded and
+    adding a sample never allocates. Derived metrics work on array slices with
+    builtins (``min``, ``max``, ``sum``, ``map``) that run in C instead of a Python
+    loop per sample.
+    """
+
+    def __init__(self, max_samples: int = 720):
+        """Initialize the buffer.
+
+        Args:
+            max_samples: Number of most recent samples kept
+        """
+        self._max_samples = max_samples
+        self._times = array("d", bytes(8 * max_samples))
+        self._values = array("d", bytes(8 * max_samples))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples kept."""
+        return self._size
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a sample, replacing the oldest one when the buffer is full.
+
+        Args:
+            timestamp: POSIX timestamp of the reading
+            value: Reading
+        """
+        if self._size and timestamp < self._times[self._next - 1]:
+            # Out of order (e.g. a poll that started before the last MQTT message)
+            return
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self._max_samples
+        self._size = min(self._size + 1, self._max_samples)
+
+    def samples(self, since: float | None = None) -> tuple[array, array]:
+        """Return timestamps and values in chronological order.
+
+        Args:
+            since: Only return samples taken at or after this POSIX timestamp
+
+        Returns:
+            Tuple of timestamp and value arrays
+        """
+        if self._size < self._max_samples:
+            times = self._times[: self._size]
+            values = self._values[: self._size]
+        else:
+            times = self._times[self._next :] + self._times[: self._next]
+            values = self._values[self._next :] + self._values[: self._next]
+
+        if since is not None:
+            start = bisect_left(times, since)
+            times = times[start:]
+            values = values[start:]
+        return times, values
+
+    def summary(
+        self, since: float | None = None
+    ) -> dict[str, float | int | None] | None:
+        """Compute derived metrics over a window.
+
+        Args:
+            since: Start of the window as POSIX timestamp, None for all samples
+
+        Returns:
+            Dictionary with count, min, max, mean and rate (change per hour, least
+            squares slope), or None if the window has no samples. The rate is None
+            with fewer than two samples.
+        """
+        times, values = self.samples(since)
+        count = len(values)
+        if not count:
+            return None
+
+        mean = sum(values) / count
+        return {
+            "count": count,
+            "min": min(values),
+            "max": max(values),
+            "mean": mean,
+            "rate": self._slope(times, values, mean) * 3600 if count > 1 else None,
+        }
+
+    @staticmethod
+    def _slope(times: array, values: array, mean: float) -> float:
+        # Relative to the first sample to keep the squares of POSIX timestamps
+        # from losing precision.
+        origin = times[0]
+        offsets = array("d", (t - origin for t in times))
+        mean_offset = sum(offsets) / len(offsets)
+        covariance = (
+            sum(map(operator.mul, offsets, values)) - len(offsets) * mean_offset * mean
+        )
+        variance = (
+            sum(map(operator.mul, offsets, offsets))
+            - len(offsets) * mean_offset * mean_offset
+        )
+        if variance <= 0:
+            return 0.0
+        return covariance / variance
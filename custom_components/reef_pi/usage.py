@@ -0,0 +1,89 @@
+"""Running totals of reef-pi dosing pump and ATO usage."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from .async_api import REEFPI_DATETIME_FORMAT
+from .const import _LOGGER
+
+
+class ReefPiUsageCounter:
+    """Accumulate run time from a reef-pi usage history.
+
+    reef-pi only returns the most recent usage entries, each one a bucket of run time
+    with a minute resolution timestamp. The counter remembers the newest bucket it
+    counted (the cursor) and how much of it, so every poll only adds what is new:
+    newer buckets in full and the growth of the cursor bucket if the pump ran again
+    within the same minute.
+    """
+
+    def __init__(
+        self,
+        total: float = 0.0,
+        cursor: datetime | None = None,
+        cursor_value: float = 0.0,
+    ):
+        """Initialize the counter.
+
+        Args:
+            total: Run time counted so far
+            cursor: Time of the newest counted usage entry
+            cursor_value: Run time of the newest counted usage entry
+        """
+        self.total = total
+        self.cursor = cursor
+        self.cursor_value = cursor_value
+
+    def update(self, readings: list[dict]) -> float:
+        """Count new usage entries.
+
+        Args:
+            readings: Usage entries as returned by reef-pi, each with ``pump`` (run
+                time) and ``time``
+
+        Returns:
+            Run time added by this update
+        """
+        entries = []
+        for reading in readings:
+            try:
+                entries.append(
+                    (
+                        datetime.strptime(reading["time"], REEFPI_DATETIME_FORMAT),
+                        float(reading["pump"]),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Skipping usage entry %s", reading)
+
+        added = 0.0
+        for time, value in sorted(entries, key=lambda entry: entry[0]):
+            if self.cursor is None or time > self.cursor:
+                added += value
+                self.cursor = time
+                self.cursor_value = value
+            elif time == self.cursor and value > self.cursor_value:
+                added += value - self.cursor_value
+                self.cursor_value = value
+
+        self.total += added
+        return added
+
+    def as_dict(self) -> dict:
+        """Return the counter state for storage."""
+        return {
+            "total": self.total,
+            "cursor": self.cursor.isoformat() if self.cursor else None,
+            "cursor_value": self.cursor_value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ReefPiUsageCounter:
+        """Restore a counter from ``as_dict`` output."""
+        cursor = data.get("cursor")
+        return cls(
+            data.get("total", 0.0),
+            datetime.fromisoformat(cursor) if cursor else None,
+            data.get("cursor_value", 0.0),
+        )
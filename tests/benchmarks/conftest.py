@@ -0,0 +1,18 @@
+"""Fixtures for the benchmark suite."""
+
+import pytest
+
+from .harness import BenchmarkRecorder
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request):
+    recorder = BenchmarkRecorder(
+        rounds=request.config.getoption("--benchmark-rounds"),
+        baseline_path=request.config.getoption("--benchmark-compare"),
+        max_regression=request.config.getoption("--benchmark-max-regression"),
+    )
+    yield recorder
+    save_path = request.config.getoption("--benchmark-save")
+    if save_path:
+        recorder.save(save_path)
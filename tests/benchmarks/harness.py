@@ -0,0 +1,178 @@
+"""Benchmark measurement, storage and regression checks."""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+
+from ..reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+)
+
+RESULTS_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing summary of one benchmark, in seconds per round."""
+
+    name: str
+    rounds: int
+    mean: float
+    p50: float
+    p95: float
+    min: float
+    max: float
+    requests_per_round: float | None = None
+    extra: dict[str, Any] | None = None
+
+    @classmethod
+    def from_samples(
+        cls,
+        name: str,
+        samples: list[float],
+        requests_per_round: float | None = None,
+        extra: dict[str, Any] | None = None,
+    ) -> BenchmarkResult:
+        ordered = sorted(samples)
+        return cls(
+            name=name,
+            rounds=len(ordered),
+            mean=statistics.fmean(ordered),
+            p50=ordered[len(ordered) // 2],
+            p95=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            min=ordered[0],
+            max=ordered[-1],
+            requests_per_round=requests_per_round,
+            extra=extra,
+        )
+
+
+class BenchmarkRecorder:
+    """Collect results for a session and compare them against a stored baseline.
+
+    Request counts are deterministic and must never grow. Timings are noisy, so they
+    only fail when the mean exceeds the baseline by more than ``max_regression``.
+    """
+
+    def __init__(
+        self,
+        rounds: int,
+        baseline_path: str | None,
+        max_regression: float,
+    ) -> None:
+        self.rounds = rounds
+        self.max_regression = max_regression
+        self.results: dict[str, BenchmarkResult] = {}
+        self.baseline: dict[str, dict[str, Any]] = {}
+        if baseline_path:
+            data = json.loads(Path(baseline_path).read_text())
+            self.baseline = data.get("results", {})
+
+    def record(self, result: BenchmarkResult) -> None:
+        """Store a result and fail the running benchmark if it regressed."""
+        self.results[result.name] = result
+
+        baseline = self.baseline.get(result.name)
+        if not baseline:
+            return
+
+        baseline_requests = baseline.get("requests_per_round")
+        if (
+            baseline_requests is not None
+            and result.requests_per_round is not None
+            and result.requests_per_round > baseline_requests
+        ):
+            pytest.fail(
+                f"{result.name}: {result.requests_per_round} requests per round, "
+                f"baseline {baseline_requests}"
+            )
+
+        limit = baseline["mean"] * (1 + self.max_regression)
+        if result.mean > limit:
+            pytest.fail(
+                f"{result.name}: mean {result.mean * 1000:.2f} ms exceeds baseline "
+                f"{baseline['mean'] * 1000:.2f} ms by more than "
+                f"{self.max_regression:.0%}"
+            )
+
+    def save(self, path: str) -> None:
+        """Write all results as JSON, comparable with a later --benchmark-compare."""
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "version": RESULTS_VERSION,
+                    "results": {
+                        name: asdict(result)
+                        for name, result in sorted(self.results.items())
+                    },
+                },
+                indent=2,
+            )
+        )
+
+
+async def measure(
+    recorder: BenchmarkRecorder,
+    name: str,
+    target: Callable[[], Awaitable[Any]],
+    simulator: ReefPiSimulator | None = None,
+    rounds: int | None = None,
+) -> BenchmarkResult:
+    """Run ``target`` for a number of rounds and record the timing.
+
+    Args:
+        recorder: Session recorder
+        name: Unique benchmark name used for storage and comparison
+        target: Coroutine function executed once per round
+        simulator: If given, API requests per round are recorded as well
+        rounds: Override the configured number of rounds
+
+    Returns:
+        The recorded result
+    """
+    rounds = rounds or recorder.rounds
+    if simulator:
+        simulator.reset_counts()
+
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await target()
+        samples.append(time.perf_counter() - started)
+
+    requests = simulator.total_requests / rounds if simulator else None
+    result = BenchmarkResult.from_samples(name, samples, requests)
+    recorder.record(result)
+    return result
+
+
+async def setup_simulated_entry(hass, mock, simulator: ReefPiSimulator, **options):
+    """Set up a config entry backed by the simulator and return its coordinator."""
+    url = simulator.install(mock)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": url,
+            "username": SIMULATOR_USER,
+            "password": SIMULATOR_PASSWORD,
+            "verify": False,
+        },
+        options=options,
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry, hass.data[DOMAIN][entry.entry_id]["coordinator"]
@@ -0,0 +1,162 @@
+"""Benchmarks for coordinator refresh, MQTT dispatch and entity setup.
+
+Run with ``pytest tests/benchmarks --benchmark --benchmark-save=results.json`` and
+compare a later run with ``--benchmark-compare=results.json``.
+"""
+
+from dataclasses import replace
+from itertools import cycle, islice
+from unittest.mock import MagicMock, patch
+
+import pytest
+import respx
+from homeassistant.components.mqtt.models import ReceiveMessage
+
+from custom_components.reef_pi import (
+    binary_sensor,
+    button,
+    light,
+    sensor,
+    switch,
+)
+from custom_components.reef_pi.mqtt_handler import ReefPiMQTTHandler
+from custom_components.reef_pi.mqtt_name_mapper import ReefPiMQTTNameMapper
+
+from ..reef_pi_simulator import ReefPiSimulator, SimulatorConfig
+from .harness import measure, setup_simulated_entry
+
+pytestmark = pytest.mark.benchmark
+
+SCALES = {
+    "small": SimulatorConfig(seed=1),
+    "medium": SimulatorConfig(
+        temperature_sensors=4,
+        probes=2,
+        equipment=24,
+        pumps=4,
+        atos=2,
+        inlets=4,
+        lights=4,
+        timers=4,
+        macros=4,
+        seed=1,
+    ),
+    "large": SimulatorConfig(
+        temperature_sensors=8,
+        probes=4,
+        equipment=64,
+        pumps=8,
+        atos=4,
+        inlets=8,
+        lights=8,
+        light_channels=4,
+        timers=16,
+        macros=16,
+        seed=1,
+    ),
+}
+
+MQTT_BATCH = 1000
+
+
+@pytest.mark.parametrize("scale", list(SCALES))
+async def test_refresh(hass, benchmark_recorder, scale):
+    simulator = ReefPiSimulator(SCALES[scale])
+    with respx.mock(assert_all_called=False) as mock:
+        _, coordinator = await setup_simulated_entry(hass, mock, simulator)
+        await measure(
+            benchmark_recorder,
+            f"refresh[{scale}]",
+            coordinator._async_update_data,
+            simulator=simulator,
+        )
+
+
+@pytest.mark.parametrize("scale", list(SCALES))
+async def test_refresh_with_latency(hass, benchmark_recorder, scale):
+    """Refresh against a Pi answering every request in 5 ms."""
+    simulator = ReefPiSimulator(replace(SCALES[scale], default_latency=0.005))
+    with respx.mock(assert_all_called=False) as mock:
+        _, coordinator = await setup_simulated_entry(hass, mock, simulator)
+        await measure(
+            benchmark_recorder,
+            f"refresh_latency[{scale}]",
+            coordinator._async_update_data,
+            simulator=simulator,
+            rounds=5,
+        )
+
+
+async def test_mqtt_dispatch(hass, benchmark_recorder):
+    simulator = ReefPiSimulator(SCALES["large"])
+    with respx.mock(assert_all_called=False) as mock:
+        _, coordinator = await setup_simulated_entry(hass, mock, simulator)
+        handler = ReefPiMQTTHandler(hass, coordinator)
+        messages = [
+            ReceiveMessage(
+                topic=topic,
+                payload=payload,
+                qos=0,
+                retain=False,
+                subscribed_topic=f"{coordinator.mqtt_prefix}/#",
+                timestamp=0.0,
+            )
+            for topic, payload in islice(cycle(simulator.mqtt_messages()), MQTT_BATCH)
+        ]
+
+        async def dispatch():
+            for msg in messages:
+                handler._mqtt_message_received(msg)
+            await hass.async_block_till_done()
+
+        result = await measure(benchmark_recorder, "mqtt_dispatch", dispatch)
+        result.extra = {"messages_per_second": MQTT_BATCH / result.mean}
+
+
+@pytest.mark.parametrize("devices", [10, 100, 1000])
+async def test_name_mapper_refresh(hass, benchmark_recorder, devices):
+    entry = MagicMock()
+    entry.entry_id = "benchmark"
+    mapper = ReefPiMQTTNameMapper(hass, entry, "reef-pi")
+
+    async def refresh():
+        mapper.begin_refresh()
+        for i in range(devices):
+            mapper.add_temperature(f"Temp {i}", str(i))
+            mapper.add_ph(f"Probe {i}", str(i))
+            mapper.add_equipment(f"Outlet {i}", str(i))
+            mapper.add_ato_state(f"ATO {i}", str(i))
+        mapper.commit_refresh()
+        mapper.notify_collisions()
+
+    await measure(benchmark_recorder, f"name_mapper_refresh[{devices}]", refresh)
+
+
+@pytest.mark.parametrize("scale", list(SCALES))
+async def test_platform_setup(hass, benchmark_recorder, scale):
+    simulator = ReefPiSimulator(SCALES[scale])
+    with respx.mock(assert_all_called=False) as mock:
+        entry, _ = await setup_simulated_entry(hass, mock, simulator)
+        entities = []
+        # Coordinator listeners of the dynamic entity tracking, released after
+        # every round so rounds don't add up
+        unsubscribes = []
+
+        def add_entities(new_entities, update_before_add=False):
+            entities.extend(new_entities)
+
+        async def setup_platforms():
+            for unsubscribe in unsubscribes:
+                unsubscribe()
+            unsubscribes.clear()
+            entities.clear()
+            for platform in (sensor, switch, light, binary_sensor, button):
+                await platform.async_setup_entry(hass, entry, add_entities)
+
+        with patch.object(entry, "async_on_unload", side_effect=unsubscribes.append):
+            result = await measure(
+                benchmark_recorder, f"platform_setup[{scale}]", setup_platforms
+            )
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+        result.extra = {"entities": len(entities)}
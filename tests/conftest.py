@@ -3,6 +3,40 @@
 import pytest
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("reef_pi benchmarks")
+    group.addoption("--benchmark", action="store_true", help="Run the benchmark suite")
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=20,
+        help="Rounds per benchmark (default: 20)",
+    )
+    group.addoption(
+        "--benchmark-save", metavar="PATH", help="Write benchmark results to PATH"
+    )
+    group.addoption(
+        "--benchmark-compare",
+        metavar="PATH",
+        help="Fail benchmarks that regressed against the results stored in PATH",
+    )
+    group.addoption(
+        "--benchmark-max-regression",
+        type=float,
+        default=0.25,
+        help="Allowed relative increase of mean time before failing (default: 0.25)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     yield
@@ -0,0 +1,588 @@
+"""Local reef-pi stand-in for load and latency benchmarking.
+
+Serves the subset of the reef-pi REST API used by ``ReefApi`` for a configurable number
+of devices, with per-endpoint latency and failure injection, and can publish the same
+MQTT telemetry reef-pi does to a local broker.
+
+The simulator can drive ``ReefApi`` in-process through respx (no sockets, used by the
+tests and benchmarks)::
+
+    with respx.mock(assert_all_called=False) as mock:
+        simulator = ReefPiSimulator(SimulatorConfig(probes=8, equipment=32))
+        simulator.install(mock)
+
+or run as a real HTTP server that a Home Assistant instance can be pointed at::
+
+    python -m tests.reef_pi_simulator --probes 8 --equipment 32 --latency "ph*=0.4"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import random
+import re
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import httpx
+
+from custom_components.reef_pi.mqtt_name_mapper import ReefPiMQTTNameMapper
+
+REEFPI_DATETIME_FORMAT = "%b-%d-%H:%M, %Y"
+SIMULATOR_USER = "reef-pi"
+SIMULATOR_PASSWORD = "reef-pi"
+
+
+@dataclass
+class SimulatorConfig:
+    """Shape and behaviour of the simulated controller.
+
+    ``latency`` and ``failure_rate`` map fnmatch patterns over the API path (without the
+    ``/api/`` prefix, e.g. ``"phprobes/*/readings"``) to seconds and a 0..1 probability.
+    The first matching pattern wins; unmatched endpoints use the defaults.
+    """
+
+    temperature_sensors: int = 1
+    probes: int = 1
+    equipment: int = 6
+    pumps: int = 2
+    atos: int = 1
+    inlets: int = 1
+    lights: int = 1
+    light_channels: int = 2
+    timers: int = 0
+    macros: int = 0
+    display: bool = False
+    history_size: int = 24
+    default_latency: float = 0.0
+    latency: dict[str, float] = field(default_factory=dict)
+    failure_rate: dict[str, float] = field(default_factory=dict)
+    failure_status: int = 500
+    mqtt_prefix: str = "reef-pi"
+    seed: int | None = None
+
+
+class ReefPiSimulator:
+    """In-memory reef-pi controller answering REST requests."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        self.config = config or SimulatorConfig()
+        self.random = random.Random(self.config.seed)
+        self.request_counts: Counter[str] = Counter()
+        self._runner = None
+        self._routes: list[tuple[str, re.Pattern[str], Callable[..., Any]]] = []
+        self._build_state()
+        self._build_routes()
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of API requests served so far."""
+        return sum(self.request_counts.values())
+
+    def reset_counts(self) -> None:
+        """Forget request counts, e.g. between benchmark rounds."""
+        self.request_counts.clear()
+
+    def _history(self, key: str, value: Callable[[int], Any]) -> list[dict[str, Any]]:
+        now = datetime.now(UTC)
+        size = self.config.history_size
+        return [
+            {
+                key: value(i),
+                "time": (now - timedelta(hours=size - i)).strftime(
+                    REEFPI_DATETIME_FORMAT
+                ),
+            }
+            for i in range(size)
+        ]
+
+    def _ph_value(self, _index: int) -> float:
+        return round(8.1 + self.random.uniform(-0.05, 0.05), 4)
+
+    def _build_state(self) -> None:
+        config = self.config
+        self.tcs = {
+            str(i): {
+                "id": str(i),
+                "name": f"Temp {i}",
+                "fahrenheit": False,
+                "period": 60,
+                "enable": True,
+            }
+            for i in range(1, config.temperature_sensors + 1)
+        }
+        self.temperatures = {
+            sensor_id: 25.0 + self.random.uniform(-0.5, 0.5) for sensor_id in self.tcs
+        }
+        self.probes = {
+            str(i): {
+                "id": str(i),
+                "name": f"pH {i}",
+                "enable": True,
+                "period": 15,
+                "notify": {"enable": False, "min": 7.5, "max": 8.6},
+                "chart": {"ymin": 0, "ymax": 0, "color": "", "unit": ""},
+            }
+            for i in range(1, config.probes + 1)
+        }
+        self.equipment = {
+            str(i): {
+                "id": str(i),
+                "name": f"Outlet {i}",
+                "outlet": str(i),
+                "on": i % 2 == 0,
+                "stay_off_on_boot": False,
+            }
+            for i in range(1, config.equipment + 1)
+        }
+        self.pumps = {
+            str(i): {
+                "id": str(i),
+                "name": f"Doser {i}",
+                "jack": str(i),
+                "pin": 0,
+                "regiment": {"enable": True, "duration": 15, "speed": 20},
+            }
+            for i in range(1, config.pumps + 1)
+        }
+        self.inlets = {
+            str(i): {"id": str(i), "name": f"Float {i}", "pin": 16 + i}
+            for i in range(1, max(config.inlets, config.atos) + 1)
+        }
+        self.atos = {
+            str(i): {
+                "id": str(i),
+                "name": f"ATO {i}",
+                "inlet": str(i),
+                "pump": "1",
+                "period": 120,
+                "enable": True,
+                "notify": {"enable": False, "max": 0},
+            }
+            for i in range(1, config.atos + 1)
+        }
+        self.lights = {
+            str(i): {
+                "id": str(i),
+                "name": f"Light {i}",
+                "channels": {
+                    str(c): {"name": f"Channel {c}", "manual": True, "value": 50}
+                    for c in range(1, config.light_channels + 1)
+                },
+            }
+            for i in range(1, config.lights + 1)
+        }
+        self.timers = {
+            str(i): {"id": str(i), "name": f"Timer {i}", "enable": True}
+            for i in range(1, config.timers + 1)
+        }
+        self.macros = {
+            str(i): {"id": str(i), "name": f"Macro {i}"}
+            for i in range(1, config.macros + 1)
+        }
+        self.display = {"on": True, "brightness": 50}
+        self.ph_history = {
+            probe_id: self._history("value", self._ph_value) for probe_id in self.probes
+        }
+        self.pump_usage = {
+            pump_id: self._history("pump", lambda _i: 15) for pump_id in self.pumps
+        }
+        self.ato_usage = {
+            ato_id: self._history("pump", lambda i: 120 if i % 3 == 0 else 0)
+            for ato_id in self.atos
+        }
+
+    def _build_routes(self) -> None:
+        routes = [
+            ("GET", r"capabilities", self._capabilities),
+            ("GET", r"info", self._info),
+            ("GET", r"telemetry", self._telemetry),
+            ("GET", r"tcs", lambda: list(self.tcs.values())),
+            ("GET", r"tcs/(\w+)/current_reading", self._temperature),
+            ("GET", r"equipment", lambda: list(self.equipment.values())),
+            ("GET", r"equipment/(\w+)", lambda id: self.equipment[id]),
+            ("POST", r"equipment/(\w+)/control", self._equipment_control),
+            ("GET", r"phprobes", lambda: list(self.probes.values())),
+            ("GET", r"phprobes/(\w+)/readings", self._ph_readings),
+            ("GET", r"phprobes/(\w+)/read", lambda id: self.ph_history[id][-1]),
+            ("GET", r"doser/pumps", lambda: list(self.pumps.values())),
+            ("GET", r"doser/pumps/(\w+)/usage", self._pump_usage),
+            ("GET", r"atos", lambda: list(self.atos.values())),
+            ("GET", r"atos/(\w+)", lambda id: self.atos[id]),
+            ("POST", r"atos/(\w+)", self._replace(self.atos)),
+            ("GET", r"atos/(\w+)/usage", self._ato_usage),
+            ("GET", r"inlets", lambda: list(self.inlets.values())),
+            ("POST", r"inlets/(\w+)/read", lambda id, _body: self.random.randint(0, 1)),
+            ("GET", r"lights", lambda: list(self.lights.values())),
+            ("GET", r"lights/(\w+)", lambda id: self.lights[id]),
+            ("POST", r"lights/(\w+)", self._replace(self.lights)),
+            ("GET", r"timers", lambda: list(self.timers.values())),
+            ("GET", r"timers/(\w+)", lambda id: self.timers[id]),
+            ("POST", r"timers/(\w+)", self._replace(self.timers)),
+            ("GET", r"macros", lambda: list(self.macros.values())),
+            ("POST", r"macros/(\w+)/run", lambda id, _body: {}),
+            ("GET", r"display", lambda: self.display),
+            ("POST", r"display", self._display_brightness),
+            ("POST", r"display/(on|off)", self._display_switch),
+            ("POST", r"admin/(reboot|poweroff)", lambda action, _body: {}),
+        ]
+        self._routes = [
+            (method, re.compile(f"^{pattern}$"), handler)
+            for method, pattern, handler in routes
+        ]
+
+    def _capabilities(self) -> dict[str, bool]:
+        config = self.config
+        return {
+            "equipment": config.equipment > 0,
+            "timers": config.timers > 0,
+            "lighting": config.lights > 0,
+            "temperature": config.temperature_sensors > 0,
+            "ato": config.atos > 0,
+            "camera": False,
+            "doser": config.pumps > 0,
+            "ph": config.probes > 0,
+            "macro": config.macros > 0,
+            "display": config.display,
+        }
+
+    def _info(self) -> dict[str, str]:
+        return {
+            "name": "Simulated Reef PI",
+            "ip": "127.0.0.1",
+            "current_time": datetime.now().strftime("%a %b %d %H:%M:%S"),
+            "uptime": "1 hour ago",
+            "cpu_temperature": f"{45 + self.random.uniform(-2, 2):.1f}'C\n",
+            "version": "6.0",
+            "model": "Raspberry Pi 3 Model B Rev 1.2\x00",
+        }
+
+    def _telemetry(self) -> dict[str, Any]:
+        return {"mqtt": {"enable": True, "prefix": self.config.mqtt_prefix}}
+
+    def _temperature(self, id: str) -> dict[str, str]:
+        return {"temperature": f"{self.temperatures[id]:.2f}"}
+
+    def _ph_readings(self, id: str) -> dict[str, Any]:
+        return {"current": self.ph_history[id], "historical": []}
+
+    def _pump_usage(self, id: str) -> dict[str, Any]:
+        return {"current": self.pump_usage[id], "historical": []}
+
+    def _ato_usage(self, id: str) -> dict[str, Any]:
+        return {"current": self.ato_usage[id], "historical": []}
+
+    def _equipment_control(self, id: str, body: dict[str, Any]) -> dict:
+        self.equipment[id]["on"] = bool(body.get("on"))
+        return {}
+
+    def _display_switch(self, action: str, _body: Any) -> dict:
+        self.display["on"] = action == "on"
+        return {}
+
+    def _display_brightness(self, body: dict[str, Any]) -> dict:
+        self.display["brightness"] = body.get("brightness", 0)
+        return {}
+
+    @staticmethod
+    def _replace(store: dict[str, Any]) -> Callable[[str, Any], dict]:
+        def handler(id: str, body: Any) -> dict:
+            store[id] = body
+            return {}
+
+        return handler
+
+    def tick(self) -> None:
+        """Advance readings by one step of a small random walk."""
+        for sensor_id in self.temperatures:
+            self.temperatures[sensor_id] += self.random.uniform(-0.05, 0.05)
+        for history in self.ph_history.values():
+            history.append(
+                {
+                    "value": round(
+                        history[-1]["value"] + self.random.uniform(-0.01, 0.01), 4
+                    ),
+                    "time": datetime.now(UTC).strftime(REEFPI_DATETIME_FORMAT),
+                }
+            )
+            del history[: -self.config.history_size]
+
+    def _lookup(self, patterns: dict[str, float], path: str, default: float) -> float:
+        for pattern, value in patterns.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return value
+        return default
+
+    async def handle(self, method: str, path: str, body: Any = None) -> tuple[int, Any]:
+        """Answer a single request.
+
+        Args:
+            method: HTTP method
+            path: Request path, e.g. ``/api/equipment``
+            body: Decoded JSON request body, if any
+
+        Returns:
+            Tuple of HTTP status and JSON-serializable response body
+        """
+        if path == "/auth/signin":
+            return 200, {}
+
+        api = path.removeprefix("/api/").strip("/")
+        self.request_counts[f"{method} {api}"] += 1
+
+        latency = self._lookup(self.config.latency, api, self.config.default_latency)
+        if latency:
+            await asyncio.sleep(latency)
+
+        failure_rate = self._lookup(self.config.failure_rate, api, 0.0)
+        if failure_rate and self.random.random() < failure_rate:
+            return self.config.failure_status, {}
+
+        for route_method, pattern, handler in self._routes:
+            if route_method != method:
+                continue
+            match = pattern.match(api)
+            if not match:
+                continue
+            args = list(match.groups())
+            if method == "POST":
+                args.append(body)
+            try:
+                return 200, handler(*args)
+            except KeyError:
+                return 404, {}
+        return 404, {}
+
+    async def _respx_side_effect(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        status, payload = await self.handle(request.method, request.url.path, body)
+        headers = (
+            {"set-cookie": "auth=token"} if request.url.path == "/auth/signin" else None
+        )
+        return httpx.Response(status, json=payload, headers=headers)
+
+    def install(self, mock, url: str = "http://reef-pi.simulator") -> str:
+        """Route every request to ``url`` through the simulator.
+
+        Args:
+            mock: Active respx mock router
+            url: Base URL the simulated controller answers on
+
+        Returns:
+            The base URL to configure in the config entry
+        """
+        mock.route(url__startswith=url).mock(side_effect=self._respx_side_effect)
+        return url
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the simulator over HTTP.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind, 0 for a free one
+
+        Returns:
+            The base URL the server listens on
+        """
+        from aiohttp import web
+
+        async def dispatch(request: web.Request) -> web.Response:
+            raw = await request.read()
+            body = json.loads(raw) if raw else None
+            status, payload = await self.handle(request.method, request.path, body)
+            response = web.json_response(payload, status=status)
+            if request.path == "/auth/signin":
+                response.set_cookie("auth", "token")
+            return response
+
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", dispatch)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}"
+
+    async def stop(self) -> None:
+        """Stop the HTTP server started by start()."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def mqtt_messages(self) -> list[tuple[str, str]]:
+        """Return the telemetry reef-pi would currently publish over MQTT.
+
+        Topics follow the same naming rules as ``ReefPiMQTTNameMapper`` and payloads use
+        reef-pi's ``%f`` formatting.
+        """
+        prefix = self.config.mqtt_prefix
+        normalize = ReefPiMQTTNameMapper.normalize_name
+        messages = [
+            (f"{prefix}/{normalize(s['name'])}_reading", f"{self.temperatures[id]:f}")
+            for id, s in self.tcs.items()
+        ]
+        messages += [
+            (
+                f"{prefix}/ph_{normalize(p['name'])}",
+                f"{self.ph_history[id][-1]['value']:f}",
+            )
+            for id, p in self.probes.items()
+        ]
+        messages += [
+            (f"{prefix}/equipment_{normalize(e['name'])}_state", f"{float(e['on']):f}")
+            for e in self.equipment.values()
+        ]
+        messages += [
+            (
+                f"{prefix}/ato_{normalize(a['name'])}_state",
+                f"{self.random.randint(0, 1):f}",
+            )
+            for a in self.atos.values()
+        ]
+        return messages
+
+
+class SimulatorMQTTPublisher:
+    """Publish the simulator's telemetry to a local MQTT broker at a fixed rate."""
+
+    def __init__(
+        self,
+        simulator: ReefPiSimulator,
+        host: str = "127.0.0.1",
+        port: int = 1883,
+        interval: float = 1.0,
+    ) -> None:
+        try:
+            import paho.mqtt.client as mqtt_client
+            from paho.mqtt.enums import CallbackAPIVersion
+        except ImportError as exc:
+            raise RuntimeError("paho-mqtt is required for MQTT publishing") from exc
+
+        self.simulator = simulator
+        self.interval = interval
+        self.published = 0
+        self._client = mqtt_client.Client(CallbackAPIVersion.VERSION2)
+        self._client.connect(host, port)
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        self._client.loop_start()
+        try:
+            while True:
+                self.simulator.tick()
+                for topic, payload in self.simulator.mqtt_messages():
+                    self._client.publish(topic, payload)
+                    self.published += 1
+                await asyncio.sleep(self.interval)
+        finally:
+            self._client.loop_stop()
+
+    def start(self) -> None:
+        """Start publishing in the background."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop publishing and disconnect from the broker."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._client.disconnect()
+
+
+def _parse_pairs(values: list[str]) -> dict[str, float]:
+    pairs = {}
+    for value in values:
+        pattern, _, number = value.rpartition("=")
+        pairs[pattern] = float(number)
+    return pairs
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    simulator = ReefPiSimulator(
+        SimulatorConfig(
+            temperature_sensors=args.temperature_sensors,
+            probes=args.probes,
+            equipment=args.equipment,
+            pumps=args.pumps,
+            atos=args.atos,
+            inlets=args.inlets,
+            lights=args.lights,
+            light_channels=args.light_channels,
+            timers=args.timers,
+            macros=args.macros,
+            display=args.display,
+            history_size=args.history_size,
+            default_latency=args.default_latency,
+            latency=_parse_pairs(args.latency),
+            failure_rate=_parse_pairs(args.failure_rate),
+            mqtt_prefix=args.mqtt_prefix,
+            seed=args.seed,
+        )
+    )
+    url = await simulator.start(args.host, args.port)
+    print(f"reef-pi simulator listening on {url}")
+    publisher = None
+    if args.mqtt_host:
+        publisher = SimulatorMQTTPublisher(
+            simulator, args.mqtt_host, args.mqtt_port, args.mqtt_interval
+        )
+        publisher.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if publisher:
+            await publisher.stop()
+        await simulator.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--temperature-sensors", type=int, default=1)
+    parser.add_argument("--probes", type=int, default=1)
+    parser.add_argument("--equipment", type=int, default=6)
+    parser.add_argument("--pumps", type=int, default=2)
+    parser.add_argument("--atos", type=int, default=1)
+    parser.add_argument("--inlets", type=int, default=1)
+    parser.add_argument("--lights", type=int, default=1)
+    parser.add_argument("--light-channels", type=int, default=2)
+    parser.add_argument("--timers", type=int, default=0)
+    parser.add_argument("--macros", type=int, default=0)
+    parser.add_argument("--display", action="store_true")
+    parser.add_argument("--history-size", type=int, default=24)
+    parser.add_argument("--default-latency", type=float, default=0.0)
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        help="PATTERN=SECONDS, e.g. 'phprobes/*=0.4' (repeatable)",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        action="append",
+        default=[],
+        help="PATTERN=PROBABILITY, e.g. 'inlets/*/read=0.1' (repeatable)",
+    )
+    parser.add_argument("--mqtt-prefix", default="reef-pi")
+    parser.add_argument("--mqtt-host", help="Publish telemetry to this MQTT broker")
+    parser.add_argument("--mqtt-port", type=int, default=1883)
+    parser.add_argument("--mqtt-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import logging
 
+import httpx
 import pytest
 import respx
 
@@ -82,3 +83,30 @@ async def test_ph_calibration(reef_pi_instance):
     )
     result = await reef.ph_probe_calibrate_point(6, 7.0, 6.9, "mid")
     assert result
+
+
+@pytest.mark.asyncio
+async def test_timer_control_from_known_copy(reef_pi_instance):
+    mock, reef = reef_pi_instance
+    url = f"{async_api_mock.REEF_MOCK_URL}/api/timers/1"
+    get = mock.get(url).respond(200, json={"id": "1", "enable": True})
+    post = mock.post(url).respond(200)
+
+    base = {"id": "1", "enable": True}
+    assert await reef.timer_control("1", False, base)
+    assert not get.called
+    assert post.call_count == 1
+    assert base["enable"]
+
+
+@pytest.mark.asyncio
+async def test_timer_control_rereads_rejected_copy(reef_pi_instance):
+    mock, reef = reef_pi_instance
+    url = f"{async_api_mock.REEF_MOCK_URL}/api/timers/1"
+    get = mock.get(url).respond(200, json={"id": "1", "enable": True})
+    post = mock.post(url)
+    post.side_effect = [httpx.Response(400), httpx.Response(200)]
+
+    assert await reef.timer_control("1", False, {"id": "1", "name": "stale"})
+    assert get.call_count == 1
+    assert post.call_count == 2
@@ -0,0 +1,176 @@
+"""Test the offline command queue of Reef-Pi integration."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import respx
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.async_api import CannotConnect
+from custom_components.reef_pi.command_queue import ReefPiCommandQueue
+from custom_components.reef_pi.const import COMMAND_QUEUE
+
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+def test_last_command_per_device_wins():
+    queue = ReefPiCommandQueue(timedelta(minutes=10))
+    queue.add("equipment", "1", False)
+    queue.add("timers", "2", True)
+    queue.add("equipment", "1", True)
+
+    assert queue.pending() == [("timers", "2", True), ("equipment", "1", True)]
+    queue.discard("timers", "2")
+    assert queue.pending() == [("equipment", "1", True)]
+
+
+def test_expired_commands_are_dropped():
+    now = dt_util.utcnow()
+    queue = ReefPiCommandQueue(timedelta(minutes=10))
+    queue.add("equipment", "1", False, now - timedelta(minutes=11))
+    queue.add("equipment", "2", False, now - timedelta(minutes=9))
+
+    assert queue.pending(now) == [("equipment", "2", False)]
+    assert len(queue) == 1
+
+
+def test_storage_round_trip():
+    queue = ReefPiCommandQueue(timedelta(minutes=10))
+    queue.add("equipment", "1", False)
+    queue.add("lights", "1-2", 40)
+
+    restored = ReefPiCommandQueue(timedelta(minutes=10))
+    restored.load(queue.as_list())
+    assert restored.pending() == queue.pending()
+
+
+async def test_commands_are_replayed_after_reconnect(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(equipment=2, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+            options={COMMAND_QUEUE: True},
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        with patch.object(coordinator.api, "_send", side_effect=CannotConnect):
+            assert await coordinator.equipment_control("2", False)
+            assert await coordinator.equipment_control("2", True)
+            assert await coordinator.equipment_control("1", True)
+        assert coordinator.command_queue.pending() == [
+            ("equipment", "2", True),
+            ("equipment", "1", True),
+        ]
+
+        simulator.equipment["2"]["on"] = False
+        simulator.reset_counts()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert len(coordinator.command_queue) == 0
+        assert simulator.request_counts["POST equipment/2/control"] == 1
+        assert simulator.request_counts["POST equipment/1/control"] == 1
+        assert simulator.equipment["1"]["on"] is True
+        assert simulator.equipment["2"]["on"] is True
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_switch_commands_are_queued_while_unreachable(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(equipment=2, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+            options={COMMAND_QUEUE: True},
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        registry = er.async_get(hass)
+        switch = registry.async_get_entity_id(
+            "switch", DOMAIN, f"{coordinator.unique_id}_switch_2"
+        )
+        temperature = registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{coordinator.unique_id}_tcs_1"
+        )
+
+        reading = hass.states.get(temperature).state
+        with patch.object(coordinator.api, "_send", side_effect=CannotConnect):
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert not coordinator.last_update_success
+            # The last known state is kept
+            assert hass.states.get(temperature).state == reading
+            assert hass.states.get(switch).state == STATE_ON
+
+            await hass.services.async_call(
+                "switch", "turn_off", {"entity_id": switch}, blocking=True
+            )
+        assert coordinator.command_queue.pending() == [("equipment", "2", False)]
+        assert simulator.equipment["2"]["on"] is True
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert len(coordinator.command_queue) == 0
+        assert simulator.equipment["2"]["on"] is False
+        assert hass.states.get(switch).state == STATE_OFF
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_empty_queue_is_not_saved(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(equipment=2, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+            options={COMMAND_QUEUE: True},
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        with (
+            patch.object(coordinator._commands_store, "async_delay_save") as save,
+            patch.object(coordinator, "async_update_listeners") as notify,
+        ):
+            await coordinator.async_replay_commands()
+        save.assert_not_called()
+        notify.assert_not_called()
+
+        await hass.config_entries.async_unload(entry.entry_id)
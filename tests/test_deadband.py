@@ -0,0 +1,43 @@
+"""Test the significant-change filter of Reef-Pi integration."""
+
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.reef_pi.deadband import ReefPiDeadband
+
+
+def test_rounds_to_precision():
+    deadband = ReefPiDeadband(precision=2)
+    assert deadband.apply(8.1234) == 8.12
+    assert deadband.apply("25.06") == 25.06
+
+
+def test_holds_back_small_changes():
+    now = dt_util.utcnow()
+    deadband = ReefPiDeadband(deadband=0.02, precision=2)
+
+    assert deadband.apply(8.20, now) == 8.20
+    assert deadband.apply(8.21, now) == 8.20
+    assert deadband.apply(8.19, now) == 8.20
+    assert deadband.apply(8.22, now) == 8.22
+    assert deadband.apply(8.1, now) == 8.1
+
+
+def test_heartbeat_publishes_current_reading():
+    now = dt_util.utcnow()
+    deadband = ReefPiDeadband(
+        deadband=0.2, precision=1, heartbeat=timedelta(minutes=15)
+    )
+
+    assert deadband.apply(25.0, now) == 25.0
+    assert deadband.apply(25.1, now + timedelta(minutes=10)) == 25.0
+    assert deadband.apply(25.1, now + timedelta(minutes=16)) == 25.1
+    assert deadband.apply(25.0, now + timedelta(minutes=20)) == 25.1
+
+
+def test_missing_reading():
+    deadband = ReefPiDeadband(deadband=0.1, precision=1)
+    assert deadband.apply(25.0) == 25.0
+    assert deadband.apply(None) is None
+    assert deadband.apply(24.98) == 25.0
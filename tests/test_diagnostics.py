@@ -0,0 +1,59 @@
+"""Test diagnostics for Reef-Pi integration."""
+
+import pytest
+import respx
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.diagnostics import async_get_config_entry_diagnostics
+
+from . import async_api_mock
+
+
+@pytest.fixture
+async def async_api_mock_instance():
+    with respx.mock(assert_all_called=False) as mock:
+        async_api_mock.mock_all(mock)
+        yield mock
+
+
+async def test_diagnostics(hass, async_api_mock_instance):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["entry"]["data"]["password"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["username"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["host"] == "**REDACTED**"
+    assert diagnostics["coordinator"]["info"]["ip"] == "**REDACTED**"
+    assert diagnostics["coordinator"]["info"]["name"] == "Reef PI"
+
+    sizes = diagnostics["coordinator"]["data_sizes"]
+    assert sizes["equipment"] == 6
+    assert sizes["tcs"] == 1
+    assert sizes["ph"] == 1
+
+    assert diagnostics["mqtt"]["tracker"] is None
+    assert diagnostics["mqtt"]["collisions"] == {}
+
+    assert len(diagnostics["refresh"]["recent_durations"]) == 1
+    assert diagnostics["refresh"]["steps"]["equipment"]["count"] == 1
+
+    endpoints = diagnostics["api"]["endpoints"]
+    assert endpoints["GET equipment"]["errors"] == 0
+    assert diagnostics["api"]["requests"] == sum(e["count"] for e in endpoints.values())
+
+    controllers = diagnostics["hub"]["controllers"]
+    assert controllers[entry.entry_id]["refreshes"] == 1
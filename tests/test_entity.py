@@ -0,0 +1,159 @@
+"""Test the base entity of Reef-Pi integration."""
+
+from unittest.mock import patch
+
+import pytest
+import respx
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.const import ENTITY_RETIRE_AFTER
+from custom_components.reef_pi.switch import ReefPiSwitch
+
+from . import async_api_mock
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+@pytest.fixture
+async def async_api_mock_instance():
+    with respx.mock(assert_all_called=False) as mock:
+        async_api_mock.mock_all(mock)
+        yield mock
+
+
+async def setup_entry(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+
+async def test_unchanged_state_is_not_written(hass, async_api_mock_instance):
+    coordinator = await setup_entry(hass)
+
+    with patch.object(ReefPiSwitch, "async_write_ha_state") as write:
+        coordinator.async_update_listeners()
+        await hass.async_block_till_done()
+    write.assert_not_called()
+
+
+async def test_changed_state_is_written(hass, async_api_mock_instance):
+    coordinator = await setup_entry(hass)
+    assert hass.states.get("switch.reef_pi_co2").state == STATE_ON
+
+    coordinator.equipment["19"]["state"] = False
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.reef_pi_co2").state == STATE_OFF
+
+
+async def test_removed_device_becomes_unavailable(hass, async_api_mock_instance):
+    coordinator = await setup_entry(hass)
+
+    del coordinator.equipment["19"]
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+    assert hass.states.get("switch.reef_pi_co2").state == "unavailable"
+
+
+async def test_devices_are_added_and_retired_without_reload(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(equipment=2, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        registry = er.async_get(hass)
+        unique_id = f"{coordinator.unique_id}_switch_3"
+        assert registry.async_get_entity_id("switch", DOMAIN, unique_id) is None
+
+        simulator.equipment["3"] = {
+            "id": "3",
+            "name": "Outlet 3",
+            "outlet": "3",
+            "on": True,
+            "stay_off_on_boot": False,
+        }
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        entity_id = registry.async_get_entity_id("switch", DOMAIN, unique_id)
+        assert hass.states.get(entity_id).state == STATE_ON
+
+        del simulator.equipment["3"]
+        for _ in range(ENTITY_RETIRE_AFTER - 1):
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert registry.async_get_entity_id("switch", DOMAIN, unique_id)
+        assert hass.states.get(entity_id).state == "unavailable"
+
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert registry.async_get_entity_id("switch", DOMAIN, unique_id) is None
+        assert hass.states.get(entity_id) is None
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_failed_fetches_do_not_retire_devices(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        registry = er.async_get(hass)
+        entities = [("switch", f"{coordinator.unique_id}_ato_1_enable")] + [
+            ("sensor", f"{coordinator.unique_id}_pump_{id}") for id in coordinator.pumps
+        ]
+        assert len(entities) == 3
+        for domain, unique_id in entities:
+            assert registry.async_get_entity_id(domain, DOMAIN, unique_id)
+
+        simulator.config.failure_rate = {"atos": 1.0, "doser/pumps": 1.0}
+        for _ in range(ENTITY_RETIRE_AFTER + 1):
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert coordinator.last_update_success
+
+        for domain, unique_id in entities:
+            assert registry.async_get_entity_id(domain, DOMAIN, unique_id)
+
+        await hass.config_entries.async_unload(entry.entry_id)
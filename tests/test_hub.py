@@ -0,0 +1,48 @@
+"""Test the coordination of several reef-pi controllers."""
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.reef_pi.hub import ReefPiHub
+
+MINUTE = timedelta(minutes=1)
+
+
+def test_single_controller_keeps_interval():
+    hub = ReefPiHub(seed=1)
+    hub.register("a")
+    assert hub.next_interval("a", MINUTE, now=1000.0) == MINUTE
+
+
+def test_controllers_are_staggered():
+    hub = ReefPiHub(seed=1)
+    for entry_id in ("a", "b", "c", "d"):
+        hub.register(entry_id)
+
+    offsets = [hub.offset(entry_id, 60) for entry_id in ("a", "b", "c", "d")]
+    # Each controller starts within its own quarter of the minute
+    for index, offset in enumerate(offsets):
+        assert 15 * index <= offset < 15 * index + 15 * hub.jitter
+
+    now = 6000.0  # a full minute
+    for entry_id, offset in zip(("a", "b", "c", "d"), offsets):
+        interval = hub.next_interval(entry_id, MINUTE, now=now).total_seconds()
+        assert 30 <= interval < 90
+        assert (now + interval) % 60 == pytest.approx(offset)
+
+
+def test_unregister_and_stats():
+    hub = ReefPiHub(seed=1)
+    hub.register("a")
+    hub.register("b")
+    hub.record("a", 1000.0, 2.5)
+
+    stats = hub.get_stats()
+    assert stats["a"]["refreshes"] == 1
+    assert stats["a"]["last_duration"] == 2.5
+    assert stats["b"]["refreshes"] == 0
+
+    hub.unregister("b")
+    assert list(hub.get_stats()) == ["a"]
+    assert hub.next_interval("a", MINUTE, now=1000.0) == MINUTE
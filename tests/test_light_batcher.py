@@ -0,0 +1,50 @@
+"""Test coalescing of light channel commands."""
+
+import asyncio
+
+import respx
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+async def test_channel_changes_are_sent_in_one_update(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(lights=1, light_channels=2, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        coordinator.light_batcher.delay = 0
+        simulator.reset_counts()
+
+        await asyncio.gather(
+            coordinator.light_control("1-1", 10),
+            coordinator.light_control("1-2", 20),
+            coordinator.light_control("1-1", 30),
+        )
+
+        assert simulator.request_counts["POST lights/1"] == 1
+        channels = simulator.lights["1"]["channels"]
+        assert channels["1"]["value"] == 30
+        assert channels["2"]["value"] == 20
+        assert coordinator.lights["1-1"]["value"] == 30
+        assert coordinator.lights["1-2"]["value"] == 20
@@ -1,6 +1,6 @@
 """Test MQTT handler for Reef-Pi integration."""
 
-from unittest.mock import MagicMock, Mock
+from unittest.mock import ANY, MagicMock, Mock
 
 import pytest
 from homeassistant.components.mqtt.models import ReceiveMessage
@@ -22,6 +22,7 @@ class MockCoordinator:
         self.mqtt_tracker = ReefPiMQTTTracker()
         self.data = {}
         self.async_set_updated_data = Mock()
+        self.record_sample = Mock()
 
         # Create mock mapper with test mappings
         mock_hass = MagicMock()
@@ -83,6 +84,9 @@ async def test_mqtt_message_received_temperature(mqtt_handler, mock_coordinator)
 
     assert mock_coordinator.tcs["1"]["temperature"] == 25.5
     assert mock_coordinator.async_set_updated_data.called
+    mock_coordinator.record_sample.assert_called_once_with(
+        "temperature", "1", 25.5, ANY
+    )
 
 
 @pytest.mark.asyncio
@@ -288,3 +292,15 @@ async def test_mqtt_prefix_custom():
     handler._mqtt_message_received(msg)
 
     assert coordinator.tcs["1"]["temperature"] == 26.0
+
+
+@pytest.mark.asyncio
+async def test_update_device_state_stamps_source_time(mqtt_handler, mock_coordinator):
+    """Test MQTT updates stamp the value with the time recorded in the tracker."""
+    mqtt_handler._update_device_state("equipment", "1", 1.0)
+
+    updated_at = mock_coordinator.equipment["1"]["updated_at"]
+    assert updated_at is not None
+    assert mock_coordinator.mqtt_tracker.get_last_update_time("equipment", "1") == (
+        updated_at
+    )
@@ -0,0 +1,92 @@
+"""Test applying changed options of Reef-Pi integration."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import respx
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.const import (
+    DISABLE_PH,
+    ENTITY_RETIRE_AFTER,
+    PH_DEADBAND,
+    UPDATE_INTERVAL_CFG,
+)
+
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+@pytest.fixture
+async def simulated_entry(hass):
+    simulator = ReefPiSimulator(SimulatorConfig(probes=1, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        yield entry
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_interval_change_is_applied_without_reload(hass, simulated_entry):
+    coordinator = hass.data[DOMAIN][simulated_entry.entry_id]["coordinator"]
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(
+            simulated_entry, options={UPDATE_INTERVAL_CFG: 120}
+        )
+        await hass.async_block_till_done()
+
+    reload.assert_not_called()
+    assert hass.data[DOMAIN][simulated_entry.entry_id]["coordinator"] is coordinator
+    assert coordinator.base_update_interval == timedelta(seconds=120)
+    assert coordinator.update_interval == timedelta(seconds=120)
+
+
+async def test_ph_toggle_adds_and_removes_entities(hass, simulated_entry):
+    coordinator = hass.data[DOMAIN][simulated_entry.entry_id]["coordinator"]
+    registry = er.async_get(hass)
+    unique_id = f"{coordinator.unique_id}_ph_1"
+    assert registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+
+    hass.config_entries.async_update_entry(simulated_entry, options={DISABLE_PH: True})
+    await hass.async_block_till_done()
+    assert coordinator.ph == {}
+    for _ in range(ENTITY_RETIRE_AFTER):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert registry.async_get_entity_id("sensor", DOMAIN, unique_id) is None
+
+    hass.config_entries.async_update_entry(simulated_entry, options={DISABLE_PH: False})
+    await hass.async_block_till_done()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+    assert hass.states.get(entity_id).state not in ("unavailable", "unknown")
+
+
+async def test_other_changes_reload(hass, simulated_entry):
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(
+            simulated_entry, options={PH_DEADBAND: 0.1}
+        )
+        await hass.async_block_till_done()
+
+    reload.assert_called_once_with(simulated_entry.entry_id)
@@ -0,0 +1,131 @@
+"""Test refresh and API timing statistics for Reef-Pi integration."""
+
+from datetime import timedelta
+
+import pytest
+import respx
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.const import OVERRUN_SHEDDING, REFRESH_STEPS
+from custom_components.reef_pi.perf_stats import ReefPiTimingStats, endpoint_key
+
+from . import async_api_mock
+
+
+@pytest.fixture
+async def async_api_mock_instance():
+    with respx.mock(assert_all_called=False) as mock:
+        async_api_mock.mock_all(mock)
+        yield mock
+
+
+def test_endpoint_key_folds_ids():
+    assert endpoint_key("GET", "tcs/1/current_reading") == (
+        "GET tcs/{id}/current_reading"
+    )
+    assert endpoint_key("POST", "equipment/17/control") == (
+        "POST equipment/{id}/control"
+    )
+    assert endpoint_key("GET", "lights/3") == "GET lights/{id}"
+    assert endpoint_key("GET", "doser/pumps") == "GET doser/pumps"
+
+
+def test_timing_stats_summary():
+    stats = ReefPiTimingStats(max_samples=10)
+    for i in range(1, 21):
+        stats.record("ph", i / 100, size=10, error=i == 20)
+
+    summary = stats.get("ph")
+    assert summary is not None
+    assert summary["count"] == 20
+    assert summary["total"] == pytest.approx(2.1)
+    assert summary["last"] == pytest.approx(0.2)
+    # Percentiles are computed over the 10 most recent samples only
+    assert summary["p50"] == pytest.approx(0.16)
+    assert summary["p95"] == pytest.approx(0.2)
+    assert summary["max"] == pytest.approx(0.2)
+    assert summary["bytes"] == 200
+    assert summary["errors"] == 1
+    assert stats.total_count == 20
+    assert stats.get("unknown") is None
+
+
+async def test_refresh_steps_are_timed(hass, async_api_mock_instance):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    stats = coordinator.refresh_stats.get_stats()
+    assert set(stats) == {"refresh", *REFRESH_STEPS}
+    assert stats["refresh"]["count"] == 1
+
+    api_stats = coordinator.api.stats.get_stats()
+    assert api_stats["GET tcs/{id}/current_reading"]["count"] == 1
+    assert api_stats["GET equipment"]["bytes"] > 0
+
+    state = hass.states.get("sensor.reef_pi_refresh_duration")
+    assert state
+    assert float(state.state) >= 0
+    assert state.attributes["count"] == 1
+
+    state = hass.states.get("sensor.reef_pi_api_requests")
+    assert state
+    assert int(state.state) == coordinator.api.stats.total_count
+
+
+async def test_overrun_stretches_interval_and_sheds_steps(
+    hass, async_api_mock_instance
+):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+        options={OVERRUN_SHEDDING: True},
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    base = coordinator.base_update_interval
+    assert coordinator.overruns == 0
+
+    # Any refresh is longer than this
+    coordinator.base_update_interval = timedelta(microseconds=1)
+    await coordinator.async_refresh()
+    assert coordinator.overruns == 1
+    # timedelta keeps whole microseconds
+    assert coordinator.update_interval.total_seconds() == pytest.approx(
+        coordinator.refresh_stats.last("refresh"), abs=1e-6
+    )
+
+    # The next refresh skips the sheddable steps
+    coordinator.base_update_interval = base
+    await coordinator.async_refresh()
+    stats = coordinator.refresh_stats.get_stats()
+    assert stats["equipment"]["count"] == 3
+    assert stats["macros"]["count"] == 2
+    assert stats["capabilities"]["count"] == 2
+    assert coordinator.update_interval == base
+
+    state = hass.states.get("sensor.reef_pi_refresh_overruns")
+    assert state
+    assert int(state.state) == 1
+    assert state.attributes["update_interval"] == base.total_seconds()
@@ -54,3 +54,5 @@ async def test_ph(hass, async_api_mock_instance):
     assert state
     assert state.state == "6.66"
     assert state.name == "Reef PI pH"
+    assert "chart" not in state.attributes
+    assert state.attributes["notify"] == {"enable": True, "min": 7.5, "max": 8.6}
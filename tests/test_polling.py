@@ -0,0 +1,64 @@
+"""Test adaptive polling of Reef-Pi integration."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.reef_pi.polling import ReefPiAdaptivePolling, fingerprint
+
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+MINUTE = timedelta(minutes=1)
+
+
+def test_fingerprint_ignores_poll_timestamps():
+    first = {"1": {"state": True, "updated_at": NOW}}
+    second = {"1": {"state": True, "updated_at": NOW + MINUTE}}
+    changed = {"1": {"state": False, "updated_at": NOW + MINUTE}}
+
+    assert fingerprint(first) == fingerprint(second)
+    assert fingerprint(first) != fingerprint(changed)
+
+
+def test_unchanged_step_backs_off_to_max():
+    polling = ReefPiAdaptivePolling(MINUTE, 4 * MINUTE)
+    assert polling.due("timers", NOW)
+
+    assert polling.record("timers", 1, 0.1, NOW) == MINUTE
+    assert not polling.due("timers", NOW + MINUTE / 4)
+    assert polling.due("timers", NOW + MINUTE)
+
+    intervals = [polling.record("timers", 1, 0.1, NOW) for _ in range(5)]
+    assert intervals[0] == 1.5 * MINUTE
+    assert intervals[-1] == 4 * MINUTE
+
+
+def test_changing_step_speeds_up_to_min():
+    polling = ReefPiAdaptivePolling(MINUTE, 8 * MINUTE)
+    for _ in range(7):
+        polling.record("equipment", 1, 0.1, NOW)
+    assert polling.intervals["equipment"] == 8 * MINUTE
+
+    assert polling.record("equipment", 2, 0.1, NOW) == 4 * MINUTE
+    assert polling.record("equipment", 3, 0.1, NOW) == 2 * MINUTE
+    assert polling.record("equipment", 4, 0.1, NOW) == MINUTE
+    assert polling.record("equipment", 5, 0.1, NOW) == MINUTE
+
+
+def test_strained_controller_backs_off():
+    polling = ReefPiAdaptivePolling(MINUTE, 8 * MINUTE)
+    polling.record("temperature", 1, 0.1, NOW)
+
+    # Slow step
+    assert polling.record("temperature", 2, 5.0, NOW) == 1.5 * MINUTE
+    # Hot CPU
+    assert (
+        polling.record("temperature", 3, 0.1, NOW, cpu_temperature=80.0)
+        == 2.25 * MINUTE
+    )
+
+
+def test_reset_polls_again():
+    polling = ReefPiAdaptivePolling(MINUTE, 8 * MINUTE)
+    polling.record("lights", 1, 0.1, NOW)
+    assert not polling.due("lights", NOW)
+
+    polling.reset("lights")
+    assert polling.due("lights", NOW)
@@ -35,6 +35,7 @@ async def test_pump1(hass, async_api_mock_instance):
     assert state
     assert state.state == "2021-08-23T20:30:00+00:00"
     assert state.name == "Reef PI Pump1 sched1"
+    assert set(state.attributes) >= {"duration", "schedules"}
 
 
 async def test_pump2(hass, async_api_mock_instance):
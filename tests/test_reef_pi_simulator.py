@@ -0,0 +1,79 @@
+"""Test the local reef-pi simulator used for benchmarking."""
+
+import time
+
+import pytest
+import respx
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.async_api import ReefApi
+
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+async def test_simulator_scales_devices(hass):
+    simulator = ReefPiSimulator(
+        SimulatorConfig(temperature_sensors=3, probes=2, equipment=10, lights=2, seed=1)
+    )
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        assert len(coordinator.tcs) == 3
+        assert len(coordinator.ph) == 2
+        assert len(coordinator.equipment) == 10
+        assert len(coordinator.lights) == 4
+        assert simulator.request_counts["GET equipment"] == 1
+        assert simulator.request_counts["GET tcs/1/current_reading"] == 1
+
+
+@pytest.mark.asyncio
+async def test_simulator_latency_and_failure_injection():
+    simulator = ReefPiSimulator(
+        SimulatorConfig(
+            latency={"phprobes/*/readings": 0.2},
+            failure_rate={"equipment": 1.0},
+            seed=1,
+        )
+    )
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        api = ReefApi(url)
+        await api.authenticate(SIMULATOR_USER, SIMULATOR_PASSWORD)
+
+        started = time.monotonic()
+        reading = await api.ph_readings(1)
+        assert time.monotonic() - started >= 0.2
+        assert reading["value"] is not None
+
+        assert await api.equipment() == {}
+        assert len(await api.temperature_sensors()) == 1
+
+
+@pytest.mark.asyncio
+async def test_simulator_mqtt_messages_match_mapper_topics():
+    simulator = ReefPiSimulator(SimulatorConfig(equipment=2, seed=1))
+    topics = dict(simulator.mqtt_messages())
+
+    assert "reef-pi/temp_1_reading" in topics
+    assert "reef-pi/ph_ph_1" in topics
+    assert topics["reef-pi/equipment_outlet_2_state"] == "1.000000"
+    assert "reef-pi/ato_ato_1_state" in topics
@@ -0,0 +1,119 @@
+"""Test prioritized scheduling of reef-pi API requests."""
+
+import asyncio
+
+import pytest
+
+from custom_components.reef_pi.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    ReefPiRequestScheduler,
+)
+
+
+async def _hold(scheduler, priority, order, name, release):
+    async with scheduler.slot(priority):
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_background_requests_leave_a_slot_for_commands():
+    scheduler = ReefPiRequestScheduler(max_concurrent=2)
+    release = asyncio.Event()
+    order = []
+
+    polls = [
+        asyncio.create_task(
+            _hold(scheduler, PRIORITY_BACKGROUND, order, f"poll{i}", release)
+        )
+        for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    assert order == ["poll0"]
+    assert scheduler.waiting == 2
+
+    command = asyncio.create_task(
+        _hold(scheduler, PRIORITY_INTERACTIVE, order, "command", release)
+    )
+    await asyncio.sleep(0)
+    assert order == ["poll0", "command"]
+    assert scheduler.active == 2
+
+    release.set()
+    await asyncio.gather(command, *polls)
+    assert order == ["poll0", "command", "poll1", "poll2"]
+    assert scheduler.active == 0
+    stats = scheduler.stats.get_stats()
+    assert stats["background"]["count"] == 3
+    assert stats["interactive"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_commands_are_served_before_queued_polls():
+    scheduler = ReefPiRequestScheduler(max_concurrent=1, reserved_interactive=0)
+    release = asyncio.Event()
+    order = []
+
+    tasks = [
+        asyncio.create_task(
+            _hold(scheduler, PRIORITY_BACKGROUND, order, "poll0", release)
+        ),
+        asyncio.create_task(
+            _hold(scheduler, PRIORITY_BACKGROUND, order, "poll1", release)
+        ),
+        asyncio.create_task(
+            _hold(scheduler, PRIORITY_INTERACTIVE, order, "command", release)
+        ),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["poll0", "command", "poll1"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    scheduler = ReefPiRequestScheduler(max_concurrent=1, reserved_interactive=0)
+    release = asyncio.Event()
+    order = []
+
+    running = asyncio.create_task(
+        _hold(scheduler, PRIORITY_BACKGROUND, order, "poll0", release)
+    )
+    waiting = asyncio.create_task(
+        _hold(scheduler, PRIORITY_BACKGROUND, order, "poll1", release)
+    )
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.waiting == 0
+
+    release.set()
+    await running
+    assert order == ["poll0"]
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_parent_limits_all_children():
+    parent = ReefPiRequestScheduler(max_concurrent=1, reserved_interactive=0)
+    first = ReefPiRequestScheduler(parent=parent)
+    second = ReefPiRequestScheduler(parent=parent)
+    release = asyncio.Event()
+    order = []
+
+    tasks = [
+        asyncio.create_task(_hold(first, PRIORITY_BACKGROUND, order, "first", release)),
+        asyncio.create_task(
+            _hold(second, PRIORITY_BACKGROUND, order, "second", release)
+        ),
+    ]
+    await asyncio.sleep(0)
+    assert order == ["first"]
+    assert parent.waiting == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["first", "second"]
+    assert parent.active == first.active == second.active == 0
@@ -232,3 +232,88 @@ async def test_inlet_polled_without_ato(hass):
         assert state
         assert state.state == "on"
         assert state.name == "Reef PI Float Switch"
+
+
+async def test_device_info_shared(hass, async_api_mock_instance):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    device_info = coordinator.device_info
+    assert coordinator.device_info is device_info
+
+    await coordinator.async_refresh()
+    assert coordinator.device_info is device_info
+
+    coordinator.info = {**coordinator.info, "name": "Renamed"}
+    assert coordinator.device_info is not device_info
+    assert coordinator.device_info["name"] == "Renamed"
+
+
+async def test_trend_sensors(hass, async_api_mock_instance):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.trend("temperature", "1")["mean"] == 25.0
+
+    state = hass.states.get("sensor.reef_pi_temp_rate")
+    assert state
+    assert state.attributes["unit_of_measurement"] == "°C/h"
+    assert state.attributes["samples"] == 1
+
+
+async def test_ato_total_run_time(hass, async_api_mock_instance):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.reef_pi_test_ato_total_run_time")
+    assert state
+    assert float(state.state) == 120
+
+    # Entries already counted are not added again
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.reef_pi_test_ato_total_run_time")
+    assert float(state.state) == 120
+
+    # Without usage data the sensor is unavailable
+    coordinator.ato_states.clear()
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.reef_pi_test_ato_total_run_time")
+    assert state.state == "unavailable"
@@ -0,0 +1,250 @@
+"""Test the services of Reef-Pi integration."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import respx
+from homeassistant.const import STATE_OFF
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.const import COMMAND_VERIFY_DELAY
+
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+@pytest.fixture
+async def simulator_entry(hass):
+    simulator = ReefPiSimulator(
+        SimulatorConfig(equipment=3, timers=1, lights=1, seed=1)
+    )
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        yield simulator, entry
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+def _switch_ids(hass, entry, prefix):
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    return {
+        e.unique_id.removeprefix(f"{coordinator.unique_id}_"): e.entity_id
+        for e in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        if e.domain == "switch"
+        and e.unique_id.removeprefix(f"{coordinator.unique_id}_").startswith(prefix)
+    }
+
+
+async def test_set_equipment(hass, simulator_entry):
+    simulator, entry = simulator_entry
+    switches = _switch_ids(hass, entry, "switch_") | _switch_ids(hass, entry, "timer_")
+    assert len(switches) == 4
+    simulator.reset_counts()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "set_equipment",
+        {"entity_id": list(switches.values()), "state": False},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "results": {
+            entity_id: {"success": True, "error": None}
+            for entity_id in switches.values()
+        }
+    }
+    assert (
+        sum(
+            count
+            for key, count in simulator.request_counts.items()
+            if key.startswith("POST equipment/")
+        )
+        == 3
+    )
+    assert simulator.request_counts["POST timers/1"] == 1
+    assert all(not device["on"] for device in simulator.equipment.values())
+    for entity_id in switches.values():
+        assert hass.states.get(entity_id).state == STATE_OFF
+
+    # The switched devices are read back together, one read per kind
+    simulator.reset_counts()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    with patch.object(coordinator, "async_update_listeners") as update_listeners:
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=COMMAND_VERIFY_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+    assert simulator.request_counts == {"GET equipment": 1, "GET timers/1": 1}
+    update_listeners.assert_called_once()
+
+
+async def test_set_equipment_rejects_other_entities(hass, simulator_entry):
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_equipment",
+            {"entity_id": ["switch.unknown"], "state": False},
+            blocking=True,
+        )
+
+
+async def test_snapshot_and_restore(hass, simulator_entry, hass_storage):
+    simulator, entry = simulator_entry
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinator.light_batcher.delay = 0
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "snapshot",
+        {"name": "water change", "persist": True},
+        blocking=True,
+        return_response=True,
+    )
+    assert response[entry.entry_id]["equipment"] == {
+        "1": False,
+        "2": True,
+        "3": False,
+    }
+    assert response[entry.entry_id]["lights"]["1-1"] == 50
+    assert hass_storage[f"{DOMAIN}.{entry.entry_id}.saved_states"]["data"] == {
+        "water change": response[entry.entry_id]
+    }
+    # Restore from the stored snapshot, as after a restart
+    coordinator.saved_states.clear()
+
+    await coordinator.async_set_state(
+        [("equipment", "1", True), ("timers", "1", False), ("lights", "1-1", 10)]
+    )
+    assert simulator.equipment["1"]["on"] is True
+    simulator.reset_counts()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "restore",
+        {"config_entry_id": entry.entry_id, "name": "water change"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        entry.entry_id: {
+            item: {"success": True, "error": None}
+            for item in ("equipment/1", "timers/1", "lights/1-1")
+        }
+    }
+    assert simulator.request_counts == {
+        "POST equipment/1/control": 1,
+        "POST timers/1": 1,
+        "POST lights/1": 1,
+    }
+    assert simulator.equipment["1"]["on"] is False
+    assert simulator.timers["1"]["enable"] is True
+    assert simulator.lights["1"]["channels"]["1"]["value"] == 50
+
+
+async def test_restore_unknown_snapshot(hass, simulator_entry):
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, "restore", {"name": "missing"}, blocking=True
+        )
+
+
+async def test_restore_skips_controllers_without_snapshot(hass):
+    first = ReefPiSimulator(SimulatorConfig(equipment=2, seed=1))
+    second = ReefPiSimulator(SimulatorConfig(equipment=2, seed=2))
+    with respx.mock(assert_all_called=False) as mock:
+        entries = []
+        for simulator, url in (
+            (first, "http://first.simulator"),
+            (second, "http://second.simulator"),
+        ):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    "host": simulator.install(mock, url),
+                    "username": SIMULATOR_USER,
+                    "password": SIMULATOR_PASSWORD,
+                    "verify": False,
+                },
+            )
+            entry.add_to_hass(hass)
+            await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            entries.append(entry)
+
+        await hass.services.async_call(
+            DOMAIN,
+            "snapshot",
+            {"config_entry_id": entries[0].entry_id, "name": "night"},
+            blocking=True,
+        )
+        first.equipment["1"]["on"] = True
+        second.equipment["1"]["on"] = True
+        for entry in entries:
+            await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_refresh()
+        second.reset_counts()
+
+        response = await hass.services.async_call(
+            DOMAIN, "restore", {"name": "night"}, blocking=True, return_response=True
+        )
+
+        assert response == {
+            entries[0].entry_id: {"equipment/1": {"success": True, "error": None}}
+        }
+        assert first.equipment["1"]["on"] is False
+        assert second.equipment["1"]["on"] is True
+        assert not any(key.startswith("POST") for key in second.request_counts)
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_deleted_devices_are_not_switched(hass, simulator_entry):
+    simulator, entry = simulator_entry
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    switches = _switch_ids(hass, entry, "switch_")
+    # Deleted in reef-pi, the entity is not retired yet
+    del coordinator.equipment["3"]
+    simulator.reset_counts()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_equipment",
+            {"entity_id": [switches["switch_3"]], "state": True},
+            blocking=True,
+        )
+
+    errors = await coordinator.async_set_state(
+        [("equipment", "3", True), ("equipment", "1", True)]
+    )
+    assert errors == {
+        ("equipment", "3"): "no longer exists in reef-pi",
+        ("equipment", "1"): None,
+    }
+    assert simulator.request_counts == {"POST equipment/1/control": 1}
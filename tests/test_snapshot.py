@@ -0,0 +1,163 @@
+"""Test the persisted snapshot of Reef-Pi integration."""
+
+import json
+from datetime import timedelta
+
+import httpx
+import pytest
+import respx
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_ON
+from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.const import SNAPSHOT_SAVE_DELAY
+
+from . import async_api_mock
+
+
+def stored(snapshot):
+    """Return the snapshot as Store writes and loads it."""
+    return json.loads(json.dumps(snapshot, cls=JSONEncoder))
+
+
+def create_entry(hass):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def async_api_mock_instance():
+    with respx.mock(assert_all_called=False) as mock:
+        async_api_mock.mock_all(mock)
+        yield mock
+
+
+async def test_snapshot_saved_after_refresh(
+    hass, hass_storage, async_api_mock_instance
+):
+    entry = create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+
+    snapshot = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+    assert snapshot["info"]["name"] == "Reef PI"
+    assert snapshot["capabilities"]["equipment"]
+    assert len(snapshot["equipment"]) == 6
+    assert len(snapshot["tcs"]) == 1
+
+
+async def test_snapshot_is_not_postponed_by_refreshes(
+    hass, hass_storage, async_api_mock_instance
+):
+    entry = create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    now = dt_util.utcnow()
+    for minutes in range(1, SNAPSHOT_SAVE_DELAY // 60):
+        await coordinator.async_refresh()
+        async_fire_time_changed(hass, now + timedelta(minutes=minutes))
+        await hass.async_block_till_done()
+    assert f"{DOMAIN}.{entry.entry_id}" not in hass_storage
+
+    async_fire_time_changed(hass, now + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.{entry.entry_id}" in hass_storage
+
+
+async def test_snapshot_saved_on_unload(hass, hass_storage, async_api_mock_instance):
+    entry = create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]["info"]["name"] == (
+        "Reef PI"
+    )
+
+
+async def test_startup_from_snapshot_with_controller_offline(hass, hass_storage):
+    with respx.mock(assert_all_called=False) as mock:
+        async_api_mock.mock_all(mock)
+        entry = create_entry(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        snapshot = coordinator._snapshot()
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": stored(snapshot),
+    }
+
+    with respx.mock(assert_all_called=False) as mock:
+        mock.route(url__startswith=async_api_mock.REEF_MOCK_URL).mock(
+            side_effect=httpx.ConnectError
+        )
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.has_equipment
+    # Timestamps and usage counters survive the JSON round trip
+    for name in ("equipment", "tcs", "pumps", "ato_states", "lights"):
+        assert getattr(coordinator, name) == snapshot[name]
+    assert {
+        kind: {id: counter.as_dict() for id, counter in counters.items()}
+        for kind, counters in coordinator.usage.items()
+    } == snapshot["usage"]
+    # Entities keep the restored state while the controller is unreachable
+    assert not coordinator.last_update_success
+    assert hass.states.get("switch.reef_pi_co2").state == STATE_ON
+
+
+async def test_startup_from_snapshot_refreshes_in_background(
+    hass, hass_storage, async_api_mock_instance
+):
+    entry = create_entry(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    snapshot = hass.data[DOMAIN][entry.entry_id]["coordinator"]._snapshot()
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": stored(snapshot),
+    }
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.last_update_success
+    assert hass.states.get("switch.reef_pi_co2").state == STATE_ON
@@ -1,18 +1,31 @@
 """Test Ph sensor for Reef_Pi integration."""
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
 )
+from homeassistant.util import dt as dt_util
 
 from custom_components.reef_pi import DOMAIN
+from custom_components.reef_pi.const import COMMAND_VERIFY_DELAY
 
 
 import pytest
 import respx
 from . import async_api_mock
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
 
 
 @pytest.fixture
@@ -63,3 +76,108 @@ async def test_ato(hass, async_api_mock_instance):
     state = hass.states.get("switch.reef_pi_test_ato_enabled")
     assert state.state == STATE_ON
     assert state.name == "Reef PI Test ATO Enabled"
+
+
+async def test_poll_does_not_overwrite_fresher_state(hass, async_api_mock_instance):
+    """A poll started before an MQTT update must not revert the fresher value."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": async_api_mock.REEF_MOCK_URL,
+            "username": async_api_mock.REEF_MOCK_USER,
+            "password": async_api_mock.REEF_MOCK_PASSWORD,
+            "verify": False,
+        },
+    )
+
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    assert coordinator.equipment["19"]["state"] is True
+
+    # Simulate an MQTT update landing while the equipment poll is in flight.
+    coordinator.equipment["19"]["state"] = False
+    coordinator.equipment["19"]["updated_at"] = dt_util.utcnow() + timedelta(seconds=5)
+    await coordinator.update_equipment()
+    assert coordinator.equipment["19"]["state"] is False
+
+    # Once the stored value is older than the poll, the polled value wins again.
+    coordinator.equipment["19"]["updated_at"] = dt_util.utcnow() - timedelta(seconds=5)
+    await coordinator.update_equipment()
+    assert coordinator.equipment["19"]["state"] is True
+
+
+async def test_timer_toggle_is_single_request(hass):
+    """Toggling a timer posts the polled timer without reading it first."""
+    simulator = ReefPiSimulator(SimulatorConfig(timers=1, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        simulator.reset_counts()
+        await coordinator.timer_control("1", False)
+
+        assert simulator.request_counts == {"POST timers/1": 1}
+        assert simulator.timers["1"]["enable"] is False
+        assert coordinator.timers["1"]["state"] is False
+
+        # A stale copy is read again before it is posted back
+        coordinator._polled_at["timers"] = dt_util.utcnow() - timedelta(hours=1)
+        simulator.reset_counts()
+        await coordinator.timer_control("1", True)
+
+        assert simulator.request_counts == {"GET timers/1": 1, "POST timers/1": 1}
+        assert simulator.timers["1"]["enable"] is True
+
+        await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_command_is_confirmed_by_reading_the_device(hass):
+    """Only the switched equipment is read back after a command."""
+    simulator = ReefPiSimulator(SimulatorConfig(equipment=3, seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        url = simulator.install(mock)
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                "host": url,
+                "username": SIMULATOR_USER,
+                "password": SIMULATOR_PASSWORD,
+                "verify": False,
+            },
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        simulator.reset_counts()
+        await coordinator.equipment_control("1", False)
+        assert coordinator.equipment["1"]["state"] is False
+
+        # reef-pi switched the outlet back on (e.g. by its own schedule)
+        simulator.equipment["1"]["on"] = True
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=COMMAND_VERIFY_DELAY + 1)
+        )
+        await hass.async_block_till_done()
+
+        assert simulator.request_counts == {
+            "POST equipment/1/control": 1,
+            "GET equipment/1": 1,
+        }
+        assert coordinator.equipment["1"]["state"] is True
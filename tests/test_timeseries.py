@@ -0,0 +1,64 @@
+"""Test the sensor history of Reef-Pi integration."""
+
+import pytest
+
+from custom_components.reef_pi.timeseries import ReefPiTimeSeries
+
+
+def test_empty():
+    series = ReefPiTimeSeries(10)
+    assert len(series) == 0
+    assert series.summary() is None
+
+
+def test_summary():
+    series = ReefPiTimeSeries(10)
+    for minute, value in enumerate([8.0, 8.1, 8.2, 8.3]):
+        series.add(minute * 60.0, value)
+
+    summary = series.summary()
+    assert summary is not None
+    assert summary["count"] == 4
+    assert summary["min"] == 8.0
+    assert summary["max"] == 8.3
+    assert summary["mean"] == pytest.approx(8.15)
+    # 0.1 per minute
+    assert summary["rate"] == pytest.approx(6.0)
+
+
+def test_single_sample_has_no_rate():
+    series = ReefPiTimeSeries(10)
+    series.add(0.0, 25.0)
+    summary = series.summary()
+    assert summary is not None
+    assert summary["rate"] is None
+
+
+def test_ring_buffer_keeps_latest_samples():
+    series = ReefPiTimeSeries(3)
+    for i in range(5):
+        series.add(float(i), float(i))
+
+    times, values = series.samples()
+    assert len(series) == 3
+    assert list(times) == [2.0, 3.0, 4.0]
+    assert list(values) == [2.0, 3.0, 4.0]
+
+
+def test_window():
+    series = ReefPiTimeSeries(10)
+    for i in range(6):
+        series.add(i * 600.0, 25.0 - i)
+
+    summary = series.summary(since=2400.0)
+    assert summary is not None
+    assert summary["count"] == 2
+    assert summary["max"] == 21.0
+    assert summary["rate"] == pytest.approx(-6.0)
+
+
+def test_out_of_order_sample_is_ignored():
+    series = ReefPiTimeSeries(10)
+    series.add(10.0, 1.0)
+    series.add(5.0, 2.0)
+    assert list(series.samples()[1]) == [1.0]
@@ -0,0 +1,135 @@
+"""Test unloading and reloading of Reef-Pi integration."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+import respx
+from homeassistant.config_entries import ConfigEntryState
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.reef_pi import DOMAIN, ReefPiDataUpdateCoordinator
+from custom_components.reef_pi.async_api import InvalidAuth
+from custom_components.reef_pi.const import DATA_HUB, MQTT_ENABLED
+
+from .reef_pi_simulator import (
+    SIMULATOR_PASSWORD,
+    SIMULATOR_USER,
+    ReefPiSimulator,
+    SimulatorConfig,
+)
+
+
+@pytest.fixture
+def simulator():
+    simulator = ReefPiSimulator(SimulatorConfig(seed=1))
+    with respx.mock(assert_all_called=False) as mock:
+        simulator.url = simulator.install(mock)
+        yield simulator
+
+
+def create_entry(hass, simulator, options=None):
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            "host": simulator.url,
+            "username": SIMULATOR_USER,
+            "password": SIMULATOR_PASSWORD,
+            "verify": False,
+            "mqtt_available": True,
+        },
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def test_reloads_do_not_leak_subscriptions(hass, simulator):
+    unsubscribes = []
+
+    async def subscribe(*_args, **_kwargs):
+        unsubscribe = Mock()
+        unsubscribes.append(unsubscribe)
+        return unsubscribe
+
+    with (
+        patch(
+            "custom_components.reef_pi.mqtt_handler.mqtt.async_wait_for_mqtt_client",
+            AsyncMock(return_value=True),
+        ),
+        patch(
+            "custom_components.reef_pi.mqtt_handler.mqtt.async_subscribe",
+            side_effect=subscribe,
+        ),
+    ):
+        entry = create_entry(hass, simulator, {MQTT_ENABLED: True})
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        for _ in range(3):
+            await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+
+        assert len(unsubscribes) == 4
+        active = [unsubscribe for unsubscribe in unsubscribes if not unsubscribe.called]
+        assert len(active) == 1
+        hub = hass.data[DOMAIN][DATA_HUB]
+        assert list(hub.get_stats()) == [entry.entry_id]
+
+        await hass.config_entries.async_unload(entry.entry_id)
+        assert all(unsubscribe.called for unsubscribe in unsubscribes)
+        assert hub.get_stats() == {}
+
+
+async def test_unload_cancels_requests_in_flight(hass, simulator):
+    entry = create_entry(hass, simulator)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    simulator.config.latency = {"equipment": 15}
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    while not simulator.request_counts["GET equipment"]:
+        await asyncio.sleep(0)
+
+    started = time.monotonic()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await refresh
+    assert time.monotonic() - started < 1
+    assert not coordinator.api._requests
+
+
+async def test_unload_shuts_down_once(hass, simulator):
+    entry = create_entry(hass, simulator)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    with patch.object(coordinator.api, "close", wraps=coordinator.api.close) as close:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    close.assert_called_once()
+
+
+async def test_failed_auth_leaves_the_hub(hass, simulator):
+    entry = create_entry(hass, simulator)
+    with (
+        patch(
+            "custom_components.reef_pi.async_api.ReefApi.authenticate",
+            side_effect=InvalidAuth,
+        ),
+        patch.object(
+            ReefPiDataUpdateCoordinator,
+            "async_shutdown",
+            autospec=True,
+            side_effect=ReefPiDataUpdateCoordinator.async_shutdown,
+        ) as shutdown,
+        # The config flow has no reauth step
+        patch.object(entry, "async_start_reauth"),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_ERROR
+    shutdown.assert_called_once()
+    assert hass.data[DOMAIN][DATA_HUB].get_stats() == {}
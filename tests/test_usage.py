@@ -0,0 +1,40 @@
+"""Test the usage totals of Reef-Pi integration."""
+
+from custom_components.reef_pi.usage import ReefPiUsageCounter
+
+
+def test_counts_every_entry_once():
+    counter = ReefPiUsageCounter()
+    readings = [
+        {"pump": 11, "time": "Aug-18-14:05, 2021"},
+        {"pump": 15, "time": "Aug-18-19:30, 2021"},
+    ]
+    assert counter.update(readings) == 26
+    assert counter.update(readings) == 0
+
+    readings.append({"pump": 15, "time": "Aug-19-19:30, 2021"})
+    assert counter.update(readings[1:]) == 15
+    assert counter.total == 41
+
+
+def test_counts_growth_of_latest_entry():
+    counter = ReefPiUsageCounter()
+    counter.update([{"pump": 10, "time": "Jan-11-09:01, 2022"}])
+    assert counter.update([{"pump": 25, "time": "Jan-11-09:01, 2022"}]) == 15
+    assert counter.total == 25
+
+
+def test_restore():
+    counter = ReefPiUsageCounter()
+    counter.update([{"pump": 120, "time": "Jan-11-09:01, 2022"}])
+
+    restored = ReefPiUsageCounter.from_dict(counter.as_dict())
+    assert restored.total == 120
+    assert restored.update([{"pump": 120, "time": "Jan-11-09:01, 2022"}]) == 0
+    assert restored.update([{"pump": 30, "time": "Jan-12-09:01, 2022"}]) == 30
+
+
+def test_skips_invalid_entries():
+    counter = ReefPiUsageCounter()
+    assert counter.update([{"pump": 5}, {"time": "Jan-11-09:01, 2022"}]) == 0
+    assert counter.cursor is None